@@ -615,6 +615,121 @@ export const bulkImportBenchmarks = mutation({
   },
 });
 
+/**
+ * Apply a regenerated benchmark delta (see scripts/benchmark_delta.py)
+ *
+ * Rows are matched on the by_context index. A row with isActive: false
+ * deactivates the active benchmark for its context; any other row updates
+ * the active benchmark in place, or inserts one when there is none.
+ * Callers send at most one row per context; benchmark_delta.py collapses
+ * records to the first per context, as bulkImportBenchmarks keeps.
+ */
+export const applyBenchmarkDelta = mutation({
+  args: {
+    source: v.string(),
+    sourceDocument: v.optional(v.string()),
+    sourceYear: v.number(),
+    benchmarks: v.array(
+      v.object({
+        sportCode: v.string(),
+        skillCode: v.string(),
+        ageGroup: v.string(),
+        gender: genderValidator,
+        level: levelValidator,
+        expectedRating: v.number(),
+        minAcceptable: v.number(),
+        developingThreshold: v.number(),
+        excellentThreshold: v.number(),
+        percentile25: v.optional(v.number()),
+        percentile50: v.optional(v.number()),
+        percentile75: v.optional(v.number()),
+        percentile90: v.optional(v.number()),
+        notes: v.optional(v.string()),
+        isActive: v.optional(v.boolean()),
+      })
+    ),
+  },
+  returns: v.object({
+    created: v.number(),
+    updated: v.number(),
+    deactivated: v.number(),
+    skipped: v.number(),
+    errors: v.array(v.string()),
+  }),
+  handler: async (ctx, args) => {
+    const now = Date.now();
+    let created = 0;
+    let updated = 0;
+    let deactivated = 0;
+    let skipped = 0;
+    const errors: string[] = [];
+
+    for (const { isActive, ...benchmark } of args.benchmarks) {
+      try {
+        const existing = await ctx.db
+          .query("skillBenchmarks")
+          .withIndex("by_context", (q) =>
+            q
+              .eq("sportCode", benchmark.sportCode)
+              .eq("skillCode", benchmark.skillCode)
+              .eq("ageGroup", benchmark.ageGroup)
+              .eq("gender", benchmark.gender)
+              .eq("level", benchmark.level)
+          )
+          .filter((q) => q.eq(q.field("isActive"), true))
+          .first();
+
+        if (isActive === false) {
+          if (existing) {
+            await ctx.db.patch(existing._id, { isActive: false, updatedAt: now });
+            deactivated += 1;
+          } else {
+            skipped += 1;
+          }
+          continue;
+        }
+
+        if (existing) {
+          await ctx.db.patch(existing._id, {
+            expectedRating: benchmark.expectedRating,
+            minAcceptable: benchmark.minAcceptable,
+            developingThreshold: benchmark.developingThreshold,
+            excellentThreshold: benchmark.excellentThreshold,
+            percentile25: benchmark.percentile25,
+            percentile50: benchmark.percentile50,
+            percentile75: benchmark.percentile75,
+            percentile90: benchmark.percentile90,
+            notes: benchmark.notes,
+            source: args.source,
+            sourceDocument: args.sourceDocument,
+            sourceYear: args.sourceYear,
+            updatedAt: now,
+          });
+          updated += 1;
+          continue;
+        }
+
+        await ctx.db.insert("skillBenchmarks", {
+          ...benchmark,
+          source: args.source,
+          sourceDocument: args.sourceDocument,
+          sourceYear: args.sourceYear,
+          isActive: true,
+          createdAt: now,
+          updatedAt: now,
+        });
+        created += 1;
+      } catch (error) {
+        errors.push(
+          `${benchmark.sportCode}/${benchmark.skillCode}/${benchmark.ageGroup}: ${error instanceof Error ? error.message : "Unknown error"}`
+        );
+      }
+    }
+
+    return { created, updated, deactivated, skipped, errors };
+  },
+});
+
 /**
  * Delete a benchmark (hard delete)
  */
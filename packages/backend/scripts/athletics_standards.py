@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Parsed, numeric index over athletics PERFORMANCE_STANDARDS.
+
+The generator stores standards as strings (">2:50", "14.5-16.0", "<10.8").
+This module parses every standard once into second-based intervals and builds
+a sorted NumPy array of cut points per (event, ageGroup, gender), so race
+times can be classified as Developmental / Competitive / Elite with
+np.searchsorted.
+
+    index = StandardsIndex.from_generator()
+    index.classify("100m", "U14", "Male", 13.1)            # "Competitive"
+    index.classify_many([("800m", "U16", "Female", "2:21.4"), ...])
+
+Bulk classification groups times by key into one array per group and
+searches the whole array against the group's cuts in a single call.
+Requires numpy (pip install numpy).
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+INF = math.inf
+
+StandardKey = Tuple[str, str, str]
+TimeValue = Union[str, float, int]
+
+class Interval(NamedTuple):
+    """Time interval in seconds. An open-ended upper bound is infinity."""
+    low: float
+    high: float
+    low_inclusive: bool
+    high_inclusive: bool
+
+    def contains(self, seconds: float) -> bool:
+        above = seconds > self.low or (self.low_inclusive and seconds == self.low)
+        below = seconds < self.high or (self.high_inclusive and seconds == self.high)
+        return above and below
+
+_RANGE = re.compile(r"^\s*([\d:.]+)\s*-\s*([\d:.]+)\s*$")
+
+def parse_time(value: TimeValue) -> float:
+    """Convert "14.5", "2:50" or "1:02:30.5" (or a number) to seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = value.strip()
+    if not text:
+        raise ValueError("Empty time value")
+
+    seconds = 0.0
+    for part in text.split(":"):
+        if not re.fullmatch(r"\d+(\.\d+)?", part):
+            raise ValueError(f"Invalid time value: {value!r}")
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def parse_standard(text: str) -> Interval:
+    """
+    Parse a standard string into an Interval:
+    ">16.0" -> (16.0, inf), "<14.5" -> (0, 14.5), "14.5-16.0" -> [14.5, 16.0].
+    """
+    text = text.strip()
+    if text.startswith(">"):
+        return Interval(parse_time(text[1:]), INF, False, False)
+    if text.startswith("<"):
+        return Interval(0.0, parse_time(text[1:]), True, False)
+
+    match = _RANGE.match(text)
+    if not match:
+        raise ValueError(f"Unrecognised standard: {text!r}")
+    low, high = sorted((parse_time(match.group(1)), parse_time(match.group(2))))
+    return Interval(low, high, True, True)
+
+def _cut(interval: Interval) -> float:
+    """Smallest time that falls beyond the interval's upper bound."""
+    return math.nextafter(interval.high, INF) if interval.high_inclusive else interval.high
+
+class StandardsIndex:
+    """
+    Per (event, ageGroup, gender) ladder of levels ordered fastest first, with
+    the cut point below which a time qualifies for each level.
+
+    A time that falls in a gap between published ranges (e.g. faster than the
+    Competitive range but not under the Elite mark) is given the slower level.
+    """
+
+    def __init__(self, standards: Dict[str, Dict[str, Dict[str, Dict[str, str]]]]):
+        self.intervals: Dict[Tuple[str, str, str, str], Interval] = {}
+        self.ladders: Dict[StandardKey, Tuple[np.ndarray, np.ndarray]] = {}
+
+        for event, by_age in standards.items():
+            for age_group, by_gender in by_age.items():
+                for gender, by_level in by_gender.items():
+                    parsed = {level: parse_standard(text) for level, text in by_level.items()}
+                    for level, interval in parsed.items():
+                        self.intervals[(event, age_group, gender, level)] = interval
+
+                    ordered = sorted(parsed.items(), key=lambda item: (item[1].high, _cut(item[1])))
+                    cuts = np.array([_cut(interval) for _, interval in ordered])
+                    # One slot past the slowest cut for times no level covers
+                    levels = np.array([level for level, _ in ordered] + [None], dtype=object)
+                    self.ladders[(event, age_group, gender)] = (cuts, levels)
+
+    @classmethod
+    def from_generator(cls) -> "StandardsIndex":
+        """Build the index from the athletics generator's PERFORMANCE_STANDARDS."""
+        from benchmark_registry import default_registry
+        return cls(default_registry().get("athletics").module.PERFORMANCE_STANDARDS)
+
+    def interval(self, event: str, age_group: str, gender: str, level: str) -> Optional[Interval]:
+        return self.intervals.get((event, age_group, gender, level))
+
+    def classify(self, event: str, age_group: str, gender: str, time: TimeValue) -> Optional[str]:
+        """Classify one time. Returns None when no standard exists for the key."""
+        ladder = self.ladders.get((event, age_group, gender))
+        if ladder is None:
+            return None
+        cuts, levels = ladder
+        return levels[np.searchsorted(cuts, parse_time(time), side="right")]
+
+    def classify_many(self, rows: Iterable[Tuple[str, str, str, TimeValue]]) -> List[Optional[str]]:
+        """
+        Classify many (event, ageGroup, gender, time) rows in one pass.
+        Results are returned in input order; rows without a standard get None.
+        """
+        groups: Dict[StandardKey, Tuple[List[float], List[int]]] = {}
+        count = 0
+        for position, (event, age_group, gender, time) in enumerate(rows):
+            group = groups.get((event, age_group, gender))
+            if group is None:
+                group = groups[(event, age_group, gender)] = ([], [])
+            group[0].append(parse_time(time))
+            group[1].append(position)
+            count = position + 1
+
+        results = np.full(count, None, dtype=object)
+        for key, (times, positions) in groups.items():
+            ladder = self.ladders.get(key)
+            if ladder is None:
+                continue
+            cuts, levels = ladder
+            # The first cut a time is under; past the last cut is the None slot
+            results[positions] = levels[np.searchsorted(cuts, np.array(times), side="right")]
+        return results.tolist()
+
+def normalise_gender(value: str) -> str:
+    """Map "m", "male", "F", ... to the "Male"/"Female" keys used in PERFORMANCE_STANDARDS."""
+    text = value.strip().lower()
+    if text in ("m", "male", "boy", "boys", "men"):
+        return "Male"
+    if text in ("f", "female", "girl", "girls", "women"):
+        return "Female"
+    return value.strip()
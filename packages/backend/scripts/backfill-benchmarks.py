@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Backfill benchmark fields on skill assessments after benchmarks are regenerated.
+
+Joins an assessments export to the benchmark grid and writes a patch file
+holding only the assessments whose benchmarkRating, benchmarkLevel,
+benchmarkDelta or benchmarkStatus would change (see benchmark_backfill.py).
+Exports are the documents.jsonl files of `npx convex export`, NDJSON, or
+JSON arrays. Player identities supply the date of birth the writers derive
+the age group from; without them, rows must carry ageGroup themselves.
+
+Usage:
+    python3 backfill-benchmarks.py export/skillAssessments/documents.jsonl \\
+        --players export/playerIdentities/documents.jsonl \\
+        --grid rugby-benchmarks-IMPORT.json --grid soccer-benchmarks-IMPORT.json
+    python3 backfill-benchmarks.py assessments.jsonl --grid export/skillBenchmarks/documents.jsonl --output patches.ndjson
+    python3 backfill-benchmarks.py --self-test --rows 500000   # synthetic assessments, checked row by row
+
+Requires numpy (pip install numpy).
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Row-at-a-time transcriptions of the writers in models/skillAssessments.ts, for the bulk check
+
+def with_benchmark_status(rating: float, benchmark: dict) -> str:
+    """recordAssessmentWithBenchmark's status chain."""
+    if rating < benchmark["minAcceptable"]:
+        return "below"
+    if rating < benchmark["developingThreshold"]:
+        return "developing"
+    if rating < benchmark["excellentThreshold"]:
+        return "on_track"
+    return "exceeding"
+
+def record_assessment_status(delta: float) -> str:
+    """recordAssessment's status chain."""
+    if delta < -1:
+        return "below"
+    if delta < 0:
+        return "developing"
+    if delta < 0.5:
+        return "on_track"
+    if delta < 1:
+        return "exceeding"
+    return "exceptional"
+
+# Cases worked through skillAssessments.ts by hand: (assessment, expected patch or None for no patch).
+# The grid has u12/all/recreational expected 3 (min 2, developing 2.5, excellent 3.5), a u12/male row
+# the writer never reads, u12/all/competitive expected 3.5, u13/all/recreational expected 3.2, and
+# an upper-case "U14" row the writer's exact index lookup cannot find. The player was born 2014-06-15.
+CASE_GRID = [
+    {"ageGroup": "u12", "gender": "all", "level": "recreational", "ladder": (3, 2, 2.5, 3.5)},
+    {"ageGroup": "u12", "gender": "male", "level": "recreational", "ladder": (4, 3, 3.5, 4.5)},
+    {"ageGroup": "u12", "gender": "all", "level": "competitive", "ladder": (3.5, 2.5, 3, 4)},
+    {"ageGroup": "u13", "gender": "all", "level": "recreational", "ladder": (3.2, 2.2, 2.7, 3.7)},
+    {"ageGroup": "U14", "gender": "all", "level": "recreational", "ladder": (3.5, 2.5, 3, 4)},
+]
+DAY_BEFORE_12TH_BIRTHDAY = 1781395200000   # 2026-06-14T00:00:00Z
+TWELFTH_BIRTHDAY = 1781481600000           # 2026-06-15T00:00:00Z
+AGED_13 = 1813017600000                    # 2027-06-15T00:00:00Z
+WRITER_CASES = [
+    # Recorded by recordAssessmentWithBenchmark at 5 / exceeding / "u12": already current
+    ({"rating": 5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY, "benchmarkRating": 3, "benchmarkDelta": 2,
+      "benchmarkStatus": "exceeding", "benchmarkLevel": "u12"}, None),
+    # That writer never reports "exceptional"
+    ({"rating": 5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY, "benchmarkRating": 3, "benchmarkDelta": 2,
+      "benchmarkStatus": "exceptional", "benchmarkLevel": "u12"},
+     {"benchmarkRating": 3, "benchmarkLevel": "u12", "benchmarkDelta": 2, "benchmarkStatus": "exceeding"}),
+    ({"rating": 1.5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY},
+     {"benchmarkRating": 3, "benchmarkLevel": "u12", "benchmarkDelta": -1.5, "benchmarkStatus": "below"}),
+    ({"rating": 2, "createdAt": DAY_BEFORE_12TH_BIRTHDAY},
+     {"benchmarkRating": 3, "benchmarkLevel": "u12", "benchmarkDelta": -1, "benchmarkStatus": "developing"}),
+    ({"rating": 2.5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY},
+     {"benchmarkRating": 3, "benchmarkLevel": "u12", "benchmarkDelta": -0.5, "benchmarkStatus": "on_track"}),
+    ({"rating": 3.5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY},
+     {"benchmarkRating": 3, "benchmarkLevel": "u12", "benchmarkDelta": 0.5, "benchmarkStatus": "exceeding"}),
+    # Age is taken when the row was written, not at the assessment date
+    ({"rating": 3, "createdAt": TWELFTH_BIRTHDAY, "assessmentDate": "2026-01-01"},
+     {"benchmarkRating": 3.2, "benchmarkLevel": "u13", "benchmarkDelta": -0.2, "benchmarkStatus": "on_track"}),
+    # recordAssessment rows keep their level and use the delta rules
+    ({"rating": 4.5, "createdAt": DAY_BEFORE_12TH_BIRTHDAY, "benchmarkLevel": "competitive"},
+     {"benchmarkRating": 3.5, "benchmarkLevel": "competitive", "benchmarkDelta": 1, "benchmarkStatus": "exceptional"}),
+    ({"rating": 3.4, "createdAt": DAY_BEFORE_12TH_BIRTHDAY, "benchmarkLevel": "competitive"},
+     {"benchmarkRating": 3.5, "benchmarkLevel": "competitive", "benchmarkDelta": -0.1,
+      "benchmarkStatus": "developing"}),
+    # u14 only exists as "U14": no benchmark, as for the writer
+    ({"rating": 3, "createdAt": AGED_13 + 365 * 86400000}, None),
+]
+
+def check_writer_cases() -> None:
+    from benchmark_backfill import BenchmarkGrid, backfill
+
+    grid = BenchmarkGrid({"sportCode": "rugby", "skillCode": "passing", **row,
+                          **dict(zip(("expectedRating", "minAcceptable", "developingThreshold", "excellentThreshold"),
+                                     row["ladder"]))} for row in CASE_GRID)
+    players = {"p1": {"_id": "p1", "dateOfBirth": "2014-06-15", "gender": "male"}}
+    assessments = [{"_id": f"case{n}", "playerIdentityId": "p1", "sportCode": "rugby", "skillCode": "passing",
+                    **case} for n, (case, _) in enumerate(WRITER_CASES)]
+    patches = {patch["_id"]: patch["patch"] for patch in backfill(assessments, grid, players)[0]}
+    for n, (case, expected) in enumerate(WRITER_CASES):
+        actual = patches.get(f"case{n}")
+        if actual is not None:
+            actual = {**actual, "benchmarkDelta": round(actual["benchmarkDelta"], 9)}
+        assert actual == expected, (n, case, actual, expected)
+    print(f"  {len(WRITER_CASES)} cases from skillAssessments.ts match")
+
+def self_test(rows: int) -> None:
+    """Check the writer cases, then backfill synthetic assessments over every IMPORT grid row by row."""
+    from benchmark_backfill import STATUSES, WRITER_GENDER, backfill, load_grid
+
+    check_writer_cases()
+    paths = sorted(glob.glob(os.path.join(SCRIPTS_DIR, "*-benchmarks-IMPORT.json")))
+    start = time.perf_counter()
+    grid = load_grid(paths)
+    print(f"  grid: {len(grid)} benchmarks from {len(paths)} file(s) ({time.perf_counter() - start:.2f}s)")
+
+    rng = random.Random(0)
+    # The writers only read "all" rows; recordAssessmentWithBenchmark only at the default level
+    cells = [(key.split("\x1f"), position) for key, position in grid.index.items()
+             if key.split("\x1f")[3] == WRITER_GENDER]
+    default_cells = [cell for cell in cells if cell[0][4] == "recreational"]
+    assessments = []
+    expected = {}
+    for n in range(rows):
+        by_delta = n % 2 == 1
+        (sport, skill, age_group, _, level), position = rng.choice(cells if by_delta else default_cells)
+        rating = rng.choice((1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5))
+        assessment = {"_id": f"a{n}", "sportCode": sport, "skillCode": skill, "ageGroup": age_group,
+                      "benchmarkLevel": level if by_delta else age_group, "rating": rating}
+        benchmark = {"expectedRating": grid.expected[position], "minAcceptable": grid.minimum[position],
+                     "developingThreshold": grid.developing[position], "excellentThreshold": grid.excellent[position]}
+        delta = rating - benchmark["expectedRating"]
+        status = record_assessment_status(delta) if by_delta else with_benchmark_status(rating, benchmark)
+        # A third already hold the right snapshot, a third a stale one, a third none
+        if n % 3 == 0:
+            assessment.update(benchmarkRating=benchmark["expectedRating"], benchmarkDelta=delta, benchmarkStatus=status)
+        elif n % 3 == 1:
+            assessment.update(benchmarkRating=benchmark["expectedRating"] - 0.5, benchmarkDelta=delta + 0.5,
+                              benchmarkStatus=rng.choice(STATUSES))
+        expected[assessment["_id"]] = (delta, status)
+        assessments.append(assessment)
+    assessments.append({"_id": "unmatched", "sportCode": "curling", "skillCode": "sweeping", "ageGroup": "u12",
+                        "rating": 3})
+
+    start = time.perf_counter()
+    patches, summary = backfill(assessments, grid)
+    elapsed = time.perf_counter() - start
+
+    for patch in patches:
+        delta, status = expected[patch["_id"]]
+        assert abs(patch["patch"]["benchmarkDelta"] - delta) < 1e-9, patch
+        assert patch["patch"]["benchmarkStatus"] == status, (patch, status)
+    patched = {patch["_id"] for patch in patches}
+    assert all(f"a{n}" not in patched for n in range(0, rows, 3)), "up-to-date rows should not be patched"
+    assert len(patched) == rows - len(range(0, rows, 3)), "every stale or missing snapshot should be patched"
+    assert summary["unmatched"] == 1
+    print(f"  {rows} assessments: {summary['changed']} patched, {summary['unmatched']} unmatched "
+          f"in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+    print("✅ Self-test passed")
+
+def main():
+    """Compute benchmark patches for an assessments export."""
+    parser = argparse.ArgumentParser(description="Recompute assessment benchmark fields against a benchmark grid")
+    parser.add_argument("assessments", nargs="?", help="skillAssessments export (documents.jsonl, NDJSON or JSON)")
+    parser.add_argument("--grid", action="append", default=[], metavar="FILE",
+                        help="IMPORT file or skillBenchmarks documents.jsonl (repeatable; "
+                             "default: every *-benchmarks-IMPORT.json here)")
+    parser.add_argument("--players", help="playerIdentities export, for date of birth")
+    parser.add_argument("--default-level", default="recreational",
+                        help="level recordAssessmentWithBenchmark looked up, for rows whose benchmarkLevel is an age group "
+                             "(default: recreational)")
+    parser.add_argument("--output", default="assessment-benchmark-patches.ndjson", help="patch file to write")
+    parser.add_argument("--self-test", action="store_true", help="check the engine on synthetic assessments")
+    parser.add_argument("--rows", type=int, default=200_000, help="synthetic assessments for --self-test")
+    args = parser.parse_args()
+
+    try:
+        from benchmark_backfill import load_grid, read_documents, backfill, write_patches
+    except ImportError as e:
+        print(f"❌ {e}; the backfill needs numpy (pip install numpy)")
+        sys.exit(1)
+
+    if args.self_test:
+        self_test(args.rows)
+        return
+    if not args.assessments:
+        parser.error("an assessments export is required")
+
+    start = time.perf_counter()
+    try:
+        grid = load_grid(args.grid or sorted(glob.glob(os.path.join(SCRIPTS_DIR, "*-benchmarks-IMPORT.json"))))
+        assessments = [doc for doc in read_documents(args.assessments) if not doc.get("isDeleted")]
+        players = {doc["_id"]: doc for doc in read_documents(args.players)} if args.players else None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e!r}")
+        sys.exit(1)
+    loaded = time.perf_counter()
+    print(f"📥 {len(assessments)} assessments, {len(grid)} benchmarks"
+          + (f" ({grid.duplicates} duplicate contexts ignored)" if grid.duplicates else "")
+          + f" loaded in {loaded - start:.2f}s")
+
+    patches, summary = backfill(assessments, grid, players, args.default_level)
+    written = write_patches(patches, args.output)
+    print(f"🔁 {summary['matched']} matched, {summary['unmatched']} without a benchmark, "
+          f"{written} changed ({time.perf_counter() - loaded:.2f}s)")
+    for status, count in summary["statuses"].items():
+        print(f"    {status}: {count}")
+    print(f"\n✅ {written} patches -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Timing harness for the benchmark generators.
+
+Runs each sport generator end to end and by phase (enumeration, rating/notes
+computation, serialisation) on synthetic workloads scaled 1x, 10x and 100x
+along one axis at a time (skills, age groups, event groups). Wall time, peak
+memory and output bytes are written to a JSON results file, so runs can be
+compared between commits:
+
+    python3 bench-generators.py                          # -> generator-bench-results.json
+    python3 bench-generators.py --scales 1 10 -o before.json
+    python3 bench-generators.py --compare before.json    # flag regressions vs an earlier run
+
+Per-record time at each scale is reported relative to 1x, so superlinear
+behaviour in a rule cascade shows up as a growing ratio.
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from benchmark_io import write_benchmarks
+from benchmark_registry import default_registry
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_OUTPUT = "generator-bench-results.json"
+
+# Per-record time growing by more than this between 1x and the largest scale is flagged
+SUPERLINEAR_THRESHOLD = 2.0
+
+def load_fresh(sport: str):
+    """Import a private copy of a generator so synthetic scaling can't leak between runs."""
+    path = default_registry().get(sport).path
+    spec = importlib.util.spec_from_file_location(f"_bench_{sport.replace('-', '_')}_{time.monotonic_ns()}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _copies(values: List[str], factor: int) -> List[str]:
+    """values plus factor-1 suffixed copies of each, e.g. "U10 #1"."""
+    return values + [f"{value} #{i}" for i in range(1, factor) for value in values]
+
+# ============================================================
+# Synthetic scaling
+# ============================================================
+
+def scale_rugby(module, axis: str, factor: int) -> None:
+    if axis == "skills":
+        # Copies keep their original's rule-group membership
+        module.SKILLS = _copies(module.SKILLS, factor)
+        module.ALL_GENDER_SKILLS = _copies(module.ALL_GENDER_SKILLS, factor)
+        module.GENDER_SPECIFIC_U14_PLUS = _copies(module.GENDER_SPECIFIC_U14_PLUS, factor)
+        module.TACTICAL_SKILLS = frozenset(_copies(list(module.TACTICAL_SKILLS), factor))
+        module.CONTACT_SKILLS = frozenset(_copies(list(module.CONTACT_SKILLS), factor))
+        module.KICKING_SKILLS = frozenset(_copies(list(module.KICKING_SKILLS), factor))
+    elif axis == "ages":
+        for age_group in list(module.AGE_GROUPS):
+            for i in range(1, factor):
+                synthetic = f"{age_group} #{i}"
+                module.LEVELS_BY_AGE[synthetic] = module.LEVELS_BY_AGE[age_group]
+                module.BASE_RATINGS[synthetic] = module.BASE_RATINGS[age_group]
+        module.AGE_GROUPS = _copies(module.AGE_GROUPS, factor)
+    else:
+        raise ValueError(f"rugby has no '{axis}' axis")
+
+    module.RATING_TABLE = module.build_rating_table()
+
+def scale_athletics(module, axis: str, factor: int) -> None:
+    if axis == "skills":
+        for category_data in module.SKILLS.values():
+            event_groups = category_data["eventGroups"]
+            if isinstance(event_groups, dict):
+                for skill_name in list(event_groups):
+                    for i in range(1, factor):
+                        event_groups[f"{skill_name} #{i}"] = event_groups[skill_name]
+            category_data["skills"] = _copies(category_data["skills"], factor)
+    elif axis == "ages":
+        for age_group in list(module.AGE_GROUPS):
+            for i in range(1, factor):
+                synthetic = f"{age_group} #{i}"
+                module.LEVELS_BY_AGE[synthetic] = module.LEVELS_BY_AGE[age_group]
+                module.EXPECTED_LEVELS[synthetic] = module.EXPECTED_LEVELS[age_group]
+        module.AGE_GROUPS = _copies(module.AGE_GROUPS, factor)
+    elif axis == "events":
+        for category, category_data in module.SKILLS.items():
+            category_data["eventGroups"] = {
+                skill_name: _copies(module.get_event_groups_for_skill(skill_name, category), factor)
+                for skill_name in category_data["skills"]
+            }
+    else:
+        raise ValueError(f"athletics has no '{axis}' axis")
+
+# ============================================================
+# Phases
+# ============================================================
+
+def rugby_phases(module) -> Dict[str, Callable]:
+    def enumerate_combinations():
+        return [
+            (skill_name, age_group, gender, level)
+            for age_group in module.AGE_GROUPS
+            for skill_name in module.SKILLS
+            for gender in module.get_gender_for_skill(skill_name, age_group)
+            for level in module.LEVELS_BY_AGE[age_group]
+        ]
+
+    def compute(combinations):
+        module.RATING_TABLE = module.build_rating_table()
+        return [module.get_skill_benchmark_data(*combination) for combination in combinations]
+
+    return {"enumeration": enumerate_combinations, "compute": compute,
+            "records": lambda: module.iter_benchmarks()}
+
+def athletics_phases(module) -> Dict[str, Callable]:
+    def enumerate_combinations():
+        return [
+            (skill_name, category, age_group, gender, level, event_group)
+            for category, skill_name, ages in module.build_enumeration_plan()
+            for age_group, levels, event_groups in ages
+            for gender in module.GENDERS
+            for level in levels
+            for event_group in event_groups
+        ]
+
+    def compute(combinations):
+        return [module.generate_benchmark(*combination) for combination in combinations]
+
+    return {"enumeration": enumerate_combinations, "compute": compute,
+            "records": lambda: module.iter_all_benchmarks()}
+
+SPORTS = {
+    "rugby": {"scale": scale_rugby, "phases": rugby_phases, "axes": ["skills", "ages"]},
+    "athletics": {"scale": scale_athletics, "phases": athletics_phases, "axes": ["skills", "ages", "events"]},
+}
+
+class _CountingSink(io.TextIOBase):
+    """Discards text; serialisation cost is measured without disk I/O."""
+
+    def write(self, text):
+        return len(text)
+
+def measure(fn: Callable, *args) -> Dict[str, Any]:
+    """Run fn once for wall time and once under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": round(seconds, 6), "peakBytes": peak, "result": result}
+
+def run_workload(sport: str, axis: str, factor: int) -> Dict[str, Any]:
+    module = load_fresh(sport)
+    SPORTS[sport]["scale"](module, axis, factor)
+    phases = SPORTS[sport]["phases"](module)
+
+    enumeration = measure(phases["enumeration"])
+    combinations = enumeration.pop("result")
+    compute = measure(phases["compute"], combinations)
+    compute.pop("result")
+    records = list(phases["records"]())
+    serialisation = measure(lambda: write_benchmarks(records, _CountingSink()))
+    output_bytes = serialisation.pop("result")
+    del records
+
+    with tempfile.TemporaryDirectory() as tmp:
+        end_to_end = measure(lambda: module.build(tmp))
+        end_to_end.pop("result")
+
+    count = len(combinations)
+    return {
+        "sport": sport,
+        "axis": axis,
+        "scale": factor,
+        "records": count,
+        "outputBytes": output_bytes,
+        "phases": {"enumeration": enumeration, "compute": compute, "serialisation": serialisation},
+        "endToEnd": end_to_end,
+        "microsPerRecord": round(end_to_end["seconds"] / count * 1e6, 3) if count else 0,
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    print(f"\n  {'Workload':<24}{'Records':>10}{'Enum':>9}{'Compute':>9}{'Serial':>9}{'Total':>9}"
+          f"{'Peak':>10}{'Output':>10}{'us/rec':>9}")
+    for r in results:
+        phases = r["phases"]
+        print(f"  {r['sport'] + ' ' + r['axis'] + ' x' + str(r['scale']):<24}{r['records']:>10}"
+              f"{phases['enumeration']['seconds']:>8.3f}s{phases['compute']['seconds']:>8.3f}s"
+              f"{phases['serialisation']['seconds']:>8.3f}s{r['endToEnd']['seconds']:>8.3f}s"
+              f"{r['endToEnd']['peakBytes'] / 1024 / 1024:>8.1f}MB{r['outputBytes'] / 1024 / 1024:>8.1f}MB"
+              f"{r['microsPerRecord']:>9.1f}")
+
+def scaling_warnings(results: List[Dict[str, Any]]) -> List[str]:
+    """Flag workloads whose per-record time grows superlinearly with scale."""
+    warnings = []
+    baselines = {(r["sport"], r["axis"]): r for r in results if r["scale"] == 1}
+    for r in results:
+        base = baselines.get((r["sport"], r["axis"]))
+        if base and r["scale"] > 1 and base["microsPerRecord"]:
+            ratio = r["microsPerRecord"] / base["microsPerRecord"]
+            if ratio > SUPERLINEAR_THRESHOLD:
+                warnings.append(f"{r['sport']} {r['axis']} x{r['scale']}: "
+                                f"{ratio:.1f}x per-record time vs x1")
+    return warnings
+
+def compare(previous_path: str, results: List[Dict[str, Any]]) -> None:
+    with open(previous_path) as f:
+        previous = json.load(f)
+    before = {(r["sport"], r["axis"], r["scale"]): r for r in previous["results"]}
+
+    print(f"\n📈 Compared with {previous_path} ({previous.get('commit', 'unknown')}):")
+    for r in results:
+        old = before.get((r["sport"], r["axis"], r["scale"]))
+        if not old:
+            continue
+        time_ratio = r["endToEnd"]["seconds"] / old["endToEnd"]["seconds"] if old["endToEnd"]["seconds"] else 0
+        memory_ratio = r["endToEnd"]["peakBytes"] / old["endToEnd"]["peakBytes"] if old["endToEnd"]["peakBytes"] else 0
+        print(f"  {r['sport']} {r['axis']} x{r['scale']}: time {time_ratio:.2f}x, "
+              f"peak memory {memory_ratio:.2f}x, output {r['outputBytes'] - old['outputBytes']:+d} bytes")
+
+def main():
+    """Run the synthetic workloads and write the results file."""
+    parser = argparse.ArgumentParser(description="Benchmark the sport benchmark generators")
+    parser.add_argument("--sports", nargs="+", choices=list(SPORTS), default=list(SPORTS))
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES)
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--compare", metavar="RESULTS", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for sport in args.sports:
+        for axis in SPORTS[sport]["axes"]:
+            for factor in args.scales:
+                print(f"⏱️  {sport} {axis} x{factor}...", flush=True)
+                results.append(run_workload(sport, axis, factor))
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "results": results,
+        }, f, indent=2)
+
+    print_report(results)
+
+    warnings = scaling_warnings(results)
+    if warnings:
+        print("\n⚠️  Superlinear scaling:")
+        for warning in warnings:
+            print(f"  {warning}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+    print(f"\n✅ Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Recompute the benchmark fields of skill assessments against a new benchmark grid.
+
+skillAssessments snapshot benchmarkRating, benchmarkLevel, benchmarkDelta and
+benchmarkStatus when an assessment is recorded. When benchmarks are
+regenerated those snapshots go stale. This engine recomputes them for a whole
+export at once, with the rules of the mutation that wrote each row
+(models/skillAssessments.ts):
+
+recordAssessmentWithBenchmark (benchmarkLevel holds the age group code, or is unset)
+    - ageGroup from the player's date of birth when the row was recorded
+      (createdAt; the assessment date if there is none): u7 ... u21, senior
+    - the benchmark is the (sportCode, skillCode, ageGroup, "all", level) row,
+      level being the default ("recreational"); player gender is not used and
+      ageGroup is matched exactly, as the by_context index lookup does
+    - status from the thresholds, with no "exceptional":
+          rating < minAcceptable        below
+          rating < developingThreshold  developing
+          rating < excellentThreshold   on_track
+          otherwise                     exceeding
+    - benchmarkLevel is written back as the age group code
+
+recordAssessment (benchmarkLevel holds a level literal)
+    - the same lookup at that level; benchmarkLevel is kept
+    - status from the delta to expectedRating:
+          delta < -1 below, < 0 developing, < 0.5 on_track, < 1 exceeding, otherwise exceptional
+
+The grid (IMPORT files, or a skillBenchmarks export) is loaded into a key
+index with the threshold ladder in NumPy columns; each assessment's key is
+resolved in one pass and everything after that is column arithmetic. Only
+rows whose stored values differ are emitted, as {"_id", "patch"} lines ready
+for ctx.db.patch. Assessments with no matching benchmark are counted and
+left alone. Requires numpy (pip install numpy).
+"""
+
+import json
+from itertools import repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmark_io import read_benchmarks
+from benchmark_schema import SCHEMA_LEVELS, iter_valid_rows
+
+STATUSES = ("below", "developing", "on_track", "exceeding", "exceptional")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+DEFAULT_LEVEL = "recreational"
+
+# Age group codes by whole years of age, as getAgeGroupFromDOB: under 7 -> u7, 21 and over -> senior
+YOUNGEST_CODE = 7
+AGE_GROUP_CODES = np.array([f"u{age}" for age in range(YOUNGEST_CODE, 22)] + ["senior"], dtype=object)
+
+WRITER_GENDER = "all"
+
+def grid_key(sport: str, skill: str, age_group: str, gender: str, level: str) -> str:
+    return "\x1f".join((sport, skill, age_group, gender, level))
+
+def read_documents(path: str) -> Iterator[Dict[str, Any]]:
+    """Documents from a Convex export (documents.jsonl), an NDJSON file or a JSON array."""
+    with open(path) as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from json.load(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+class BenchmarkGrid:
+    """Benchmark rows keyed by context, with the threshold ladder as NumPy columns."""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.index: Dict[str, int] = {}
+        self.levels: List[str] = []
+        ladders = []
+        self.duplicates = 0
+        for row in rows:
+            key = grid_key(row["sportCode"], row["skillCode"], row["ageGroup"], row["gender"], row["level"])
+            # bulkImportBenchmarks keeps the first row for a context and skips the rest
+            if key in self.index:
+                self.duplicates += 1
+                continue
+            self.index[key] = len(ladders)
+            self.levels.append(row["level"])
+            ladders.append((row["expectedRating"], row["minAcceptable"],
+                            row["developingThreshold"], row["excellentThreshold"]))
+
+        ladder = np.array(ladders, dtype=np.float64).reshape(-1, 4)
+        self.expected, self.minimum, self.developing, self.excellent = ladder.T
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Grid row for each key, -1 where there is none."""
+        return np.fromiter(map(self.index.get, keys, repeat(-1, len(keys))), dtype=np.int64, count=len(keys))
+
+def load_grid(paths: Iterable[str]) -> BenchmarkGrid:
+    """
+    Grid from IMPORT files (converted and validated as for upload) or from
+    skillBenchmarks export documents (.jsonl, inactive rows skipped).
+    """
+    def rows():
+        for path in paths:
+            if path.endswith(".jsonl"):
+                yield from (doc for doc in read_documents(path) if doc.get("isActive", True))
+            else:
+                yield from iter_valid_rows(read_benchmarks(path))
+
+    return BenchmarkGrid(rows())
+
+def _recorded_on(assessment: Dict[str, Any]) -> Optional[str]:
+    """The date the writer computed the age on: createdAt (epoch ms), else the assessment date."""
+    if isinstance(assessment.get("createdAt"), (int, float)):
+        return str(np.datetime64(int(assessment["createdAt"]), "ms").astype("datetime64[D]"))
+    return assessment.get("assessmentDate")
+
+def _age_codes(birth_dates: Sequence[Optional[str]], assessment_dates: Sequence[Optional[str]]) -> np.ndarray:
+    """Age group code at each date; "" where either date is missing."""
+    known = np.array([bool(b) and bool(a) for b, a in zip(birth_dates, assessment_dates)], dtype=bool)
+    codes = np.full(len(known), "", dtype=object)
+    if not known.any():
+        return codes
+
+    born = np.array([b[:10] for b, k in zip(birth_dates, known) if k], dtype="datetime64[D]")
+    assessed = np.array([a[:10] for a, k in zip(assessment_dates, known) if k], dtype="datetime64[D]")
+
+    def year_month_day(dates):
+        months = dates.astype("datetime64[M]")
+        return (months.astype("datetime64[Y]").astype(np.int64),
+                months.astype(np.int64) % 12,
+                (dates - months).astype(np.int64))
+
+    born_year, born_month, born_day = year_month_day(born)
+    year, month, day = year_month_day(assessed)
+    # Whole years, less one if the birthday has not come round yet that year
+    before_birthday = (month < born_month) | ((month == born_month) & (day < born_day))
+    age = year - born_year - before_birthday
+    codes[known] = AGE_GROUP_CODES[np.clip(age - YOUNGEST_CODE + 1, 0, len(AGE_GROUP_CODES) - 1)]
+    return codes
+
+def assessment_context(assessments: List[Dict[str, Any]], players: Optional[Dict[str, Dict[str, Any]]] = None,
+                       default_level: str = DEFAULT_LEVEL) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    (ageGroup codes, levels, by_delta) per assessment. An ageGroup already on
+    a row (a flattened export) wins over the player's date of birth. by_delta
+    marks rows recordAssessment wrote (benchmarkLevel is a level literal),
+    which keep that level and its delta-based status.
+    """
+    players = players or {}
+    owners = [players.get(a.get("playerIdentityId"), {}) for a in assessments]
+    ages = _age_codes([p.get("dateOfBirth") for p in owners], [_recorded_on(a) for a in assessments])
+    for position, assessment in enumerate(assessments):
+        if assessment.get("ageGroup"):
+            ages[position] = assessment["ageGroup"]
+    by_delta = np.array([a.get("benchmarkLevel") in SCHEMA_LEVELS for a in assessments], dtype=bool)
+    levels = [a["benchmarkLevel"] if literal else default_level for a, literal in zip(assessments, by_delta)]
+    return ages, levels, by_delta
+
+def match(grid: BenchmarkGrid, assessments: List[Dict[str, Any]], ages: np.ndarray, levels: List[str]) -> np.ndarray:
+    """Grid row per assessment (-1 for none): the "all" gender row, as the writers look it up."""
+    return grid.lookup([grid_key(a["sportCode"], a["skillCode"], age, WRITER_GENDER, level)
+                        for a, age, level in zip(assessments, ages, levels)])
+
+def compute(grid: BenchmarkGrid, ratings: np.ndarray, rows: np.ndarray,
+            by_delta: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(benchmarkRating, benchmarkDelta, status code) for matched rows (rows >= 0)."""
+    expected = grid.expected[rows]
+    delta = ratings - expected
+    # recordAssessmentWithBenchmark: thresholds, never "exceptional"
+    status = np.select(
+        [ratings < grid.minimum[rows], ratings < grid.developing[rows], ratings < grid.excellent[rows]],
+        [STATUS_CODES["below"], STATUS_CODES["developing"], STATUS_CODES["on_track"]],
+        STATUS_CODES["exceeding"],
+    ).astype(np.int8)
+    if by_delta is not None and by_delta.any():
+        # recordAssessment: the delta to the expected rating
+        status = np.where(by_delta, np.select(
+            [delta < -1, delta < 0, delta < 0.5, delta < 1],
+            [STATUS_CODES["below"], STATUS_CODES["developing"], STATUS_CODES["on_track"], STATUS_CODES["exceeding"]],
+            STATUS_CODES["exceptional"],
+        ), status).astype(np.int8)
+    return expected, delta, status
+
+def _stored(assessments: List[Dict[str, Any]], field: str) -> np.ndarray:
+    return np.array([np.nan if a.get(field) is None else a[field] for a in assessments], dtype=np.float64)
+
+def backfill(assessments: List[Dict[str, Any]], grid: BenchmarkGrid,
+             players: Optional[Dict[str, Dict[str, Any]]] = None,
+             default_level: str = DEFAULT_LEVEL) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Patches for assessments whose benchmark fields changed, and a summary."""
+    ages, levels, by_delta = assessment_context(assessments, players, default_level)
+    rows = match(grid, assessments, ages, levels)
+    matched = np.flatnonzero(rows >= 0)
+    subset = [assessments[i] for i in matched]
+
+    ratings = np.array([a["rating"] for a in subset], dtype=np.float64)
+    rating, delta, status = compute(grid, ratings, rows[matched], by_delta[matched])
+    # recordAssessmentWithBenchmark stores the age group code as benchmarkLevel; recordAssessment the level
+    level = np.where(by_delta[matched], np.array([levels[i] for i in matched], dtype=object), ages[matched])
+
+    stored_status = np.array([STATUS_CODES.get(a.get("benchmarkStatus"), -1) for a in subset], dtype=np.int8)
+    stored_level = np.array([a.get("benchmarkLevel") for a in subset], dtype=object)
+    # isclose is False against NaN, so a missing stored value always counts as changed
+    changed = (~np.isclose(_stored(subset, "benchmarkRating"), rating, rtol=0, atol=1e-9)
+               | ~np.isclose(_stored(subset, "benchmarkDelta"), delta, rtol=0, atol=1e-9)
+               | (stored_status != status)
+               | (stored_level != level))
+
+    where = np.flatnonzero(changed)
+    patches = [
+        {"_id": subset[i]["_id"], "patch": {
+            "benchmarkRating": new_rating,
+            "benchmarkLevel": new_level,
+            "benchmarkDelta": new_delta,
+            "benchmarkStatus": STATUSES[new_status],
+        }}
+        for i, new_rating, new_level, new_delta, new_status in zip(
+            where.tolist(), rating[where].tolist(), level[where].tolist(), delta[where].tolist(),
+            status[where].tolist())
+    ]
+    summary = {
+        "assessments": len(assessments),
+        "matched": len(matched),
+        "unmatched": len(assessments) - len(matched),
+        "changed": len(patches),
+        "statuses": {STATUSES[code]: int(count) for code, count in enumerate(np.bincount(status, minlength=5))
+                     if count},
+    }
+    return patches, summary
+
+def write_patches(patches: Iterable[Dict[str, Any]], path: str) -> int:
+    """Write patches as NDJSON. Returns how many were written."""
+    count = 0
+    with open(path, "w") as f:
+        for patch in patches:
+            f.write(json.dumps(patch) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Coverage and consistency checks for benchmark IMPORT files.
+
+Each file is read once. While the records stream past, the checker:
+- indexes covered (skill, ageGroup, gender, level) cells in a set of
+  interned axis positions, from which coverage gaps are derived at the end
+- flags duplicate keys (benchmark_delta.benchmark_key, so athletics event
+  groups are part of the key), and warns about records that share a
+  skillBenchmarks by_context row (benchmark_delta.context_key) with an
+  earlier one - only the first of them is imported
+- checks the threshold ladder of each record,
+  minAcceptable <= developingThreshold <= expectedRating <= excellentThreshold,
+  that its values stay on the 1-5 rating scale, and that expected ratings do
+  not fall as the level rises
+- compares gender and level against the skillBenchmarks schema literals
+
+A coverage gap is a (skill, ageGroup, level) slot that other skills of the
+same sport have but this one does not, or a slot benchmarked for only some
+of the sport's genders without an "all" row. Comparing against the sport's
+own (ageGroup, level) profile, rather than the full cross product, keeps
+grade-based files (where each grade maps to one level) gap-free. When the
+sport's generator publishes offered_slots() (see benchmark_registry.py),
+slots its rules deliberately leave out - e.g. Starting Blocks Technique at
+U10/U12 in athletics - are counted as excluded rather than as gaps.
+
+check_files runs check_file for several files in parallel processes.
+"""
+
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from benchmark_delta import benchmark_key, context_key
+from benchmark_import import record_sport
+from benchmark_io import read_benchmarks
+from benchmark_schema import LEVEL_ALIASES, SCHEMA_GENDERS, SCHEMA_LEVELS
+
+RATING_MIN = 1
+RATING_MAX = 5
+
+# How many examples of each finding a report keeps
+DEFAULT_EXAMPLES = 10
+
+class _Axis:
+    """Interns the values seen on one key axis, in first-seen order."""
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        position = self.positions.get(value)
+        if position is None:
+            position = self.positions[value] = len(self.positions)
+        return position
+
+    def values(self) -> List[str]:
+        return list(self.positions)
+
+def _enum_status(value: str, literals: Tuple[str, ...], aliases: Dict[str, str]) -> Optional[str]:
+    """None for a schema literal, "normalised" for a value the importers map, "invalid" otherwise."""
+    if value in literals:
+        return None
+    lowered = value.lower()
+    return "normalised" if lowered in literals or lowered in aliases else "invalid"
+
+def _schema_level(value: str) -> str:
+    lowered = value.lower()
+    return LEVEL_ALIASES.get(lowered, lowered)
+
+def _ladder(record: Dict[str, Any]) -> Optional[Tuple[float, ...]]:
+    if "expectedLevel" in record:
+        return None
+    return (record["minAcceptable"], record["developingThreshold"],
+            record["expectedRating"], record["excellentThreshold"])
+
+def _label(key) -> str:
+    return " / ".join(str(part) for part in key if part is not None)
+
+def check_records(records: Iterable[Dict[str, Any]], examples: int = DEFAULT_EXAMPLES) -> Dict[str, Any]:
+    """Check one sport's records in a single pass. Returns a picklable report."""
+    skills, ages, genders, levels = _Axis(), _Axis(), _Axis(), _Axis()
+    covered = set()
+    seen = set()
+    contexts = set()
+    expected_by_level: Dict[Tuple, Dict[str, float]] = defaultdict(dict)
+    report = {
+        "sport": None,
+        "records": 0,
+        "duplicates": [],
+        "collisions": [],
+        "ladders": [],
+        "scale": [],
+        "enums": {},
+        "duplicate_count": 0,
+        "collision_count": 0,
+        "ladder_count": 0,
+        "scale_count": 0,
+    }
+
+    for record in records:
+        report["records"] += 1
+        key = benchmark_key(record)
+        sport, skill, age, gender, level, event = key
+        if report["sport"] is None:
+            report["sport"] = record_sport(record)
+
+        if key in seen:
+            report["duplicate_count"] += 1
+            if len(report["duplicates"]) < examples:
+                report["duplicates"].append(_label(key))
+        else:
+            context = context_key(record)
+            if context in contexts:
+                report["collision_count"] += 1
+                if len(report["collisions"]) < examples:
+                    report["collisions"].append(_label(key))
+            contexts.add(context)
+        seen.add(key)
+
+        for field, value, literals, aliases in (("gender", gender, SCHEMA_GENDERS, {}),
+                                                ("level", level, SCHEMA_LEVELS, LEVEL_ALIASES)):
+            status = _enum_status(value, literals, aliases)
+            if status:
+                counts = report["enums"].setdefault(f"{field}={value}", {"status": status, "records": 0})
+                counts["records"] += 1
+
+        ladder = _ladder(record)
+        expected = record["expectedLevel"] if ladder is None else ladder[2]
+        if ladder is not None:
+            described = (f"{_label(key)}: min {ladder[0]}, developing {ladder[1]}, "
+                         f"expected {ladder[2]}, excellent {ladder[3]}")
+            if not ladder[0] <= ladder[1] <= ladder[2] <= ladder[3]:
+                report["ladder_count"] += 1
+                if len(report["ladders"]) < examples:
+                    report["ladders"].append(described)
+            if not RATING_MIN <= min(ladder) <= max(ladder) <= RATING_MAX:
+                report["scale_count"] += 1
+                if len(report["scale"]) < examples:
+                    report["scale"].append(described)
+        expected_by_level[(skill, age, gender, event)][_schema_level(level)] = expected
+
+        covered.add((skills(skill), ages(age), genders(gender.lower()), levels(level)))
+
+    report.update(_level_ladders(expected_by_level, examples))
+    offered = generator_slots(report["sport"]) if report["sport"] else None
+    report.update(_coverage(covered, skills.values(), ages.values(), genders.values(), levels.values(), examples,
+                            offered))
+    return report
+
+def generator_slots(sport: str) -> Optional[Set[Tuple[str, str, str]]]:
+    """The (skill, ageGroup, level) slots a sport's generator offers, if it says; None otherwise."""
+    from benchmark_registry import default_registry
+
+    registry = default_registry()
+    if sport not in registry:
+        return None
+    offered = getattr(registry.get(sport).module, "offered_slots", None)
+    return offered() if offered else None
+
+def _level_ladders(expected_by_level: Dict[Tuple, Dict[str, float]], examples: int) -> Dict[str, Any]:
+    """Expected ratings must not drop from recreational up to elite."""
+    found = []
+    count = 0
+    for key, by_level in expected_by_level.items():
+        ladder = [(level, by_level[level]) for level in SCHEMA_LEVELS if level in by_level]
+        if any(lower[1] > higher[1] for lower, higher in zip(ladder, ladder[1:])):
+            count += 1
+            if len(found) < examples:
+                found.append(f"{_label(key)}: " + ", ".join(f"{level} {value}" for level, value in ladder))
+    return {"level_ladders": found, "level_ladder_count": count}
+
+def _coverage(covered, skills: List[str], ages: List[str], genders: List[str], levels: List[str],
+              examples: int, offered: Optional[Set[Tuple[str, str, str]]] = None) -> Dict[str, Any]:
+    """Gaps against the sport's own (ageGroup, level) profile and gender split, less slots not offered."""
+    everyone = genders.index("all") if "all" in genders else None
+    specific = {position for position, gender in enumerate(genders) if gender != "all"}
+
+    slots: Dict[Tuple[int, int, int], set] = defaultdict(set)
+    for skill, age, gender, level in covered:
+        slots[(skill, age, level)].add(gender)
+    profile = {(age, level) for _, age, level in slots}
+
+    missing = []
+    partial = []
+    excluded = 0
+    for skill in range(len(skills)):
+        for age, level in sorted(profile):
+            slot = slots.get((skill, age, level))
+            if slot is None:
+                if offered is not None and (skills[skill], ages[age], levels[level]) not in offered:
+                    excluded += 1
+                else:
+                    missing.append((skills[skill], ages[age], levels[level]))
+            elif everyone not in slot and slot != specific:
+                absent = sorted(genders[gender] for gender in specific - slot)
+                partial.append((skills[skill], ages[age], levels[level], "no " + "/".join(absent)))
+
+    return {
+        "cells": len(covered),
+        "axes": {"skills": len(skills), "ageGroups": len(ages), "genders": genders, "levels": levels},
+        "gap_count": len(missing) + len(partial),
+        "excluded_count": excluded,
+        "gaps": [_label(gap) for gap in (missing + partial)[:examples]],
+    }
+
+def check_file(path: str, examples: int = DEFAULT_EXAMPLES) -> Dict[str, Any]:
+    """check_records for one IMPORT file (any format read_benchmarks understands)."""
+    report = check_records(read_benchmarks(path), examples)
+    report["file"] = os.path.basename(path)
+    return report
+
+def error_count(report: Dict[str, Any]) -> int:
+    """Findings that would import bad or ambiguous rows; everything in warning_count is softer."""
+    invalid = sum(counts["records"] for counts in report["enums"].values() if counts["status"] == "invalid")
+    return report["duplicate_count"] + report["ladder_count"] + report["level_ladder_count"] + invalid
+
+def warning_count(report: Dict[str, Any]) -> int:
+    """Coverage gaps, by_context collisions, off-scale thresholds and enum values the importers normalise."""
+    normalised = sum(counts["records"] for counts in report["enums"].values() if counts["status"] == "normalised")
+    return report["gap_count"] + report["collision_count"] + report["scale_count"] + normalised
+
+def check_files(paths: List[str], workers: Optional[int] = None,
+                examples: int = DEFAULT_EXAMPLES) -> List[Dict[str, Any]]:
+    """Check files in parallel, one process per file up to workers. Reports come back in input order."""
+    if len(paths) <= 1 or workers == 1:
+        return [check_file(path, examples) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(paths))) as pool:
+        return list(pool.map(check_file, paths, [examples] * len(paths)))
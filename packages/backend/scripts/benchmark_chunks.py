@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Size-bounded import batches for the bulkImportBenchmarks mutation.
+
+A generator's IMPORT file is split into chunk files that are each a complete,
+ready-to-send set of mutation arguments:
+
+    {"source": "...", "sourceDocument": "...", "sourceYear": 2025, "benchmarks": [...]}
+
+Every chunk is bounded by both row count and serialised bytes. The mutation
+runs one index lookup and one insert per row inside a single transaction, so
+the row cap keeps each call well inside Convex's per-transaction read/write
+limits, and the byte cap keeps the arguments far below the argument size
+limit. A manifest records each chunk's row count, size and SHA-256 so chunks
+can be uploaded in parallel, verified, and retried one at a time:
+
+    {
+      "format": "pdp-benchmarks-chunks/1",
+      "mutation": "models/skillBenchmarks:bulkImportBenchmarks",
+      "sport": "athletics",
+      "records": 1174,
+      "limits": {"maxRecords": 500, "maxBytes": 1048576},
+      "chunks": [{"file": "athletics-chunk-0001.json", "records": 500, "bytes": 401234, "sha256": "..."}, ...]
+    }
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CHUNKS_FORMAT = "pdp-benchmarks-chunks/1"
+MUTATION = "models/skillBenchmarks:bulkImportBenchmarks"
+
+DEFAULT_MAX_RECORDS = 500
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# Chunks are written compactly; this is also what the byte bound measures
+SEPARATORS = (",", ":")
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=SEPARATORS).encode("utf-8")
+
+def iter_chunks(rows: Iterable[Dict[str, Any]], meta: Dict[str, Any],
+                max_records: int = DEFAULT_MAX_RECORDS,
+                max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (payload, row count) pairs, each payload being serialised mutation
+    arguments ({**meta, "benchmarks": [...]}) with at most max_records rows
+    and at most max_bytes bytes.
+    """
+    # Everything but the rows: '{"source":...,"benchmarks":[' + ']}'
+    head = _encode({**meta, "benchmarks": []})[:-2]
+    overhead = len(head) + 2
+
+    encoded: List[bytes] = []
+    size = overhead
+    for row in rows:
+        body = _encode(row)
+        added = len(body) + (1 if encoded else 0)
+        if overhead + len(body) > max_bytes:
+            raise ValueError(f"A single benchmark row is {len(body)} bytes, over the {max_bytes} byte chunk limit")
+        if encoded and (len(encoded) >= max_records or size + added > max_bytes):
+            yield head + b",".join(encoded) + b"]}", len(encoded)
+            encoded, size = [], overhead
+            added = len(body)
+        encoded.append(body)
+        size += added
+
+    if encoded:
+        yield head + b",".join(encoded) + b"]}", len(encoded)
+
+def chunk_name(sport: str, number: int) -> str:
+    return f"{sport}-chunk-{number:04d}.json"
+
+def manifest_path(output_dir: str, sport: str) -> str:
+    return os.path.join(output_dir, f"{sport}-MANIFEST.json")
+
+def write_chunks(rows: Iterable[Dict[str, Any]], meta: Dict[str, Any], output_dir: str, sport: str,
+                 max_records: int = DEFAULT_MAX_RECORDS, max_bytes: int = DEFAULT_MAX_BYTES,
+                 mutation: str = MUTATION, prefix: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write chunk files and their manifest into output_dir. Returns the manifest.
+    Files are named after prefix (default: the sport), so a sport's delta
+    chunks can sit beside its full import.
+    """
+    prefix = prefix or sport
+    chunks = []
+    for number, (payload, count) in enumerate(iter_chunks(rows, meta, max_records, max_bytes), 1):
+        name = chunk_name(prefix, number)
+        with open(os.path.join(output_dir, name), "wb") as f:
+            f.write(payload)
+        chunks.append({
+            "file": name,
+            "records": count,
+            "bytes": len(payload),
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        })
+
+    manifest = {
+        "format": CHUNKS_FORMAT,
+        "mutation": mutation,
+        "sport": sport,
+        "records": sum(chunk["records"] for chunk in chunks),
+        "limits": {"maxRecords": max_records, "maxBytes": max_bytes},
+        "chunks": chunks,
+    }
+
+    # Drop chunks left over from an earlier, larger split
+    written = {chunk["file"] for chunk in chunks}
+    for stale in glob.glob(os.path.join(output_dir, glob.escape(prefix) + "-chunk-*.json")):
+        if os.path.basename(stale) not in written:
+            os.remove(stale)
+
+    # The manifest is written last, so a complete manifest implies complete chunks
+    path = manifest_path(output_dir, prefix)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+    return manifest
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != CHUNKS_FORMAT:
+        raise ValueError(f"Unsupported chunk manifest format: {manifest.get('format')!r}")
+    return manifest
+
+def read_chunk(manifest_file: str, chunk: Dict[str, Any]) -> bytes:
+    """Read one chunk's payload, raising ValueError if it doesn't match its checksum."""
+    path = os.path.join(os.path.dirname(os.path.abspath(manifest_file)), chunk["file"])
+    with open(path, "rb") as f:
+        payload = f.read()
+    if hashlib.sha256(payload).hexdigest() != chunk["sha256"]:
+        raise ValueError(f"Checksum mismatch for {chunk['file']}")
+    return payload
+
+def verify_manifest(path: str) -> List[Tuple[str, str]]:
+    """Check every chunk listed in a manifest. Returns (file, problem) pairs; empty when all is well."""
+    manifest = load_manifest(path)
+    problems = []
+    for chunk in manifest["chunks"]:
+        try:
+            read_chunk(path, chunk)
+        except FileNotFoundError:
+            problems.append((chunk["file"], "missing"))
+        except ValueError:
+            problems.append((chunk["file"], "checksum mismatch"))
+    return problems
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Dictionary-encoded compact format for benchmark IMPORT files.
+
+Generated benchmarks repeat the same indicator lists and near-identical prose
+across thousands of records. The compact format stores every distinct string
+and string list once and has records reference them by id:
+
+    {
+      "format": "pdp-benchmarks-compact/1",
+      "fields": [["sport", "str"], ["expectedLevel", "raw"], ...],
+      "strings": ["Athletics", ...],
+      "lists": [[0, 4, 9], ...],
+      "records": [[0, 3, 1, ...], ...]
+    }
+
+Field kinds:
+- str:  string id
+- list: id of a list of string ids
+- text: id of a list of string ids holding the sentences of a prose field
+- raw:  value stored inline (numbers, booleans)
+
+Nested objects such as performanceIndicators are flattened to dotted field
+names and rebuilt on load. Entries are written one per line, which keeps the
+file diff-friendly and compresses well with gzip.
+"""
+
+import gzip
+import io
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+COMPACT_FORMAT = "pdp-benchmarks-compact/1"
+
+# Prose fields that are split into sentences so shared sentences are stored once
+TEXT_FIELDS = ("assessmentNotes", "progressionPath", "notes")
+
+SENTENCE_BREAK = re.compile(r"(?<=\. )")
+
+def flatten(record: Dict[str, Any], prefix: str = "") -> Iterator[tuple]:
+    """(dotted field name, value) pairs, nested objects flattened in key order."""
+    for key, value in record.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            yield from flatten(value, name + ".")
+        else:
+            yield name, value
+
+def field_kind(name: str, value: Any) -> str:
+    """The field kind (str, list, text or raw) a value is stored as."""
+    if isinstance(value, str):
+        return "text" if name.split(".")[-1] in TEXT_FIELDS else "str"
+    if isinstance(value, list):
+        return "list"
+    return "raw"
+
+class _Interner:
+    """Assigns stable ids to distinct values in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def add(self, value) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+def encode_compact(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Dictionary-encode benchmark records into the compact structure."""
+    strings = _Interner()
+    lists = _Interner()
+    fields: Dict[str, str] = {}
+    rows = []
+
+    for record in records:
+        flat = dict(flatten(record))
+        for name, value in flat.items():
+            if name not in fields:
+                if rows:
+                    raise ValueError(f"Field '{name}' missing from earlier records")
+                fields[name] = field_kind(name, value)
+
+        if len(flat) != len(fields):
+            missing = sorted(set(fields) - set(flat))
+            raise ValueError(f"Record is missing fields: {missing}")
+
+        row = []
+        for name, kind in fields.items():
+            value = flat[name]
+            if kind == "str":
+                row.append(strings.add(value))
+            elif kind == "text":
+                sentences = SENTENCE_BREAK.split(value)
+                row.append(lists.add(tuple(strings.add(s) for s in sentences)))
+            elif kind == "list":
+                row.append(lists.add(tuple(strings.add(s) for s in value)))
+            else:
+                row.append(value)
+        rows.append(row)
+
+    return {
+        "format": COMPACT_FORMAT,
+        "fields": [[name, kind] for name, kind in fields.items()],
+        "strings": strings.values,
+        "lists": [list(entry) for entry in lists.values],
+        "records": rows,
+    }
+
+def iter_expanded(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Expand a compact structure back into benchmark records of the original shape."""
+    if data.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unsupported compact format: {data.get('format')!r}")
+
+    strings = data["strings"]
+    lists = data["lists"]
+    fields = [(name.split("."), kind) for name, kind in data["fields"]]
+
+    for row in data["records"]:
+        record: Dict[str, Any] = {}
+        for (path, kind), value in zip(fields, row):
+            if kind == "str":
+                value = strings[value]
+            elif kind == "text":
+                value = "".join(strings[i] for i in lists[value])
+            elif kind == "list":
+                value = [strings[i] for i in lists[value]]
+
+            target = record
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+        yield record
+
+def write_compact(data: Dict[str, Any], f: TextIO) -> None:
+    """Write a compact structure with one dictionary entry or record per line."""
+    def section(name, entries):
+        lines = ",\n".join(json.dumps(entry, separators=(",", ":")) for entry in entries)
+        return f'"{name}":[\n{lines}\n]' if lines else f'"{name}":[]'
+
+    f.write("{" + f'"format":{json.dumps(data["format"])},\n')
+    f.write(f'"fields":{json.dumps(data["fields"], separators=(",", ":"))},\n')
+    f.write(section("strings", data["strings"]) + ",\n")
+    f.write(section("lists", data["lists"]) + ",\n")
+    f.write(section("records", data["records"]) + "}\n")
+
+def save_compact(records: Iterable[Dict[str, Any]], path: str) -> Dict[str, Any]:
+    """Encode records and write them to path, gzipped when path ends in .gz."""
+    data = encode_compact(records)
+    if path.endswith(".gz"):
+        # mtime=0 keeps the gzip output reproducible between builds
+        with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            with io.TextIOWrapper(gz, encoding="utf-8") as f:
+                write_compact(data, f)
+    else:
+        with open(path, "w") as f:
+            write_compact(data, f)
+    return data
+
+def load_compact(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Load a compact file (optionally gzipped) and expand it to {"benchmarks": [...]}."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"benchmarks": list(iter_expanded(data))}
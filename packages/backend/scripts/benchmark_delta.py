@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Incremental benchmark regeneration.
+
+Records are keyed by (sport, skill, ageGroup, gender, level[, eventGroup]) and
+a freshly generated set is diffed against the existing IMPORT file. The delta
+is taken per skillBenchmarks by_context row, which has no event group: both
+sides are collapsed to the first record for each context, as
+bulkImportBenchmarks keeps, so an import only has to touch the rows that
+actually moved:
+
+    {
+      "base": "rugby-benchmarks-IMPORT.json",
+      "summary": {"added": 0, "changed": 12, "removed": 0, "unchanged": 996, "records": 12},
+      "added": [...],
+      "changed": [...],
+      "removed": [...]
+    }
+
+upload-benchmarks.py sends a delta file to the applyBenchmarkDelta mutation:
+added and changed records are upserted on the skillBenchmarks by_context
+index, and removed records go as rows with isActive: false, which deactivates
+the active benchmark for that context.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from benchmark_import import normalize_gender, normalize_level, record_sport, skill_name_to_code
+from benchmark_io import read_benchmarks
+
+DELTA_MUTATION = "models/skillBenchmarks:applyBenchmarkDelta"
+
+BenchmarkKey = Tuple[Optional[str], ...]
+ContextKey = Tuple[str, str, str, str, str]
+
+def benchmark_key(record: Dict[str, Any]) -> BenchmarkKey:
+    """
+    Identity of a benchmark record. Handles both the rugby field names
+    (sportCode, level) and the athletics ones (sport, competitiveLevel, eventGroup).
+    Files written straight in mutation shape carry skillCode instead of skillName.
+    """
+    return (
+        record.get("sportCode", record.get("sport")),
+        record["skillName"] if "skillName" in record else record["skillCode"],
+        record["ageGroup"],
+        record["gender"],
+        record.get("level", record.get("competitiveLevel")),
+        record.get("eventGroup"),
+    )
+
+def index_benchmarks(records: Iterable[Dict[str, Any]]) -> Dict[BenchmarkKey, Dict[str, Any]]:
+    """Index records by key, rejecting duplicates."""
+    index = {}
+    for record in records:
+        key = benchmark_key(record)
+        if key in index:
+            raise ValueError(f"Duplicate benchmark key: {key}")
+        index[key] = record
+    return index
+
+def context_key(record: Dict[str, Any]) -> ContextKey:
+    """
+    The skillBenchmarks by_context key a record imports under, converted as
+    benchmark_import.to_mutation_row converts it. Athletics event groups are
+    not part of it, so several records can share one context.
+    """
+    return (
+        record_sport(record),
+        record["skillCode"] if "skillCode" in record else skill_name_to_code(record["skillName"]),
+        record["ageGroup"],
+        normalize_gender(record["gender"]),
+        normalize_level(record.get("level", record.get("competitiveLevel"))),
+    )
+
+def first_per_context(records: Iterable[Dict[str, Any]]) -> Dict[ContextKey, Dict[str, Any]]:
+    """The first record for each by_context key, as bulkImportBenchmarks keeps the first and skips the rest."""
+    contexts: Dict[ContextKey, Dict[str, Any]] = {}
+    for record in records:
+        contexts.setdefault(context_key(record), record)
+    return contexts
+
+def diff_benchmarks(existing: Iterable[Dict[str, Any]], generated: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare generated records against existing ones.
+
+    added/changed/removed are per by_context row, each holding the record
+    that row imports from (the first for its context), so applying them
+    leaves the table as a fresh bulk import would. summary["records"] counts
+    record-level differences, which can be non-zero when no row moves (e.g.
+    a second event group's record for a context changed).
+    """
+    remaining = index_benchmarks(existing)
+    existing_contexts = first_per_context(remaining.values())
+    generated_contexts: Dict[ContextKey, Dict[str, Any]] = {}
+    seen = set()
+    records_differing = 0
+
+    for record in generated:
+        key = benchmark_key(record)
+        if key in seen:
+            raise ValueError(f"Duplicate benchmark key: {key}")
+        seen.add(key)
+        generated_contexts.setdefault(context_key(record), record)
+        if remaining.pop(key, None) != record:
+            records_differing += 1
+    records_differing += len(remaining)
+
+    added, changed = [], []
+    unchanged = 0
+    for context, record in generated_contexts.items():
+        previous = existing_contexts.pop(context, None)
+        if previous is None:
+            added.append(record)
+        elif previous != record:
+            changed.append(record)
+        else:
+            unchanged += 1
+    removed = list(existing_contexts.values())
+
+    return {
+        "summary": {
+            "added": len(added),
+            "changed": len(changed),
+            "removed": len(removed),
+            "unchanged": unchanged,
+            "records": records_differing,
+        },
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+    }
+
+def delta_path(import_path: str) -> str:
+    """rugby-benchmarks-IMPORT.json -> rugby-benchmarks-DELTA.json"""
+    directory, name = os.path.split(import_path)
+    base = name.split("-IMPORT")[0]
+    return os.path.join(directory, f"{base}-DELTA.json")
+
+def write_delta(import_path: str, generated: Iterable[Dict[str, Any]], output_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Diff generated records against the IMPORT file at import_path and write the
+    delta next to it. A missing IMPORT file is treated as empty, so every
+    record is reported as added.
+    """
+    existing = read_benchmarks(import_path) if os.path.exists(import_path) else []
+    delta = diff_benchmarks(existing, generated)
+
+    output_file = output_file or delta_path(import_path)
+    with open(output_file, "w") as f:
+        json.dump({"base": os.path.basename(import_path), **delta}, f, indent=2)
+
+    return {"file": output_file, **delta["summary"]}
+
+def read_delta(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        delta = json.load(f)
+    if not all(isinstance(delta.get(part), list) for part in ("added", "changed", "removed")):
+        raise ValueError(f"{path} is not a benchmark delta file")
+    return delta
+
+def iter_delta_rows(delta: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """applyBenchmarkDelta rows: added and changed records, then removed ones marked inactive."""
+    # benchmark_schema imports this module for benchmark_key
+    from benchmark_schema import iter_valid_rows
+
+    yield from iter_valid_rows(delta["added"] + delta["changed"])
+    for row in iter_valid_rows(delta["removed"]):
+        yield {**row, "isActive": False}
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Convert generator records into bulkImportBenchmarks mutation rows.
+
+The generators write sport-specific record shapes (rugby uses sportCode/level
+and 0.5-step thresholds, athletics uses sport/competitiveLevel/expectedLevel).
+The skillBenchmarks mutation takes one shape. These helpers do the same
+conversion as import-athletics-data.ts and migrations/importRugbyBenchmarks.ts,
+so Python upload tooling sends exactly what the TypeScript importers send.
+"""
+
+import re
+from typing import Any, Dict
+
+# Source metadata passed alongside each batch, as used by the existing importers
+SOURCES = {
+    "athletics": {
+        "source": "Athletics Ireland",
+        "sourceDocument": "Athletics Skill Standards and Benchmarks 2025",
+        "sourceYear": 2025,
+    },
+    "rugby": {
+        "source": "Rugby Research",
+        "sourceDocument": "Rugby Skill Standards Research 2026",
+        "sourceYear": 2026,
+    },
+}
+
+PERCENTILE_FIELDS = ("percentile25", "percentile50", "percentile75", "percentile90")
+
+def skill_name_to_code(name: str) -> str:
+    """"Evasion (Side Step)" -> "evasion_side_step", as skillNameToCode() in the importers."""
+    code = name.lower().replace("&", "and")
+    return re.sub(r"[^a-z0-9]+", "_", code).strip("_")
+
+def normalize_gender(gender: str) -> str:
+    normalized = gender.lower()
+    return normalized if normalized in ("male", "female") else "all"
+
+def normalize_level(level: str) -> str:
+    normalized = level.lower()
+    if normalized == "developmental":
+        return "development"
+    return normalized if normalized in ("competitive", "elite", "development") else "recreational"
+
+def record_sport(record: Dict[str, Any]) -> str:
+    return (record.get("sportCode") or record["sport"]).lower()
+
+def to_mutation_row(record: Dict[str, Any], normalize_enums: bool = True) -> Dict[str, Any]:
+    """
+    One generator record as a bulkImportBenchmarks benchmarks[] entry.
+    With normalize_enums=False gender and level are copied as written, so a
+    strict validator (benchmark_schema.py) can reject values the lenient
+    normalize_* helpers would quietly map to "all" or "recreational".
+    """
+    gender_of = normalize_gender if normalize_enums else str
+    level_of = normalize_level if normalize_enums else str
+    if "expectedLevel" in record:
+        expected = record["expectedLevel"]
+        row = {
+            "sportCode": record_sport(record),
+            "skillCode": skill_name_to_code(record["skillName"]),
+            "ageGroup": record["ageGroup"],
+            "gender": gender_of(record["gender"]),
+            "level": level_of(record["competitiveLevel"]),
+            "expectedRating": expected,
+            "minAcceptable": max(1, expected - 1),
+            "developingThreshold": expected,
+            "excellentThreshold": min(5, expected + 1),
+        }
+        notes = (f"{record['assessmentNotes']}\n\nProgression: {record['progressionPath']}"
+                 f"\n\nEvent Group: {record['eventGroup']}")
+    else:
+        row = {
+            "sportCode": record_sport(record),
+            "skillCode": record["skillCode"] if "skillCode" in record else skill_name_to_code(record["skillName"]),
+            "ageGroup": record["ageGroup"],
+            "gender": gender_of(record["gender"]),
+            "level": level_of(record["level"]),
+            "expectedRating": record["expectedRating"],
+            "minAcceptable": record["minAcceptable"],
+            "developingThreshold": record["developingThreshold"],
+            "excellentThreshold": record["excellentThreshold"],
+        }
+        notes = record.get("notes")
+
+    for field in PERCENTILE_FIELDS:
+        if record.get(field) is not None:
+            row[field] = record[field]
+    if notes:
+        row["notes"] = notes
+    return row
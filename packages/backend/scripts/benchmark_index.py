@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Sidecar byte-offset index for benchmark IMPORT files.
+
+Answering "what is the expected rating for U16 female elite Tackle Technique"
+should not mean json.load-ing the whole file. Next to each IMPORT file, a
+<file>.idx holds one fixed-width entry per record key:
+
+    header   PDPBIDX1 | entry count | data size | data mtime_ns | sport
+    entries  key hash (u64) | byte offset (u64) | byte length (u32), sorted by hash
+
+Keys are (sport, skill, ageGroup, gender, level[, eventGroup]), compared case
+insensitively. Athletics records are also indexed without their eventGroup,
+so a query that leaves the event out finds every event group for that cell.
+
+Lookups memory-map the index and the data file, binary-search the sorted
+hashes and decode only the matching records' bytes, so a lookup touches a
+few pages whatever the file size. Hash collisions are harmless: decoded
+records are checked against the query before being returned.
+
+The index is written alongside the data at generation time (--index), or
+built afterwards from any json.dump(indent=2) envelope or NDJSON file.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmark_delta import benchmark_key
+
+INDEX_SUFFIX = ".idx"
+MAGIC = b"PDPBIDX1"
+HEADER = struct.Struct("<8sQQQ32s")
+ENTRY = struct.Struct("<QQI")
+
+# Record bodies in a json.dump(indent=2) envelope open and close at this indent
+_ENVELOPE_RECORD_OPEN = b"    {"
+_ENVELOPE_RECORD_CLOSE = b"    }"
+
+def index_path(data_path: str) -> str:
+    return data_path + INDEX_SUFFIX
+
+def normalise_key(fields) -> Tuple[str, ...]:
+    """Case-insensitive form of a key; a missing eventGroup is dropped."""
+    return tuple(str(field).strip().lower() for field in fields if field is not None)
+
+def key_hash(key: Tuple[str, ...]) -> int:
+    digest = hashlib.blake2b("\x1f".join(key).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def record_keys(record: Dict[str, Any]) -> List[Tuple[str, ...]]:
+    """Every key a record is findable under: the full key, plus the key without eventGroup."""
+    full = benchmark_key(record)
+    keys = [normalise_key(full)]
+    if full[-1] is not None:
+        keys.append(normalise_key(full[:-1]))
+    return keys
+
+class IndexBuilder:
+    """Collects record spans (e.g. as write_benchmarks' on_record callback) and writes the index."""
+
+    def __init__(self):
+        self.entries: List[Tuple[int, int, int]] = []
+        self.sport = ""
+
+    def __call__(self, record: Dict[str, Any], offset: int, length: int) -> None:
+        for key in record_keys(record):
+            self.entries.append((key_hash(key), offset, length))
+        if not self.sport:
+            self.sport = normalise_key(benchmark_key(record)[:1])[0]
+
+    def write(self, data_path: str) -> str:
+        """Write <data_path>.idx, stamped with the data file's current size and mtime."""
+        stat = os.stat(data_path)
+        path = index_path(data_path)
+        self.entries.sort()
+        with open(path + ".tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.entries), stat.st_size, stat.st_mtime_ns,
+                                self.sport.encode("utf-8")[:32]))
+            for entry in self.entries:
+                f.write(ENTRY.pack(*entry))
+        os.replace(path + ".tmp", path)
+        return path
+
+def _iter_spans(data: mmap.mmap, ndjson: bool) -> Iterator[Tuple[int, int]]:
+    """(offset, length) of each record in a json.dump(indent=2) envelope or an NDJSON file."""
+    position = 0
+    start = None
+    size = len(data)
+    while position < size:
+        end = data.find(b"\n", position)
+        end = size if end < 0 else end + 1
+        line = data[position:end]
+        if ndjson:
+            if line.strip():
+                yield position, end - position
+        elif start is None and line.startswith(_ENVELOPE_RECORD_OPEN):
+            start = position + 4
+        elif start is not None and line.startswith(_ENVELOPE_RECORD_CLOSE):
+            yield start, position + len(_ENVELOPE_RECORD_CLOSE) - start
+            start = None
+        position = end
+
+def build_index(data_path: str) -> str:
+    """Index an existing IMPORT file by scanning it line by line."""
+    if os.path.getsize(data_path) == 0:
+        raise ValueError(f"{data_path} is empty")
+    builder = IndexBuilder()
+    ndjson = data_path.endswith(".ndjson")
+    with open(data_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for offset, length in _iter_spans(data, ndjson):
+            builder(json.loads(data[offset:offset + length]), offset, length)
+    return builder.write(data_path)
+
+class BenchmarkIndex:
+    """Memory-mapped index plus data file; use as a context manager."""
+
+    def __init__(self, data_path: str):
+        self.data_path = data_path
+        self._index_file = open(index_path(data_path), "rb")
+        self._data_file = open(data_path, "rb")
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, size, mtime_ns, sport = HEADER.unpack_from(self._index, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{index_path(data_path)} is not a benchmark index")
+        stat = os.stat(data_path)
+        if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            self.close()
+            raise ValueError(f"{index_path(data_path)} is stale; rebuild it")
+        self.sport = sport.rstrip(b"\0").decode("utf-8")
+
+    def _hash_at(self, position: int) -> int:
+        return struct.unpack_from("<Q", self._index, HEADER.size + position * ENTRY.size)[0]
+
+    def _spans(self, target: int) -> Iterator[Tuple[int, int]]:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        position = low
+        while position < self.count:
+            hashed, offset, length = ENTRY.unpack_from(self._index, HEADER.size + position * ENTRY.size)
+            if hashed != target:
+                break
+            yield offset, length
+            position += 1
+
+    def lookup(self, skill: str, age_group: str, gender: str, level: str,
+               event_group: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records matching the key; event_group=None matches every event group."""
+        key = normalise_key((self.sport, skill, age_group, gender, level, event_group))
+        results = []
+        for offset, length in self._spans(key_hash(key)):
+            record = json.loads(self._data[offset:offset + length])
+            if key in record_keys(record):
+                results.append(record)
+        return results
+
+    def close(self) -> None:
+        for handle in ("_index", "_data", "_index_file", "_data_file"):
+            if hasattr(self, handle):
+                getattr(self, handle).close()
+
+    def __enter__(self) -> "BenchmarkIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Streaming readers and writers for benchmark IMPORT files.
+
+Generators yield benchmark records one at a time and these helpers write them
+out incrementally, so memory use does not depend on how many records a sport
+produces. Two formats are supported:
+- json:   the {"benchmarks": [...]} envelope, byte-identical to json.dump(indent=2)
+- ndjson: one benchmark record per line
+
+read_benchmarks also understands the dictionary-encoded compact format
+written by benchmark_compact.
+"""
+
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from benchmark_compact import load_compact
+
+FORMATS = ["json", "ndjson"]
+
+# File extension used for each output format
+EXTENSIONS = {"json": ".json", "ndjson": ".ndjson", "compact": ".compact.json"}
+
+ENVELOPE_KEY = "benchmarks"
+
+def output_path(base_name: str, fmt: str) -> str:
+    """Build the IMPORT file name for a format, e.g. rugby-benchmarks-IMPORT.ndjson."""
+    return base_name + EXTENSIONS[fmt]
+
+def _iter_envelope_parts(records: Iterable[Dict[str, Any]], key: str) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """(text, record) pieces of the envelope; record is set only on a record's own JSON text."""
+    yield "{\n" + f'  {json.dumps(key)}: [', None
+
+    first = True
+    for record in records:
+        # JSON strings never contain raw newlines, so re-indenting line by line is safe
+        yield ("\n    " if first else ",\n    "), None
+        yield json.dumps(record, indent=2).replace("\n", "\n    "), record
+        first = False
+
+    yield ("]\n}" if first else "\n  ]\n}"), None
+
+def iter_json_envelope(records: Iterable[Dict[str, Any]], key: str = ENVELOPE_KEY) -> Iterator[str]:
+    """
+    Yield text chunks of {key: [records]} laid out exactly as json.dump(indent=2)
+    would lay it out, without ever holding more than one record in memory.
+    """
+    for text, _ in _iter_envelope_parts(records, key):
+        yield text
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield one JSON line per record."""
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+def write_benchmarks(records: Iterable[Dict[str, Any]], f: TextIO, fmt: str = "json",
+                     on_record: Optional[Callable[[Dict[str, Any], int, int], None]] = None) -> int:
+    """
+    Stream records to an open file in the given format. Returns bytes written.
+    on_record(record, offset, length) is called with each record's byte span,
+    which is what benchmark_index.py builds its sidecar index from.
+    """
+    if fmt == "ndjson":
+        parts = ((json.dumps(record) + "\n", record) for record in records)
+    else:
+        parts = _iter_envelope_parts(records, ENVELOPE_KEY)
+
+    size = 0
+    for chunk, record in parts:
+        f.write(chunk)
+        length = len(chunk.encode("utf-8"))
+        if on_record is not None and record is not None:
+            on_record(record, size, length)
+        size += length
+    return size
+
+def read_benchmarks(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield benchmark records from an IMPORT file in any supported format."""
+    if path.endswith((EXTENSIONS["compact"], EXTENSIONS["compact"] + ".gz")):
+        yield from load_compact(path)[ENVELOPE_KEY]
+        return
+
+    if path.endswith(EXTENSIONS["ndjson"]):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with open(path) as f:
+        data = json.load(f)
+    yield from data[ENVELOPE_KEY]
+
+def tally(records: Iterable[Dict[str, Any]], fields: List[str]) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Counter]]:
+    """
+    Count field values as records stream past.
+    Returns the pass-through iterator and the counters it fills in.
+    """
+    counts = {field: Counter() for field in fields}
+
+    def counting():
+        for record in records:
+            for field in fields:
+                counts[field][record[field]] += 1
+            yield record
+
+    return counting(), counts
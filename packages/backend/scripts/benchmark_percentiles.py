@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Synthesise percentile25/50/75/90 for generated benchmarks.
+
+The skillBenchmarks table has optional percentile fields that neither
+generator fills. This stage derives them from each cell's threshold ladder
+(minAcceptable, developingThreshold, excellentThreshold) using a split-normal
+model on the 1-5 rating scale:
+- the median is the developing threshold (the expected rating)
+- minAcceptable sits at the 10th percentile, excellentThreshold at the 90th
+- the lower and upper halves get their own spread from those two anchors
+
+Athletics records carry only expectedLevel, so their ladder is derived the
+same way import-athletics-data.ts derives it (expected -/+ 1, clamped to 1-5).
+For athletics, the parsed PERFORMANCE_STANDARDS ranges also scale the spread:
+cells whose published time bands are relatively wide get proportionally
+wider rating percentiles.
+
+Every chunk of records is computed as one NumPy array expression. Requires
+numpy (pip install numpy). It is only imported when this stage runs.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+PERCENTILES = (25, 50, 75, 90)
+
+# Standard normal quantiles for the percentiles above, and for the 90th
+# percentile used to anchor the ladder thresholds
+Z_SCORES = np.array([-0.6745, 0.0, 0.6745, 1.2816])
+Z_ANCHOR = 1.2816
+
+RATING_MIN = 1.0
+RATING_MAX = 5.0
+
+# Records are processed in chunks so memory stays flat for streamed builds
+CHUNK_SIZE = 4096
+
+def threshold_ladder(record: Dict[str, Any]) -> Tuple[float, float, float]:
+    """(minAcceptable, developingThreshold, excellentThreshold) for a record."""
+    if "developingThreshold" in record:
+        return (record["minAcceptable"], record["developingThreshold"], record["excellentThreshold"])
+
+    expected = record["expectedLevel"]
+    return (max(RATING_MIN, expected - 1), expected, min(RATING_MAX, expected + 1))
+
+def percentile_grid(minimum: np.ndarray, developing: np.ndarray, excellent: np.ndarray,
+                    spread: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Percentiles for every cell at once. Returns an (n, 4) array with columns
+    percentile25, percentile50, percentile75, percentile90.
+    """
+    lower_sigma = (developing - minimum) / Z_ANCHOR
+    upper_sigma = (excellent - developing) / Z_ANCHOR
+    if spread is not None:
+        lower_sigma = lower_sigma * spread
+        upper_sigma = upper_sigma * spread
+
+    sigma = np.where(Z_SCORES < 0, lower_sigma[:, None], upper_sigma[:, None])
+    grid = developing[:, None] + Z_SCORES[None, :] * sigma
+    return np.round(np.clip(grid, RATING_MIN, RATING_MAX), 2)
+
+def standards_spread(standards: Dict[str, Dict[str, Dict[str, Dict[str, str]]]]) -> Dict[Tuple[str, str, str], float]:
+    """
+    Relative spread factor per (ageGroup, gender, level) from PERFORMANCE_STANDARDS.
+
+    Each level's band width is taken relative to its midpoint and averaged over
+    events; open-ended bands borrow the width of the bounded band for the same
+    event. Factors are normalised so the mean across all cells is 1.
+    """
+    from athletics_standards import parse_standard
+
+    keys: List[Tuple[str, str, str]] = []
+    lows: List[float] = []
+    highs: List[float] = []
+    widths: List[float] = []
+
+    for by_age in standards.values():
+        for age_group, by_gender in by_age.items():
+            for gender, by_level in by_gender.items():
+                intervals = {level: parse_standard(text) for level, text in by_level.items()}
+                bounded = [i.high - i.low for i in intervals.values() if np.isfinite(i.high) and i.low > 0]
+                fallback = float(np.mean(bounded)) if bounded else 0.0
+                for level, interval in intervals.items():
+                    keys.append((age_group, gender, level))
+                    lows.append(interval.low)
+                    highs.append(interval.high)
+                    widths.append(fallback)
+
+    if not keys:
+        return {}
+
+    low = np.array(lows)
+    high = np.array(highs)
+    open_ended = ~np.isfinite(high) | (low <= 0)
+    width = np.where(open_ended, np.array(widths), high - low)
+    anchor = np.where(~np.isfinite(high), low, np.where(low <= 0, high, (low + high) / 2))
+    relative = width / anchor
+
+    # Average per (age, gender, level) across events
+    cells = sorted(set(keys))
+    cell_index = {cell: i for i, cell in enumerate(cells)}
+    groups = np.array([cell_index[key] for key in keys])
+    totals = np.bincount(groups, weights=relative, minlength=len(cells))
+    counts = np.bincount(groups, minlength=len(cells))
+    means = totals / counts
+    factors = means / means.mean()
+
+    return {cell: float(factor) for cell, factor in zip(cells, factors)}
+
+def add_percentiles(records: List[Dict[str, Any]],
+                    spread: Optional[Dict[Tuple[str, str, str], float]] = None) -> List[Dict[str, Any]]:
+    """Fill percentile25/50/75/90 on a batch of records in one array computation."""
+    if not records:
+        return records
+
+    ladders = np.array([threshold_ladder(record) for record in records], dtype=float)
+    factors = None
+    if spread:
+        factors = np.array([
+            spread.get((r["ageGroup"], r["gender"], r.get("competitiveLevel", r.get("level"))), 1.0)
+            for r in records
+        ])
+
+    grid = percentile_grid(ladders[:, 0], ladders[:, 1], ladders[:, 2], factors)
+    for record, row in zip(records, grid.tolist()):
+        for percentile, value in zip(PERCENTILES, row):
+            record[f"percentile{percentile}"] = value
+    return records
+
+def iter_with_percentiles(records: Iterable[Dict[str, Any]],
+                          spread: Optional[Dict[Tuple[str, str, str], float]] = None,
+                          chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Streaming wrapper: vectorise over fixed-size chunks of a record stream."""
+    chunk: List[Dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield from add_percentiles(chunk, spread)
+            chunk = []
+    yield from add_percentiles(chunk, spread)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Phase timing and profiling for the benchmark generators (--profile).
+
+A generator describes its build as named phases, each taking the previous
+phase's result:
+
+    phases = [("enumeration", lambda _: build_enumeration_plan()),
+              ("records", lambda plan: [...]),
+              ("serialisation", write_records)]
+    report = profile_phases(phases, "out/athletics-benchmarks-IMPORT")
+    print_profile_report(report)
+
+The phases are run three times so the instruments don't distort each other:
+once plain for wall time, once under tracemalloc for per-phase peak memory
+and once under cProfile. The profile is saved as <base>.prof (load with
+pstats or snakeviz) and as <base>.folded, a collapsed-stack file for
+flamegraph.pl / speedscope.
+"""
+
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+Phase = Tuple[str, Callable[[Any], Any]]
+
+# Functions reported in the top-N table of print_profile_report()
+TOP_FUNCTIONS = 15
+
+# Stack paths carrying less than this many microseconds are left out of the folded file
+MIN_FOLDED_MICROS = 1
+
+def _run(phases: List[Phase]) -> None:
+    result = None
+    for _, fn in phases:
+        result = fn(result)
+
+def time_phases(phases: List[Phase]) -> Dict[str, float]:
+    """Wall time per phase in seconds, uninstrumented."""
+    seconds: Dict[str, float] = {}
+    result = None
+    for name, fn in phases:
+        start = time.perf_counter()
+        result = fn(result)
+        seconds[name] = time.perf_counter() - start
+    return seconds
+
+def memory_phases(phases: List[Phase]) -> Dict[str, int]:
+    """tracemalloc peak bytes per phase, including the previous phase's live result."""
+    peaks: Dict[str, int] = {}
+    result = None
+    tracemalloc.start()
+    try:
+        for name, fn in phases:
+            tracemalloc.reset_peak()
+            result = fn(result)
+            peaks[name] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are reported as ('~', 0, "<built-in method ...>")
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def collapsed_stacks(stats: pstats.Stats, max_depth: int = 64) -> Dict[str, int]:
+    """
+    Rebuild approximate call stacks from cProfile's caller/callee edges.
+
+    cProfile only records one level of callers, so each function's time is
+    split across its callers in proportion to the cumulative time of each
+    call edge. Values are microseconds of self time per stack.
+    """
+    raw = stats.stats
+    callees: Dict[tuple, List[tuple]] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    stacks: Dict[str, int] = {}
+
+    def walk(func, path: List[tuple], share: float) -> None:
+        _, _, tottime, cumtime, _ = raw[func]
+        frames = path + [func]
+        micros = int(tottime * share * 1e6)
+        if micros >= MIN_FOLDED_MICROS:
+            key = ";".join(_label(f) for f in frames)
+            stacks[key] = stacks.get(key, 0) + micros
+        if len(frames) >= max_depth:
+            return
+        for callee in callees.get(func, []):
+            if callee in frames:
+                continue
+            callee_cumtime = raw[callee][3]
+            edge_cumtime = raw[callee][4][func][3]
+            if not callee_cumtime:
+                continue
+            callee_share = share * edge_cumtime / callee_cumtime
+            if callee_share * callee_cumtime * 1e6 >= MIN_FOLDED_MICROS:
+                walk(callee, frames, callee_share)
+
+    for func, (_, _, _, _, callers) in raw.items():
+        if not callers:
+            walk(func, [], 1.0)
+    return stacks
+
+def write_folded(stacks: Dict[str, int], path: str) -> None:
+    with open(path, "w") as f:
+        for stack, micros in sorted(stacks.items()):
+            f.write(f"{stack} {micros}\n")
+
+def profile_phases(phases: List[Phase], profile_base: str) -> Dict[str, Any]:
+    """
+    Time, memory-trace and profile the phases. Writes <profile_base>.prof and
+    <profile_base>.folded and returns a report for print_profile_report().
+    """
+    seconds = time_phases(phases)
+    peaks = memory_phases(phases)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        _run(phases)
+    finally:
+        profiler.disable()
+
+    stats_file = profile_base + ".prof"
+    folded_file = profile_base + ".folded"
+    profiler.dump_stats(stats_file)
+    stats = pstats.Stats(profiler)
+    write_folded(collapsed_stacks(stats), folded_file)
+
+    top = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:TOP_FUNCTIONS]
+    return {
+        "phases": [{"name": name, "seconds": seconds[name], "peakBytes": peaks[name]} for name, _ in phases],
+        "seconds": sum(seconds.values()),
+        "peakBytes": max(peaks.values(), default=0),
+        "statsFile": stats_file,
+        "foldedFile": folded_file,
+        "top": [{"function": _label(func), "calls": nc, "tottime": tt, "cumtime": ct}
+                for func, (_, nc, tt, ct, _) in top],
+    }
+
+def print_profile_report(report: Dict[str, Any]) -> None:
+    print("\n⏱️  Phase timings:")
+    print(f"  {'Phase':<16}{'Time':>10}{'Share':>8}{'Peak memory':>14}")
+    total = report["seconds"] or 1
+    for phase in report["phases"]:
+        print(f"  {phase['name']:<16}{phase['seconds']:>9.3f}s{phase['seconds'] / total:>7.0%}"
+              f"{phase['peakBytes'] / 1024 / 1024:>12.1f}MB")
+    print(f"  {'Total':<16}{report['seconds']:>9.3f}s{'':>8}{report['peakBytes'] / 1024 / 1024:>12.1f}MB")
+
+    print(f"\n🔥 Top {len(report['top'])} functions by own time (under cProfile):")
+    print(f"  {'Calls':>9}{'Own':>10}{'Cumulative':>12}  Function")
+    for row in report["top"]:
+        print(f"  {row['calls']:>9}{row['tottime']:>9.3f}s{row['cumtime']:>11.3f}s  {row['function']}")
+
+    print(f"\n✅ Profile saved to {report['statsFile']} (pstats) and {report['foldedFile']} (collapsed stacks)")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Array-backed, interned in-memory model for generated benchmarks.
+
+Each generated benchmark is a fresh dict of 10-12 keys with nested
+performanceIndicators dicts and lists. Holding thousands of them - or one set
+per organisation - costs far more than the distinct data they contain.
+RecordSet stores records column-wise instead:
+
+- every field is an array('I') of value ids, 4 bytes per record
+- values live once in a ValuePool: enum-like strings (ageGroup, gender,
+  level, eventGroup, sportCode) are interned and indicator lists are shared
+  as tuples
+- prose fields are stored as templates: the record's own string fields
+  (skill, age group, level...) are cut out of the text, so notes that only
+  differ in those share one template
+- nested objects are flattened to dotted field names by benchmark_compact
+
+Rows come back as BenchmarkRow views (two slots each) or as dicts of exactly
+the original shape, so output stays byte-identical:
+
+    pool = ValuePool()                       # share one pool across organisations
+    records = RecordSet(pool)
+    records.extend(module.iter_all_benchmarks())
+    records[0]["ageGroup"]                   # "U10", without building a dict
+    with open(path, "w") as f:
+        write_benchmarks(records.iter_dicts(), f)
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from benchmark_compact import field_kind, flatten
+
+# Value kinds, as named by benchmark_compact.field_kind()
+RAW, STR, LIST, TEXT = "raw", "str", "list", "text"
+
+class ValuePool:
+    """
+    Distinct field values, each stored once and addressed by id.
+
+    Values are keyed per type, so 3 and 3.0 (equal and with equal hashes)
+    keep their own ids and serialise exactly as generated.
+    """
+
+    def __init__(self):
+        self._ids: Dict[type, Dict[Any, int]] = {}
+        self.values: List[Any] = []
+
+    def add(self, value: Any) -> int:
+        if isinstance(value, str):
+            value = sys.intern(value)
+        ids = self._ids.get(type(value))
+        if ids is None:
+            ids = self._ids[type(value)] = {}
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def add_list(self, items: Iterable[str]) -> int:
+        """Pool a string list as a tuple of interned strings."""
+        return self.add(tuple(self.values[self.add(item)] for item in items))
+
+    def add_text(self, text: str, substitutions: Sequence[Tuple[int, str]] = ()) -> int:
+        """
+        Pool prose as a template: a tuple of literal pieces and field positions.
+        Each (position, value) substitution, longest first, replaces occurrences
+        of that record's field value with the field's position.
+        """
+        parts: List[Any] = [text]
+        for position, value in substitutions:
+            cut: List[Any] = []
+            for part in parts:
+                if isinstance(part, int) or value not in part:
+                    cut.append(part)
+                    continue
+                for number, piece in enumerate(part.split(value)):
+                    if number:
+                        cut.append(position)
+                    if piece:
+                        cut.append(piece)
+            parts = cut
+        return self.add(tuple(self.values[self.add(part)] if isinstance(part, str) else part for part in parts))
+
+    def __len__(self):
+        return len(self.values)
+
+class BenchmarkRow:
+    """Read-only view of one record in a RecordSet."""
+
+    __slots__ = ("_records", "_index")
+
+    def __init__(self, records: "RecordSet", index: int):
+        self._records = records
+        self._index = index
+
+    def __getitem__(self, field: str) -> Any:
+        return self._records.value(self._index, field)
+
+    def get(self, field: str, default: Any = None) -> Any:
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def __contains__(self, field: str) -> bool:
+        return self._records.has_field(field)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._records.record(self._index)
+
+    def __repr__(self):
+        return f"<BenchmarkRow {self._index} {self.to_dict()!r}>"
+
+class RecordSet:
+    """
+    Benchmark records stored as columns of pooled value ids.
+
+    All records in a set must have the same fields in the same order (as every
+    record from one generator does); a record with a different layout raises
+    ValueError rather than being silently reshaped.
+    """
+
+    def __init__(self, pool: Optional[ValuePool] = None):
+        self.pool = pool if pool is not None else ValuePool()
+        self.fields: List[Tuple[str, str]] = []
+        self.columns: List[array] = []
+        self._paths: List[Tuple[str, ...]] = []
+        self._top_level: Dict[str, List[int]] = {}
+        self._count = 0
+
+    def _layout(self, flat: List[Tuple[str, Any]]) -> None:
+        for name, value in flat:
+            self.fields.append((name, field_kind(name, value)))
+            self.columns.append(array("I"))
+            self._paths.append(tuple(name.split(".")))
+            self._top_level.setdefault(self._paths[-1][0], []).append(len(self.fields) - 1)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        flat = list(flatten(record))
+        if not self.fields:
+            self._layout(flat)
+        elif len(flat) != len(self.fields) or any(name != field[0] for (name, _), field in zip(flat, self.fields)):
+            raise ValueError(f"Record fields {[name for name, _ in flat]} do not match "
+                             f"{[name for name, _ in self.fields]}")
+
+        pool = self.pool
+        substitutions = sorted(
+            ((position, value) for position, ((_, value), (_, kind)) in enumerate(zip(flat, self.fields))
+             if kind == STR and isinstance(value, str) and value),
+            key=lambda item: -len(item[1]))
+        for (_, value), (_, kind), column in zip(flat, self.fields, self.columns):
+            if kind == TEXT:
+                column.append(pool.add_text(value, substitutions))
+            elif kind == LIST:
+                column.append(pool.add_list(value))
+            else:
+                column.append(pool.add(value))
+        self._count += 1
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> "RecordSet":
+        for record in records:
+            self.append(record)
+        return self
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index: int) -> BenchmarkRow:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RecordSet index out of range")
+        return BenchmarkRow(self, index)
+
+    def __iter__(self) -> Iterator[BenchmarkRow]:
+        return (BenchmarkRow(self, index) for index in range(self._count))
+
+    def has_field(self, field: str) -> bool:
+        return field in self._top_level
+
+    def _decode(self, kind: str, value_id: int, index: int) -> Any:
+        values = self.pool.values
+        value = values[value_id]
+        if kind == TEXT:
+            return "".join(part if isinstance(part, str) else values[self.columns[part][index]] for part in value)
+        if kind == LIST:
+            return list(value)
+        return value
+
+    def value(self, index: int, field: str) -> Any:
+        """One top-level field of one record; nested objects are rebuilt as dicts."""
+        positions = self._top_level[field]
+        if len(self._paths[positions[0]]) == 1:
+            return self._decode(self.fields[positions[0]][1], self.columns[positions[0]][index], index)
+        return self.record(index, positions)[field]
+
+    def record(self, index: int, positions: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Rebuild record index as a dict of the original shape and key order."""
+        result: Dict[str, Any] = {}
+        for position in positions if positions is not None else range(len(self.fields)):
+            path = self._paths[position]
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = self._decode(self.fields[position][1], self.columns[position][index], index)
+        return result
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Records as dicts, one at a time, ready for write_benchmarks()."""
+        for index in range(self._count):
+            yield self.record(index)
+
+def collect(records: Iterable[Dict[str, Any]], pool: Optional[ValuePool] = None) -> RecordSet:
+    """Pack a record stream into a RecordSet, optionally sharing an existing pool."""
+    return RecordSet(pool).extend(records)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Lazy registry of sport benchmark generators.
+
+Sports are found by file name (generate-<sport>-benchmarks.py) without
+importing anything, so listing sports costs the same however many there are.
+A sport's module - with its SKILLS, PERFORMANCE_STANDARDS and indicator
+tables - is only imported the first time that sport is actually used.
+
+    registry = default_registry()
+    registry.names()                  # ["athletics", "rugby"] - nothing imported
+    registry.get("rugby").build(".")  # imports generate-rugby-benchmarks.py only
+"""
+
+import glob
+import importlib.util
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_PATTERN = "generate-*-benchmarks.py"
+
+class SportGenerator:
+    """Handle to one sport's generator script; imports the module on first use."""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module_name(self) -> str:
+        return f"generate_{self.name.replace('-', '_')}_benchmarks"
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    @property
+    def module(self):
+        """The generator module, imported on first access."""
+        if self._module is None:
+            self._module = sys.modules.get(self.module_name) or self._import()
+        return self._module
+
+    def _import(self):
+        spec = importlib.util.spec_from_file_location(self.module_name, self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[self.module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[self.module_name]
+            raise
+        return module
+
+    def build(self, output_dir: str = ".", fmt: str = "json", **options) -> Dict[str, Any]:
+        """Write this sport's IMPORT file via the generator's build()."""
+        return self.module.build(output_dir, fmt, **options)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<SportGenerator {self.name} ({state})>"
+
+class GeneratorRegistry:
+    """Name -> SportGenerator mapping populated from file names only."""
+
+    def __init__(self):
+        self._generators: Dict[str, SportGenerator] = {}
+
+    def register(self, name: str, path: str) -> SportGenerator:
+        """Register a generator script under a sport name."""
+        if name in self._generators:
+            raise ValueError(f"Sport '{name}' is already registered")
+        generator = self._generators[name] = SportGenerator(name, path)
+        return generator
+
+    def discover(self, scripts_dir: str = SCRIPTS_DIR) -> "GeneratorRegistry":
+        """Register every generate-<sport>-benchmarks.py in scripts_dir."""
+        for path in sorted(glob.glob(os.path.join(scripts_dir, GENERATOR_PATTERN))):
+            name = os.path.basename(path)[len("generate-"):-len("-benchmarks.py")]
+            if name not in self._generators:
+                self.register(name, path)
+        return self
+
+    def names(self) -> List[str]:
+        return sorted(self._generators)
+
+    def get(self, name: str) -> SportGenerator:
+        """Look up a sport, raising KeyError with the available names if unknown."""
+        try:
+            return self._generators[name]
+        except KeyError:
+            raise KeyError(f"Unknown sport '{name}'. Available: {', '.join(self.names())}") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._generators
+
+    def __iter__(self):
+        return iter(self._generators[name] for name in self.names())
+
+_default: Optional[GeneratorRegistry] = None
+
+def default_registry() -> GeneratorRegistry:
+    """Registry of the generators shipped in this directory (discovered once)."""
+    global _default
+    if _default is None:
+        _default = GeneratorRegistry().discover()
+    return _default
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Schema validation for bulkImportBenchmarks rows, compiled once per schema.
+
+SKILL_BENCHMARK_ROW describes the benchmarks[] entries bulkImportBenchmarks
+accepts (convex/models/skillBenchmarks.ts), with the gender and level literals
+of the skillBenchmarks table (convex/schema.ts). The helpers mirror Convex's
+v.string()/v.number()/v.literal()/v.optional() so the two read side by side.
+
+compile_validator turns a schema into the source of one straight-line Python
+function (one type test per field, literal sets bound as constants) and
+compiles it, so checking a record is a single call with no per-field
+dispatch. The generated source is kept on .source for inspection.
+
+With normalise=True records are first converted to mutation rows (see
+benchmark_import.to_mutation_row) and literal fields are folded onto the
+schema: "Male" -> "male", "Developmental" -> "development". Unlike the
+lenient importer helpers, a value with no mapping is reported, not guessed.
+
+    validator = RecordValidator(normalise=True)
+    row, errors = validator(record)
+"""
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from benchmark_delta import benchmark_key
+from benchmark_import import to_mutation_row
+
+# Literals accepted by skillBenchmarks.gender and skillBenchmarks.level in convex/schema.ts
+SCHEMA_GENDERS = ("male", "female", "all")
+SCHEMA_LEVELS = ("recreational", "development", "competitive", "elite")
+
+# Raw values the importers map onto a schema literal, beyond case folding
+LEVEL_ALIASES = {"developmental": "development"}
+
+Spec = Tuple
+
+def string() -> Spec:
+    return ("string",)
+
+def number() -> Spec:
+    return ("number",)
+
+def literals(*values: str) -> Spec:
+    return ("literal", values)
+
+def optional(spec: Spec) -> Spec:
+    return ("optional", spec)
+
+# benchmarks[] in bulkImportBenchmarks' args
+SKILL_BENCHMARK_ROW: Dict[str, Spec] = {
+    "sportCode": string(),
+    "skillCode": string(),
+    "ageGroup": string(),
+    "gender": literals(*SCHEMA_GENDERS),
+    "level": literals(*SCHEMA_LEVELS),
+    "expectedRating": number(),
+    "minAcceptable": number(),
+    "developingThreshold": number(),
+    "excellentThreshold": number(),
+    "percentile25": optional(number()),
+    "percentile50": optional(number()),
+    "percentile75": optional(number()),
+    "percentile90": optional(number()),
+    "notes": optional(string()),
+}
+
+# Per-field spellings folded onto a literal when normalising
+FIELD_ALIASES = {"level": LEVEL_ALIASES}
+
+class SchemaError(ValueError):
+    """A record that does not match the schema; raised by iter_valid_rows."""
+
+def _field_code(name: str, spec: Spec, position: int, normalise: bool, constants: Dict[str, Any]) -> List[str]:
+    """Source lines checking row[name], indented for the body of the validate function."""
+    required = spec[0] != "optional"
+    kind = spec[1] if not required else spec
+    lines = [f"    value = row.get({name!r}, _MISSING)", "    if value is _MISSING:"]
+    # Like Convex, an optional field may be absent but not null
+    lines += [f"        errors.append({name + ': required'!r})" if required else "        pass"]
+
+    if kind[0] == "string":
+        lines += ["    elif type(value) is not str:",
+                  f"        errors.append({name!r} + ': expected string, got ' + repr(value))"]
+    elif kind[0] == "number":
+        # Comparisons with NaN are false, so this also rejects NaN and infinities
+        lines += ["    elif type(value) not in _NUMBERS or not -_INF < value < _INF:",
+                  f"        errors.append({name!r} + ': expected number, got ' + repr(value))"]
+    elif kind[0] == "literal":
+        allowed = f"_LITERALS_{position}"
+        constants[allowed] = frozenset(kind[1])
+        lines += [f"    elif value not in {allowed}:"]
+        if normalise:
+            folded = f"_FOLDED_{position}"
+            constants[folded] = {**{literal.lower(): literal for literal in kind[1]}, **FIELD_ALIASES.get(name, {})}
+            lines += [f"        fixed = {folded}.get(value.lower()) if type(value) is str else None",
+                      "        if fixed is None:",
+                      f"            errors.append({name!r} + ': expected one of {'/'.join(kind[1])}, got ' + repr(value))",
+                      "        else:",
+                      f"            row[{name!r}] = fixed",
+                      "            fixes += 1"]
+        else:
+            lines += [f"        errors.append({name!r} + ': expected one of {'/'.join(kind[1])}, got ' + repr(value))"]
+    else:
+        raise ValueError(f"Unsupported schema type for {name}: {kind[0]}")
+    return lines
+
+def compile_validator(schema: Dict[str, Spec] = SKILL_BENCHMARK_ROW, normalise: bool = False):
+    """
+    Compile schema into validate(row) -> (errors, fixes). With normalise,
+    literal fields are folded in place and counted in fixes.
+    """
+    constants: Dict[str, Any] = {"_MISSING": object(), "_NUMBERS": (int, float), "_INF": math.inf,
+                                 "_FIELDS": frozenset(schema)}
+    lines = ["def validate(row):", "    errors = []", "    fixes = 0"]
+    for position, (name, spec) in enumerate(schema.items()):
+        lines += _field_code(name, spec, position, normalise, constants)
+    # Convex's v.object rejects fields it does not declare
+    lines += ["    if len(row) > len(_FIELDS) or not _FIELDS.issuperset(row):",
+              "        for name in row:",
+              "            if name not in _FIELDS:",
+              "                errors.append(name + ': unexpected field')",
+              "    return errors, fixes"]
+
+    source = "\n".join(lines) + "\n"
+    namespace = dict(constants)
+    exec(compile(source, "<benchmark schema>", "exec"), namespace)
+    validate = namespace["validate"]
+    validate.source = source
+    return validate
+
+class RecordValidator:
+    """Validate (and optionally normalise) generator records as bulkImportBenchmarks rows."""
+
+    def __init__(self, schema: Dict[str, Spec] = SKILL_BENCHMARK_ROW, normalise: bool = False):
+        self.normalise = normalise
+        self.validate = compile_validator(schema, normalise)
+        self.source = self.validate.source
+
+    def check(self, record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str], int]:
+        """(row, errors, fixes). The row is the record itself unless normalising."""
+        if not self.normalise:
+            return (record, *self.validate(record))
+        try:
+            row = to_mutation_row(record, normalize_enums=False)
+        except KeyError as e:
+            return record, [f"{e.args[0]}: required"], 0
+        return (row, *self.validate(row))
+
+    def __call__(self, record: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        row, errors, _ = self.check(record)
+        return row, errors
+
+def _label(record: Dict[str, Any]) -> str:
+    try:
+        return " / ".join(str(part) for part in benchmark_key(record) if part is not None)
+    except KeyError:
+        return "(unidentified record)"
+
+def validate_records(records: Iterable[Dict[str, Any]], normalise: bool = False,
+                     examples: int = 10) -> Dict[str, Any]:
+    """Validate every record. Returns counts, field-level error tallies and the first failures."""
+    check = RecordValidator(normalise=normalise).check
+    summary = {"records": 0, "invalid": 0, "fixes": 0, "fields": {}, "failures": []}
+    fields = summary["fields"]
+
+    for position, record in enumerate(records):
+        _, errors, fixes = check(record)
+        summary["fixes"] += fixes
+        if errors:
+            summary["invalid"] += 1
+            for error in errors:
+                field = error.split(":", 1)[0]
+                fields[field] = fields.get(field, 0) + 1
+            if len(summary["failures"]) < examples:
+                summary["failures"].append((position, _label(record), errors))
+        summary["records"] += 1
+    return summary
+
+def iter_valid_rows(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Normalised mutation rows; raises SchemaError at the first record that cannot be fixed."""
+    validator = RecordValidator(normalise=True)
+    for position, record in enumerate(records):
+        row, errors = validator(record)
+        if errors:
+            raise SchemaError(f"record {position} ({_label(record)}): {'; '.join(errors)}")
+        yield row
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Concurrent, resumable upload of benchmark chunks to the Convex HTTP API.
+
+Chunks (see benchmark_chunks.py) are sent as calls to the mutation their
+manifest names (bulkImportBenchmarks, or applyBenchmarkDelta for delta files)
+through POST <deployment>/api/mutation:
+
+    {"path": "models/skillBenchmarks:bulkImportBenchmarks", "format": "json", "args": {...}}
+
+- asyncio with a semaphore bounds how many chunks are in flight
+- a small HTTP/1.1 keep-alive pool reuses connections across chunks, so a
+  1,000+ row import costs a handful of TLS handshakes rather than one per call
+- transport errors, timeouts, 429 and 5xx responses are retried with capped
+  exponential backoff and full jitter (honouring Retry-After); Convex
+  application errors and other 4xx responses are not retried
+- every acknowledged chunk is appended to a journal file, and a rerun skips
+  chunks already acknowledged with the same checksum; a chunk whose mutation
+  reports per-row errors is not journalled, so the rerun sends it again
+
+Only the standard library is used: the pool speaks just enough HTTP/1.1
+(Content-Length and chunked bodies) for the Convex API and the local stub in
+convex_stub.py.
+"""
+
+import asyncio
+import email.utils
+import json
+import os
+import random
+import ssl
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from benchmark_chunks import load_manifest, read_chunk
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 5
+DEFAULT_TIMEOUT = 120.0
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+class UploadError(Exception):
+    """A chunk failed permanently (application error or non-retryable HTTP status)."""
+
+class RetryableError(Exception):
+    """A chunk attempt failed in a way that is worth retrying."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date).
+
+    None when the header is missing or unparseable, so the caller falls back
+    to its normal backoff.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+# ============================================================
+# HTTP/1.1 keep-alive pool
+# ============================================================
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+class ConnectionPool:
+    """Idle keep-alive connections to one origin, opened on demand."""
+
+    def __init__(self, url: str, max_idle: int = DEFAULT_CONCURRENCY):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {url}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.host_header = parts.netloc
+        self.max_idle = max_idle
+        self._idle: List[_Connection] = []
+        self.opened = 0
+
+    async def acquire(self) -> _Connection:
+        while self._idle:
+            connection = self._idle.pop()
+            if not connection.reader.at_eof():
+                return connection
+            connection.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        if reusable and len(self._idle) < self.max_idle:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+            try:
+                await connection.writer.wait_closed()
+            except OSError:
+                pass
+
+    async def post(self, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """POST body and return (status, lower-cased headers, response body)."""
+        connection = await self.acquire()
+        reusable = False
+        try:
+            head = [f"POST {path} HTTP/1.1", f"Host: {self.host_header}",
+                    f"Content-Length: {len(body)}", "Connection: keep-alive"]
+            head += [f"{name}: {value}" for name, value in headers.items()]
+            connection.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await connection.writer.drain()
+
+            status, response_headers, response_body, reusable = await _read_response(connection.reader)
+            return status, response_headers, response_body
+        finally:
+            self.release(connection, reusable)
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed before a response was received")
+    parts = status_line.decode("latin-1").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/1."):
+        raise ConnectionError(f"Malformed status line: {status_line!r}")
+    status = int(parts[1])
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get("connection", "").lower() != "close"
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                # Skip trailers up to the blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+        return status, headers, bytes(body), reusable
+    if "content-length" in headers:
+        return status, headers, await reader.readexactly(int(headers["content-length"])), reusable
+    return status, headers, await reader.read(), False
+
+# ============================================================
+# Journal
+# ============================================================
+
+def journal_path(manifest_file: str) -> str:
+    return manifest_file + ".uploaded"
+
+def load_journal(path: str) -> Set[Tuple[str, str]]:
+    """(file, sha256) of every chunk already acknowledged."""
+    done = set()
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    done.add((entry["file"], entry["sha256"]))
+    return done
+
+# ============================================================
+# Uploader
+# ============================================================
+
+class ChunkUploader:
+    """Uploads the chunks of one manifest with bounded concurrency and retries."""
+
+    def __init__(self, url: str, concurrency: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES,
+                 timeout: float = DEFAULT_TIMEOUT, auth_token: Optional[str] = None,
+                 backoff_base: float = BACKOFF_BASE, backoff_max: float = BACKOFF_MAX):
+        self.url = url.rstrip("/")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = {"Content-Type": "application/json"}
+        if auth_token:
+            self.headers["Authorization"] = f"Convex {auth_token}"
+        self.attempts = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _call(self, pool: ConnectionPool, body: bytes) -> Any:
+        self.attempts += 1
+        try:
+            status, headers, response = await asyncio.wait_for(
+                pool.post("/api/mutation", body, self.headers), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+            raise RetryableError(f"{type(e).__name__}: {e}") from e
+
+        if status in RETRYABLE_STATUS:
+            raise RetryableError(f"HTTP {status}", parse_retry_after(headers.get("retry-after")))
+        try:
+            result = json.loads(response)
+        except ValueError:
+            raise UploadError(f"HTTP {status}: non-JSON response") from None
+        if status != 200 or result.get("status") != "success":
+            raise UploadError(f"HTTP {status}: {result.get('errorMessage', result)}")
+        return result.get("value")
+
+    async def upload_chunk(self, pool: ConnectionPool, mutation: str, payload: bytes) -> Any:
+        """Send one chunk, retrying transient failures. Returns the mutation's result."""
+        body = b'{"path":' + json.dumps(mutation).encode() + b',"format":"json","args":' + payload + b"}"
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._call(pool, body)
+            except RetryableError as e:
+                if attempt == self.retries:
+                    raise UploadError(f"gave up after {attempt + 1} attempts: {e}") from e
+                await asyncio.sleep(self._backoff(attempt, e.retry_after))
+
+    async def upload_manifest(self, manifest_file: str) -> Dict[str, Any]:
+        """Upload every chunk not yet in the journal. Returns a summary."""
+        manifest = load_manifest(manifest_file)
+        journal = journal_path(manifest_file)
+        done = load_journal(journal)
+        pending = [chunk for chunk in manifest["chunks"] if (chunk["file"], chunk["sha256"]) not in done]
+
+        summary = {"chunks": len(manifest["chunks"]), "skipped": len(manifest["chunks"]) - len(pending),
+                   "uploaded": 0, "failed": [], "created": 0, "existing": 0, "updated": 0, "deactivated": 0,
+                   "errors": []}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pool = ConnectionPool(self.url, self.concurrency)
+        start = time.perf_counter()
+
+        with open(journal, "a") as log:
+            async def run(chunk):
+                async with semaphore:
+                    try:
+                        result = await self.upload_chunk(pool, manifest["mutation"], read_chunk(manifest_file, chunk))
+                    except (UploadError, ValueError) as e:
+                        summary["failed"].append((chunk["file"], str(e)))
+                        return
+                errors = result.get("errors", []) if isinstance(result, dict) else []
+                if not errors:
+                    # Acknowledged: record it before anything else can go wrong
+                    log.write(json.dumps({"file": chunk["file"], "sha256": chunk["sha256"], "result": result}) + "\n")
+                    log.flush()
+                    summary["uploaded"] += 1
+                else:
+                    # Rows were rejected: leave the chunk out of the journal so a
+                    # rerun sends it again (rows already written are skipped)
+                    summary["failed"].append((chunk["file"], f"{len(errors)} row error(s)"))
+                    summary["errors"] += errors
+                if isinstance(result, dict):
+                    summary["created"] += result.get("created", 0)
+                    summary["existing"] += result.get("skipped", 0)
+                    summary["updated"] += result.get("updated", 0)
+                    summary["deactivated"] += result.get("deactivated", 0)
+
+            try:
+                await asyncio.gather(*(run(chunk) for chunk in pending))
+            finally:
+                await pool.close()
+
+        summary["connections"] = pool.opened
+        summary["attempts"] = self.attempts
+        summary["seconds"] = time.perf_counter() - start
+        return summary
+
+def upload(manifest_file: str, url: str, **options) -> Dict[str, Any]:
+    """Synchronous entry point for ChunkUploader.upload_manifest()."""
+    return asyncio.run(ChunkUploader(url, **options).upload_manifest(manifest_file))
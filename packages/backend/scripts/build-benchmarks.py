@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Build benchmark IMPORT files for every sport in one run.
+
+Finds the generate-<sport>-benchmarks.py scripts next to this file (see
+benchmark_registry.py), runs each sport's build() in its own worker process
+and prints one consolidated timing and size report. A full rebuild takes about
+as long as the slowest sport.
+
+Usage:
+    python3 build-benchmarks.py --list                # list sports without importing them
+    python3 build-benchmarks.py                       # all sports into the current directory
+    python3 build-benchmarks.py --output-dir build    # all sports into ./build
+    python3 build-benchmarks.py --sports rugby --format ndjson
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict
+
+from benchmark_io import FORMATS
+from benchmark_registry import default_registry
+
+def build_sport(sport: str, output_dir: str, fmt: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: build one sport and time it, importing only that sport."""
+    start = time.perf_counter()
+    result = default_registry().get(sport).build(output_dir, fmt, **options)
+    result["seconds"] = time.perf_counter() - start
+    # Per-field counters are only needed by the sport's own CLI
+    result.pop("counts", None)
+    return result
+
+def main():
+    """Build all requested sports in parallel and report timings."""
+    parser = argparse.ArgumentParser(description="Build benchmark IMPORT files for all sports")
+    parser.add_argument("--list", action="store_true", help="list available sports and exit")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory to write IMPORT files into (default: current directory)")
+    parser.add_argument("--sports", nargs="+", metavar="SPORT",
+                        help="only build these sports (default: all)")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="fill percentile25/50/75/90 on every benchmark (requires numpy)")
+    parser.add_argument("--index", action="store_true",
+                        help="also write a byte-offset index (<file>.idx) next to each IMPORT file")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: one per sport, capped at CPU count)")
+    args = parser.parse_args()
+
+    registry = default_registry()
+    if args.list:
+        for generator in registry:
+            print(f"  {generator.name:<16}{os.path.basename(generator.path)}")
+        return
+
+    sports = args.sports or registry.names()
+    unknown = [sport for sport in sports if sport not in registry]
+    if unknown:
+        print(f"❌ Unknown sport(s): {', '.join(unknown)}. Available: {', '.join(registry.names())}")
+        sys.exit(1)
+
+    options = {}
+    if args.percentiles:
+        options["percentiles"] = True
+    if args.index:
+        options["index"] = True
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = args.jobs or min(len(sports), os.cpu_count() or 1)
+
+    print(f"Building {len(sports)} sport(s) with {jobs} worker(s)...")
+    start = time.perf_counter()
+    results = []
+    failed = []
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(build_sport, sport, args.output_dir, args.format, options): sport
+            for sport in sports
+        }
+        for future in as_completed(futures):
+            sport = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failed.append(sport)
+                print(f"❌ {sport}: {e}")
+
+    wall = time.perf_counter() - start
+
+    print("\n📊 Build Report:")
+    print(f"  {'Sport':<16}{'Records':>10}{'Size':>12}{'Time':>10}  File")
+    for result in sorted(results, key=lambda r: r["sport"]):
+        print(f"  {result['sport']:<16}{result['records']:>10}{result['bytes'] / 1024:>10.1f}KB"
+              f"{result['seconds']:>9.2f}s  {result['file']}")
+
+    total_records = sum(r["records"] for r in results)
+    total_bytes = sum(r["bytes"] for r in results)
+    sequential = sum(r["seconds"] for r in results)
+    print(f"  {'Total':<16}{total_records:>10}{total_bytes / 1024:>10.1f}KB{wall:>9.2f}s")
+    print(f"\n  Wall time {wall:.2f}s vs {sequential:.2f}s sequential")
+
+    if failed:
+        print(f"\n❌ {len(failed)} sport(s) failed: {', '.join(sorted(failed))}")
+        sys.exit(1)
+    print(f"\n✅ Built {len(results)} sport(s) into {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
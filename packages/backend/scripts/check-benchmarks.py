@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Check benchmark IMPORT files for coverage gaps and inconsistencies before import.
+
+Every *-benchmarks-IMPORT.json next to this script is checked by default, one
+process per file and one pass per file (see benchmark_check.py). Reported:
+- coverage gaps in (skill, ageGroup, gender, level) cells
+- duplicate keys, and records that share a by_context row with an earlier
+  record (only the first is imported)
+- threshold ladders that are out of order or leave the 1-5 rating scale
+- gender/level values that are not skillBenchmarks schema literals
+
+Duplicates, broken ladders and enum values the importers cannot map fail the
+run. Gaps, by_context collisions, off-scale thresholds and values the
+importers normalise (e.g. athletics "Male", "Developmental") are warnings
+unless --strict is given.
+
+Usage:
+    python3 check-benchmarks.py
+    python3 check-benchmarks.py rugby-benchmarks-IMPORT.json soccer-benchmarks-IMPORT.json
+    python3 check-benchmarks.py --strict --examples 50
+    python3 check-benchmarks.py --json > benchmark-check.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from benchmark_check import DEFAULT_EXAMPLES, check_files, error_count, warning_count
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def print_report(report: dict) -> None:
+    axes = report["axes"]
+    print(f"\n📄 {report['file']} ({report['sport']}): {report['records']} records, {report['cells']} cells "
+          f"over {axes['skills']} skills x {axes['ageGroups']} age groups x "
+          f"{'/'.join(axes['genders'])} x {'/'.join(axes['levels'])}")
+    if report["excluded_count"]:
+        print(f"  ℹ️  {report['excluded_count']} slot(s) left out by the generator's rules, not counted as gaps")
+
+    sections = [
+        ("❌", "duplicate key(s)", report["duplicate_count"], report["duplicates"]),
+        ("❌", "threshold ladder(s) out of order", report["ladder_count"], report["ladders"]),
+        ("❌", "expected rating(s) falling as level rises", report["level_ladder_count"], report["level_ladders"]),
+        ("⚠️ ", "record(s) sharing a by_context row with an earlier one (not imported)", report["collision_count"],
+         report["collisions"]),
+        ("⚠️ ", "threshold ladder(s) off the 1-5 scale", report["scale_count"], report["scale"]),
+        ("⚠️ ", "coverage gap(s)", report["gap_count"], report["gaps"]),
+    ]
+    for icon, title, count, examples in sections:
+        if not count:
+            continue
+        print(f"  {icon} {count} {title}")
+        for example in examples:
+            print(f"      {example}")
+        if count > len(examples):
+            print(f"      ... and {count - len(examples)} more")
+
+    for value, counts in sorted(report["enums"].items()):
+        if counts["status"] == "invalid":
+            print(f"  ❌ {value} is not a schema literal ({counts['records']} records)")
+        else:
+            print(f"  ⚠️  {value} is normalised on import ({counts['records']} records)")
+
+    if not error_count(report) and not warning_count(report) and not report["enums"]:
+        print("  ✅ No issues")
+
+def main():
+    """Check IMPORT files and exit non-zero on errors."""
+    parser = argparse.ArgumentParser(description="Check benchmark IMPORT files for gaps and inconsistencies")
+    parser.add_argument("files", nargs="*", help="IMPORT files (default: every *-benchmarks-IMPORT.json here)")
+    parser.add_argument("--workers", type=int, help="parallel processes (default: one per file, up to CPU count)")
+    parser.add_argument("--examples", type=int, default=DEFAULT_EXAMPLES, help="examples listed per finding")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as errors")
+    parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    args = parser.parse_args()
+
+    files = args.files or sorted(glob.glob(os.path.join(SCRIPTS_DIR, "*-benchmarks-IMPORT.json")))
+    if not files:
+        print("❌ No IMPORT files found")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        reports = check_files(files, args.workers, args.examples)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e!r}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    errors = sum(error_count(report) for report in reports)
+    warnings = sum(warning_count(report) for report in reports)
+    failed = errors or (args.strict and warnings)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        sys.exit(1 if failed else 0)
+
+    print(f"🔍 Checking {len(files)} benchmark file(s)")
+    for report in reports:
+        print_report(report)
+
+    records = sum(report["records"] for report in reports)
+    print(f"\n{records} records checked in {elapsed:.2f}s: {errors} error(s), {warnings} warning(s)")
+    if failed:
+        print("❌ Fix the issues above before importing")
+        sys.exit(1)
+    print("✅ Benchmarks are consistent")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Split benchmark IMPORT files into size-bounded bulkImportBenchmarks batches.
+
+Each chunk file holds complete mutation arguments bounded by row count and
+bytes, and a <sport>-MANIFEST.json lists every chunk with its SHA-256 (see
+benchmark_chunks.py). Rows are converted to the skillBenchmarks shape the
+same way the TypeScript importers convert them (see benchmark_import.py), and
+checked against the mutation's schema first (see benchmark_schema.py), so a
+bad record stops chunking instead of failing mid-upload.
+
+Usage:
+    python3 chunk-benchmarks.py athletics-benchmarks-IMPORT.json
+    python3 chunk-benchmarks.py rugby-benchmarks-IMPORT.json --max-records 200 --output-dir chunks
+    python3 chunk-benchmarks.py soccer-benchmarks-IMPORT.json --source "FAI" --source-year 2025
+    python3 chunk-benchmarks.py --verify chunks/athletics-MANIFEST.json
+"""
+
+import argparse
+import itertools
+import os
+import sys
+
+from benchmark_chunks import DEFAULT_MAX_BYTES, DEFAULT_MAX_RECORDS, verify_manifest, write_chunks
+from benchmark_import import SOURCES, record_sport
+from benchmark_io import read_benchmarks
+from benchmark_schema import iter_valid_rows
+
+def source_meta(sport: str, args) -> dict:
+    """Batch-level mutation arguments, from SOURCES with command-line overrides."""
+    meta = dict(SOURCES.get(sport, {}))
+    if args.source:
+        meta["source"] = args.source
+    if args.source_document:
+        meta["sourceDocument"] = args.source_document
+    if args.source_year:
+        meta["sourceYear"] = args.source_year
+    if "source" not in meta or "sourceYear" not in meta:
+        raise ValueError(f"No source metadata for '{sport}'; pass --source and --source-year")
+    return meta
+
+def main():
+    """Chunk IMPORT files, or verify an existing manifest."""
+    parser = argparse.ArgumentParser(description="Split benchmark IMPORT files into bounded import batches")
+    parser.add_argument("files", nargs="*", metavar="IMPORT_FILE")
+    parser.add_argument("--output-dir", default="chunks", help="directory for chunks and manifests (default: chunks)")
+    parser.add_argument("--max-records", type=int, default=DEFAULT_MAX_RECORDS,
+                        help=f"rows per chunk (default: {DEFAULT_MAX_RECORDS})")
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES,
+                        help=f"serialised bytes per chunk (default: {DEFAULT_MAX_BYTES})")
+    parser.add_argument("--source", help="override the batch source name")
+    parser.add_argument("--source-document", help="override the batch source document")
+    parser.add_argument("--source-year", type=int, help="override the batch source year")
+    parser.add_argument("--verify", metavar="MANIFEST", help="check a manifest's chunks against their checksums")
+    args = parser.parse_args()
+
+    if args.verify:
+        problems = verify_manifest(args.verify)
+        for name, problem in problems:
+            print(f"❌ {name}: {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"✅ All chunks in {args.verify} match their checksums")
+        return
+
+    if not args.files:
+        parser.error("at least one IMPORT file is required unless --verify is given")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for path in args.files:
+        records = read_benchmarks(path)
+        first = next(records, None)
+        if first is None:
+            print(f"⚠️  {path} has no benchmarks, skipped")
+            continue
+
+        sport = record_sport(first)
+        try:
+            meta = source_meta(sport, args)
+            manifest = write_chunks(iter_valid_rows(itertools.chain([first], records)), meta,
+                                    args.output_dir, sport, args.max_records, args.max_bytes)
+        except ValueError as e:
+            print(f"❌ {path}: {e}")
+            sys.exit(1)
+
+        chunks = manifest["chunks"]
+        largest = max(chunk["bytes"] for chunk in chunks)
+        print(f"✅ {sport}: {manifest['records']} rows in {len(chunks)} chunk(s), "
+              f"largest {largest / 1024:.1f}KB -> {os.path.join(args.output_dir, sport + '-MANIFEST.json')}")
+
+if __name__ == "__main__":
+    main()
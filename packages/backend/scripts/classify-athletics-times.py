@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Classify a club result sheet against the athletics PERFORMANCE_STANDARDS.
+
+Reads a CSV with event, ageGroup, gender and time columns (header names are
+case-insensitive; times may be "12.9", "2:21.4" or "16:05") and writes it back
+with a level column set to Developmental, Competitive or Elite. Rows with no
+published standard for their event/age/gender get an empty level.
+
+Usage:
+    python3 classify-athletics-times.py results.csv
+    python3 classify-athletics-times.py results.csv -o results-classified.csv
+
+Requires numpy (pip install numpy).
+"""
+
+import argparse
+import csv
+import sys
+from collections import Counter
+
+from athletics_standards import StandardsIndex, normalise_gender
+
+REQUIRED_COLUMNS = ["event", "agegroup", "gender", "time"]
+
+def main():
+    """Classify every row of a results CSV in one pass."""
+    parser = argparse.ArgumentParser(description="Classify athletics race times against performance standards")
+    parser.add_argument("results", help="CSV file with event, ageGroup, gender and time columns")
+    parser.add_argument("-o", "--output", help="write classified CSV here (default: stdout)")
+    args = parser.parse_args()
+
+    with open(args.results, newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames or []
+        columns = {name.strip().lower(): name for name in fieldnames}
+        missing = [c for c in REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            print(f"❌ Missing column(s): {', '.join(missing)}", file=sys.stderr)
+            sys.exit(1)
+        rows = list(reader)
+
+    index = StandardsIndex.from_generator()
+    try:
+        levels = index.classify_many(
+            (row[columns["event"]].strip(), row[columns["agegroup"]].strip(),
+             normalise_gender(row[columns["gender"]]), row[columns["time"]])
+            for row in rows
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(out, fieldnames=fieldnames + ["level"])
+        writer.writeheader()
+        for row, level in zip(rows, levels):
+            writer.writerow({**row, "level": level or ""})
+    finally:
+        if args.output:
+            out.close()
+
+    summary = Counter(level or "No standard" for level in levels)
+    print(f"✅ Classified {len(rows)} times: "
+          + ", ".join(f"{level} {count}" for level, count in sorted(summary.items())), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
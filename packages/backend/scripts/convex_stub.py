@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Convex HTTP API, for exercising upload tooling.
+
+Serves POST /api/mutation for bulkImportBenchmarks and applyBenchmarkDelta
+over keep-alive HTTP/1.1. Active rows are stored in memory keyed like the
+skillBenchmarks by_context index, and each call is answered the way the real
+mutation answers:
+{"status": "success", "value": {"created": n, "skipped": n, "errors": []}}.
+
+    with StubConvex(fail_rate=0.2) as stub:
+        upload(manifest_file, stub.url)
+    stub.rows, stub.requests, stub.connections
+
+Faults can be injected:
+- fail_rate:     fraction of requests answered 503 (seeded, so runs repeat)
+- reject_skills: batches containing any of these skillCodes get a Convex
+                 application error, which uploaders must not retry
+- error_skills:  rows with these skillCodes are left out and reported in the
+                 mutation's per-row errors, as the real mutations do for rows
+                 they cannot write
+"""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+MUTATION = "models/skillBenchmarks:bulkImportBenchmarks"
+DELTA_MUTATION = "models/skillBenchmarks:applyBenchmarkDelta"
+
+ContextKey = Tuple[str, str, str, str, str]
+
+def context_key(row: Dict[str, Any]) -> ContextKey:
+    return (row["sportCode"], row["skillCode"], row["ageGroup"], row["gender"], row["level"])
+
+class StubConvex:
+    """In-process stub server; use as a context manager or call start()/stop()."""
+
+    def __init__(self, fail_rate: float = 0.0, reject_skills: Iterable[str] = (), error_skills: Iterable[str] = (),
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        self.fail_rate = fail_rate
+        self.reject_skills = frozenset(reject_skills)
+        self.error_skills = frozenset(error_skills)
+        self.rows: Dict[ContextKey, Dict[str, Any]] = {}
+        self.requests = 0
+        self.failures = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    if self.path != "/api/mutation" or request.get("path") not in (MUTATION, DELTA_MUTATION):
+                        self._reply(404, {"status": "error", "errorMessage": f"Unknown function {request.get('path')}"})
+                        return
+                    if stub._random.random() < stub.fail_rate:
+                        stub.failures += 1
+                        self._reply(503, {"status": "error", "errorMessage": "Service temporarily unavailable"})
+                        return
+                    if request["path"] == DELTA_MUTATION:
+                        self._reply(200, stub.apply_delta(request["args"]))
+                    else:
+                        self._reply(200, stub.bulk_import(request["args"]))
+
+        return Handler
+
+    def bulk_import(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Mirror bulkImportBenchmarks: insert new rows, skip existing ones."""
+        rows = args["benchmarks"]
+        rejected = sorted({row["skillCode"] for row in rows} & self.reject_skills)
+        if rejected:
+            return {"status": "error", "errorMessage": f"Uncaught Error: rejected skill {rejected[0]}"}
+
+        created = skipped = 0
+        errors = []
+        for row in rows:
+            if row["skillCode"] in self.error_skills:
+                errors.append(f"Failed to import {row['skillCode']} {row['ageGroup']}: skill not writable")
+                continue
+            key = context_key(row)
+            if key in self.rows:
+                skipped += 1
+            else:
+                self.rows[key] = {**row, "source": args["source"], "sourceYear": args["sourceYear"]}
+                created += 1
+        return {"status": "success", "value": {"created": created, "skipped": skipped, "errors": errors}}
+
+    def apply_delta(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Mirror applyBenchmarkDelta: upsert active rows, drop those sent with isActive false."""
+        rows = args["benchmarks"]
+        rejected = sorted({row["skillCode"] for row in rows} & self.reject_skills)
+        if rejected:
+            return {"status": "error", "errorMessage": f"Uncaught Error: rejected skill {rejected[0]}"}
+
+        counts = {"created": 0, "updated": 0, "deactivated": 0, "skipped": 0}
+        for row in rows:
+            row = dict(row)
+            active = row.pop("isActive", True)
+            key = context_key(row)
+            if active is False:
+                counts["deactivated" if self.rows.pop(key, None) else "skipped"] += 1
+            else:
+                counts["updated" if key in self.rows else "created"] += 1
+                self.rows[key] = {**row, "source": args["source"], "sourceYear": args["sourceYear"]}
+        return {"status": "success", "value": {**counts, "errors": []}}
+
+    def start(self) -> "StubConvex":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubConvex":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -10,8 +10,31 @@ This script creates benchmarks covering:
 - Event Groups: General, Sprints, Middle Distance, Long Distance, Hurdles
 """
 
+import argparse
 import json
-from typing import List, Dict, Any
+import os
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Set, TextIO, Tuple
+
+from benchmark_compact import save_compact
+from benchmark_delta import write_delta
+from benchmark_index import IndexBuilder
+from benchmark_io import FORMATS, output_path, tally, write_benchmarks
+
+SPORT_CODE = "athletics"
+OUTPUT_BASE = "athletics-benchmarks-IMPORT"
+
+AGE_GROUPS = ["U10", "U12", "U14", "U16", "U18", "U20", "Senior"]
+GENDERS = ["Male", "Female"]
+COMPETITIVE_LEVELS = ["Developmental", "Competitive", "Elite"]
+
+# Detailed technical indicators per skill and level, loaded lazily.
+# Skills or levels missing from the file fall back to generic wording.
+TECHNICAL_INDICATORS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         "athletics-technical-indicators.json")
+
+# Files read while generating, so derived files can tell when they are out of date
+DATA_FILES = [TECHNICAL_INDICATORS_FILE]
 
 # Skill definitions with categories and applicable event groups
 SKILLS = {
@@ -179,74 +202,124 @@ def get_event_groups_for_skill(skill_name: str, category: str) -> List[str]:
     event_groups_dict = category_data.get("eventGroups", {})
     return event_groups_dict.get(skill_name, ["General"])
 
-def should_create_benchmark(age_group: str, competitive_level: str, event_group: str, skill_name: str) -> bool:
-    """Determine if a benchmark should be created for this combination."""
-
-    # U10 only has Developmental level
-    if age_group == "U10" and competitive_level != "Developmental":
-        return False
-
-    # U12 only has Developmental and Competitive
-    if age_group == "U12" and competitive_level == "Elite":
-        return False
+# Competitive levels offered at each age group
+# (U10 only has Developmental, U12 has no Elite)
+LEVELS_BY_AGE = {
+    "U10": ["Developmental"],
+    "U12": ["Developmental", "Competitive"],
+    "U14": COMPETITIVE_LEVELS,
+    "U16": COMPETITIVE_LEVELS,
+    "U18": COMPETITIVE_LEVELS,
+    "U20": COMPETITIVE_LEVELS,
+    "Senior": COMPETITIVE_LEVELS,
+}
 
-    # Hurdles introduced at U12+
-    if event_group == "Hurdles" and age_group == "U10":
-        return False
+# Age groups where an event group is not offered
+EVENT_GROUP_EXCLUDED_AGES = {
+    "Hurdles": ["U10"],  # Hurdles introduced at U12+
+    "Long Distance": ["U10", "U12"],  # Long distance (5000m) typically starts at U14+
+}
 
+# Age groups where a skill is not assessed
+SKILL_EXCLUDED_AGES = {
     # Starting blocks primarily for sprints
-    if skill_name == "Starting Blocks Technique" and age_group in ["U10", "U12"]:
-        return False
-
+    "Starting Blocks Technique": ["U10", "U12"],
     # Advanced physiological skills not assessed at U10-U12
-    if skill_name in ["Aerobic Capacity (VO2 Max)", "Lactate Threshold", "Running Economy", "Lactate Tolerance"] and age_group in ["U10", "U12"]:
-        return False
+    "Aerobic Capacity (VO2 Max)": ["U10", "U12"],
+    "Lactate Threshold": ["U10", "U12"],
+    "Running Economy": ["U10", "U12"],
+    "Lactate Tolerance": ["U10", "U12"],
+}
+
+def build_enumeration_plan() -> List[tuple]:
+    """
+    Resolve the rules into the valid combination space up front.
+    Returns (category, skill, [(age_group, levels, event_groups), ...]) per skill,
+    with age groups a skill is masked out of dropped entirely, so rejected
+    combinations are never enumerated.
+    """
+    plan = []
+    for category, category_data in SKILLS.items():
+        for skill_name in category_data["skills"]:
+            event_groups = get_event_groups_for_skill(skill_name, category)
+            excluded_ages = SKILL_EXCLUDED_AGES.get(skill_name, [])
+
+            ages = []
+            for age_group in AGE_GROUPS:
+                if age_group in excluded_ages:
+                    continue
+                allowed_events = [e for e in event_groups
+                               if age_group not in EVENT_GROUP_EXCLUDED_AGES.get(e, [])]
+                if allowed_events:
+                    ages.append((age_group, LEVELS_BY_AGE.get(age_group, COMPETITIVE_LEVELS), allowed_events))
+            plan.append((category, skill_name, ages))
+    return plan
+
+def offered_slots() -> Set[Tuple[str, str, str]]:
+    """
+    (skillName, ageGroup, competitiveLevel) slots the rules allow. benchmark_check
+    uses this so deliberate exclusions are not reported as coverage gaps.
+    """
+    return {
+        (skill_name, age_group, level)
+        for _, skill_name, ages in build_enumeration_plan()
+        for age_group, levels, _ in ages
+        for level in levels
+    }
 
-    # Long distance (5000m) typically starts at U14+
-    if event_group == "Long Distance" and age_group in ["U10", "U12"]:
-        return False
+def enumeration_stats() -> Dict[str, int]:
+    """Count the full Cartesian product against the pruned plan."""
+    total = sum(
+        len(AGE_GROUPS) * len(GENDERS) * len(COMPETITIVE_LEVELS)
+        * len(get_event_groups_for_skill(skill_name, category))
+        for category, category_data in SKILLS.items()
+        for skill_name in category_data["skills"]
+    )
+    valid = sum(
+        len(GENDERS) * len(levels) * len(event_groups)
+        for _, _, ages in build_enumeration_plan()
+        for _, levels, event_groups in ages
+    )
+    return {"total": total, "valid": valid, "pruned": total - valid}
+
+@lru_cache(maxsize=None)
+def load_technical_indicators() -> Tuple[Dict[Tuple[str, int], List[str]], FrozenSet[str]]:
+    """
+    Load the technical indicator registry from TECHNICAL_INDICATORS_FILE on first use.
+    Returns the (skill, level) -> indicators mapping and the set of skills it covers.
+    """
+    with open(TECHNICAL_INDICATORS_FILE) as f:
+        data = json.load(f)
+
+    indicators = {
+        (skill_name, int(level)): level_indicators
+        for skill_name, levels in data.items()
+        for level, level_indicators in levels.items()
+    }
+    return indicators, frozenset(data)
 
-    return True
+@lru_cache(maxsize=None)
+def _fallback_technical_indicators(skill_name: str, level: int, age_group: str, event_group: str,
+                                   skill_known: bool) -> List[str]:
+    if skill_known:
+        return [f"Level {level} execution"]
+    return [f"Level {level} technical execution for {skill_name}",
+            f"Age-appropriate mechanics for {age_group}",
+            f"Event-specific application for {event_group}"]
 
 def get_technical_indicators(skill_name: str, level: int, age_group: str, event_group: str) -> List[str]:
-    """Generate technical indicators based on skill, level, age, and event group."""
-
-    # This is a simplified version - in reality, you'd have detailed mappings
-    # for each skill at each level
-
-    base_indicators = {
-        "Posture & Alignment": {
-            1: ["Aware of posture but inconsistent execution",
-                "Often runs with excessive forward bend or sitting back with hips",
-                "Tends to look down at feet rather than ahead",
-                "Shoulders frequently tense and raised toward ears"],
-            2: ["Maintains reasonable posture during easy running with occasional lapses",
-                "Can implement coaching cues with reminders",
-                "Generally keeps head position neutral during steady efforts",
-                "Posture breaks down during intense efforts or late in runs"],
-            3: ["Consistently maintains good posture during training runs",
-                "Proper ankle lean and spinal alignment visible",
-                "Self-corrects when posture slips without external cueing",
-                "Eyes focused forward 10-20 meters ahead, shoulders relaxed"],
-            4: ["Excellent posture across all training intensities and race situations",
-                "Strong core stability preventing energy leaks",
-                "Maintains optimal alignment throughout races and hard workouts",
-                "Serves as positive example for training partners"],
-            5: ["Optimal biomechanics automatic across all situations",
-                "Maintains perfect posture even in extreme fatigue states",
-                "World-class running economy through flawless alignment",
-                "Serves as biomechanical model for other athletes"]
-        },
-        # Add more skills as needed...
-    }
+    """
+    Get technical indicators for a skill at a level, falling back to generic
+    age/event wording for skills or levels without detailed mappings.
+    Returned lists are shared between benchmarks and must not be mutated.
+    """
+    indicators, skills = load_technical_indicators()
 
-    # Return default indicators if skill not in mapping
-    if skill_name not in base_indicators:
-        return [f"Level {level} technical execution for {skill_name}",
-                f"Age-appropriate mechanics for {age_group}",
-                f"Event-specific application for {event_group}"]
+    found = indicators.get((skill_name, level))
+    if found is not None:
+        return found
 
-    return base_indicators[skill_name].get(level, [f"Level {level} execution"])
+    return _fallback_technical_indicators(skill_name, level, age_group, event_group, skill_name in skills)
 
 def generate_benchmark(skill_name: str, category: str, age_group: str, gender: str,
                       competitive_level: str, event_group: str) -> Dict[str, Any]:
@@ -318,78 +391,175 @@ def generate_benchmark(skill_name: str, category: str, age_group: str, gender: s
         "progressionPath": progression_path
     }
 
+def iter_all_benchmarks() -> Iterator[Dict[str, Any]]:
+    """Yield the complete set of athletics benchmarks one at a time."""
+    for category, skill_name, ages in build_enumeration_plan():
+        for age_group, levels, event_groups in ages:
+            for gender in GENDERS:
+                for competitive_level in levels:
+                    for event_group in event_groups:
+                        yield generate_benchmark(
+                            skill_name, category, age_group, gender,
+                            competitive_level, event_group
+                        )
+
 def generate_all_benchmarks() -> List[Dict[str, Any]]:
     """Generate complete set of athletics benchmarks."""
-    benchmarks = []
-
-    age_groups = ["U10", "U12", "U14", "U16", "U18", "U20", "Senior"]
-    genders = ["Male", "Female"]
-    competitive_levels = ["Developmental", "Competitive", "Elite"]
+    return list(iter_all_benchmarks())
+
+def iter_import_records(percentiles: bool = False) -> Iterator[Dict[str, Any]]:
+    """Records as written to the IMPORT file, optionally with synthesised percentiles."""
+    records = iter_all_benchmarks()
+    if percentiles:
+        # NumPy is only needed for this stage, so import it on demand
+        from benchmark_percentiles import iter_with_percentiles, standards_spread
+        records = iter_with_percentiles(records, standards_spread(PERFORMANCE_STANDARDS))
+    return records
+
+def write_import(records: Iterable[Dict[str, Any]], f: TextIO, fmt: str = "json", on_record=None) -> int:
+    """Write records as the IMPORT file is written (no trailing newline). Returns bytes written."""
+    return write_benchmarks(records, f, fmt, on_record)
+
+def build(output_dir: str = ".", fmt: str = "json", gzip: bool = False,
+          percentiles: bool = False, index: bool = False) -> Dict[str, Any]:
+    """
+    Generate benchmarks and write them into output_dir, optionally with a
+    sidecar byte-offset index for the json and ndjson formats.
+    Returns a build summary used by main() and build-benchmarks.py.
+    """
+    output_file = os.path.join(output_dir, output_path(OUTPUT_BASE, fmt))
+    if fmt == "compact" and gzip:
+        output_file += ".gz"
+
+    benchmarks, counts = tally(iter_import_records(percentiles), ["ageGroup", "competitiveLevel", "eventGroup"])
+
+    # Stream records straight to disk so memory stays flat as skills grow
+    if fmt == "compact":
+        # Dictionary encoding needs every distinct string, so this format is not streamed
+        save_compact(benchmarks, output_file)
+        size = os.path.getsize(output_file)
+    else:
+        index_builder = IndexBuilder() if index else None
+        with open(output_file, 'w') as f:
+            size = write_import(benchmarks, f, fmt, index_builder)
+        if index_builder:
+            index_builder.write(output_file)
 
-    for category, category_data in SKILLS.items():
-        for skill_name in category_data["skills"]:
-            # Get applicable event groups for this skill
-            event_groups = get_event_groups_for_skill(skill_name, category)
+    return {
+        "sport": SPORT_CODE,
+        "file": output_file,
+        "records": sum(counts["ageGroup"].values()),
+        "bytes": size,
+        "counts": counts,
+    }
 
-            for age_group in age_groups:
-                for gender in genders:
-                    for competitive_level in competitive_levels:
-                        for event_group in event_groups:
-                            # Check if this combination should be created
-                            if should_create_benchmark(age_group, competitive_level, event_group, skill_name):
-                                benchmark = generate_benchmark(
-                                    skill_name, category, age_group, gender,
-                                    competitive_level, event_group
-                                )
-                                benchmarks.append(benchmark)
+def build_phases(output_file: str, fmt: str = "json", percentiles: bool = False,
+                 index: bool = False) -> List[tuple]:
+    """
+    build() split into named phases for --profile (see benchmark_profile.py):
+    combination pruning, record construction (indicators, notes, progression),
+    percentiles and the index when asked for, and serialisation.
+    """
+    def generate(plan):
+        return [
+            generate_benchmark(skill_name, category, age_group, gender, competitive_level, event_group)
+            for category, skill_name, ages in plan
+            for age_group, levels, event_groups in ages
+            for gender in GENDERS
+            for competitive_level in levels
+            for event_group in event_groups
+        ]
 
-    return benchmarks
+    def serialise(benchmarks):
+        if fmt == "compact":
+            save_compact(benchmarks, output_file)
+            return None
+        index_builder = IndexBuilder() if index else None
+        with open(output_file, 'w') as f:
+            write_import(benchmarks, f, fmt, index_builder)
+        return index_builder
+
+    phases = [("enumeration", lambda _: build_enumeration_plan()), ("records", generate)]
+    if percentiles:
+        from benchmark_percentiles import iter_with_percentiles, standards_spread
+        spread = standards_spread(PERFORMANCE_STANDARDS)
+        phases.append(("percentiles", lambda benchmarks: list(iter_with_percentiles(benchmarks, spread))))
+    phases.append(("serialisation", serialise))
+    if index:
+        phases.append(("index", lambda index_builder: index_builder.write(output_file)))
+    return phases
 
 def main():
     """Generate and save athletics benchmarks."""
-    print("Generating Athletics benchmarks...")
-
-    benchmarks = generate_all_benchmarks()
+    parser = argparse.ArgumentParser(description="Generate Athletics benchmarks")
+    parser.add_argument("--format", choices=FORMATS + ["compact"], default="json",
+                        help="json writes the {\"benchmarks\": [...]} envelope, ndjson writes one record per line, "
+                             "compact writes a dictionary-encoded file (see benchmark_compact.py)")
+    parser.add_argument("--gzip", action="store_true",
+                        help="gzip the compact output (.compact.json.gz)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="diff against the existing IMPORT file, write a DELTA file for upload-benchmarks.py "
+                             "and skip the rewrite if nothing changed")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="fill percentile25/50/75/90 from the expected level and standards (requires numpy)")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory to write the IMPORT file into (default: current directory)")
+    parser.add_argument("--index", action="store_true",
+                        help="also write a byte-offset index (<file>.idx) for query-benchmarks.py")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each build phase, trace peak memory and save cProfile and collapsed-stack output")
+    args = parser.parse_args()
+    if args.index and args.format == "compact":
+        parser.error("--index needs the json or ndjson format")
 
-    output = {
-        "benchmarks": benchmarks
-    }
-
-    # Save to JSON file
-    output_file = "athletics-benchmarks-IMPORT.json"
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2)
+    print("Generating Athletics benchmarks...")
 
-    print(f"✅ Generated {len(benchmarks)} benchmarks")
-    print(f"✅ Saved to {output_file}")
+    output_file = os.path.join(args.output_dir, output_path(OUTPUT_BASE, args.format))
+    if args.format == "compact" and args.gzip:
+        output_file += ".gz"
+
+    if args.incremental:
+        delta = write_delta(output_file, iter_import_records(args.percentiles))
+        print(f"🔁 Delta vs existing {output_file}: {delta['added']} added, "
+              f"{delta['changed']} changed, {delta['removed']} removed")
+        print(f"✅ Saved delta to {delta['file']} (apply it with upload-benchmarks.py)")
+        if not delta["records"]:
+            print(f"✅ No changes - {output_file} left untouched")
+            return
+
+    if args.profile:
+        from benchmark_profile import print_profile_report, profile_phases
+        report = profile_phases(build_phases(output_file, args.format, args.percentiles, args.index),
+                                os.path.join(args.output_dir, OUTPUT_BASE))
+        print_profile_report(report)
+        print(f"✅ Saved to {output_file}")
+        return
+
+    result = build(args.output_dir, args.format, args.gzip, args.percentiles, args.index)
+    counts = result["counts"]
+    total = result["records"]
+    print(f"✅ Generated {total} benchmarks")
+    print(f"✅ Saved to {result['file']}")
 
     # Print summary statistics
     print("\n📊 Summary Statistics:")
-    print(f"Total benchmarks: {len(benchmarks)}")
+    print(f"Total benchmarks: {total}")
 
-    # Count by age group
-    age_counts = {}
-    for b in benchmarks:
-        age_counts[b['ageGroup']] = age_counts.get(b['ageGroup'], 0) + 1
     print(f"\nBy Age Group:")
-    for age, count in sorted(age_counts.items()):
+    for age, count in sorted(counts["ageGroup"].items()):
         print(f"  {age}: {count}")
 
-    # Count by competitive level
-    level_counts = {}
-    for b in benchmarks:
-        level_counts[b['competitiveLevel']] = level_counts.get(b['competitiveLevel'], 0) + 1
     print(f"\nBy Competitive Level:")
-    for level, count in sorted(level_counts.items()):
+    for level, count in sorted(counts["competitiveLevel"].items()):
         print(f"  {level}: {count}")
 
-    # Count by event group
-    event_counts = {}
-    for b in benchmarks:
-        event_counts[b['eventGroup']] = event_counts.get(b['eventGroup'], 0) + 1
     print(f"\nBy Event Group:")
-    for event, count in sorted(event_counts.items()):
+    for event, count in sorted(counts["eventGroup"].items()):
         print(f"  {event}: {count}")
 
+    stats = enumeration_stats()
+    print(f"\nCombinations: {stats['valid']} valid of {stats['total']} "
+          f"({stats['pruned']} pruned before generation)")
+
 if __name__ == "__main__":
     main()
@@ -4,7 +4,17 @@ Generate comprehensive Rugby skill benchmarks for all age groups and levels.
 Based on research document: RUGBY_SKILL_STANDARDS_RESEARCH.md
 """
 
-import json
+import argparse
+import os
+import sys
+
+from benchmark_delta import write_delta
+from benchmark_index import IndexBuilder
+from benchmark_io import FORMATS, iter_json_envelope, output_path, tally, write_benchmarks
+
+SPORT_CODE = "rugby"
+OUTPUT_BASE = "rugby-benchmarks-IMPORT"
+OUTPUT_FILE = output_path(OUTPUT_BASE, "json")
 
 # All 44 Rugby skills in order
 SKILLS = [
@@ -102,6 +112,47 @@ GENDER_SPECIFIC_U14_PLUS = [
     "Pass Under Pressure",
 ]
 
+# Age groups in generation order, and the levels offered at each
+AGE_GROUPS = ["U10", "U12", "U14", "U16", "U18", "Senior"]
+
+LEVELS_BY_AGE = {
+    "U10": ["recreational"],
+    "U12": ["recreational", "competitive"],
+    "U14": ["recreational", "competitive", "elite"],
+    "U16": ["recreational", "competitive", "elite"],
+    "U18": ["recreational", "competitive", "elite"],
+    "Senior": ["recreational", "competitive", "elite"],
+}
+
+# Base expected ratings by age/level
+BASE_RATINGS = {
+    "U10": {"recreational": 1.5},
+    "U12": {"recreational": 2.0, "competitive": 2.5},
+    "U14": {"recreational": 2.5, "competitive": 3.0, "elite": 3.5},
+    "U16": {"recreational": 3.0, "competitive": 3.5, "elite": 4.0},
+    "U18": {"recreational": 3.0, "competitive": 3.5, "elite": 4.0},
+    "Senior": {"recreational": 3.0, "competitive": 4.0, "elite": 4.5},
+}
+
+# Tactical skills develop slower (start lower, progress more gradually)
+TACTICAL_SKILLS = frozenset([
+    "Decision Making", "Reading Defense", "Positional Understanding",
+    "Game Sense / Instinct", "Following Game Plan", "Spatial Awareness",
+    "Communication on Field",
+])
+
+# Contact skills introduction progression
+CONTACT_SKILLS = frozenset([
+    "Tackle Technique", "Tackle Completion", "Body Position in Contact",
+    "Leg Drive Through Contact", "Ball Presentation", "Ruck Entry / Cleanout",
+])
+
+# Kicking skills introduction
+KICKING_SKILLS = frozenset([
+    "Punt Kick (Left)", "Punt Kick (Right)", "Grubber Kick",
+    "Drop Kick", "Place Kicking", "Kicking Distance", "Kick Accuracy",
+])
+
 def get_gender_for_skill(skill_name, age_group):
     """Determine if skill should use 'all' or gender-specific benchmarks."""
     if skill_name in ALL_GENDER_SKILLS:
@@ -118,52 +169,29 @@ def get_gender_for_skill(skill_name, age_group):
         return ["all"]
     return ["male", "female"]
 
-def get_skill_benchmark_data(skill_name, age_group, gender, level):
+def compute_expected_rating(skill_name, age_group, level):
     """
-    Get benchmark data for specific skill/age/gender/level combination.
-    Returns: (expectedRating, notes)
+    Apply the skill/age adjustment rules to the base rating.
+    Only used to compile RATING_TABLE - look ratings up there instead.
     """
 
-    # Base expected ratings by age/level
-    base_ratings = {
-        "U10": {"recreational": 1.5},
-        "U12": {"recreational": 2.0, "competitive": 2.5},
-        "U14": {"recreational": 2.5, "competitive": 3.0, "elite": 3.5},
-        "U16": {"recreational": 3.0, "competitive": 3.5, "elite": 4.0},
-        "U18": {"recreational": 3.0, "competitive": 3.5, "elite": 4.0},
-        "Senior": {"recreational": 3.0, "competitive": 4.0, "elite": 4.5},
-    }
-
-    base_rating = base_ratings[age_group][level]
+    base_rating = BASE_RATINGS[age_group][level]
 
     # Adjustments for specific skill types
 
-    # Tactical skills develop slower (start lower, progress more gradually)
-    tactical_skills = ["Decision Making", "Reading Defense", "Positional Understanding",
-                       "Game Sense / Instinct", "Following Game Plan", "Spatial Awareness",
-                       "Communication on Field"]
-
-    if skill_name in tactical_skills:
+    if skill_name in TACTICAL_SKILLS:
         if age_group == "U10":
             base_rating = 1.0
         elif age_group == "U12":
             base_rating = base_rating - 0.5 if level == "recreational" else base_rating
 
-    # Contact skills introduction progression
-    contact_skills = ["Tackle Technique", "Tackle Completion", "Body Position in Contact",
-                      "Leg Drive Through Contact", "Ball Presentation", "Ruck Entry / Cleanout"]
-
-    if skill_name in contact_skills:
+    if skill_name in CONTACT_SKILLS:
         if age_group == "U10":
             base_rating = 1.5  # Tag to contact transition
         elif age_group == "U12":
             base_rating = min(base_rating, 2.5)  # Progressive contact
 
-    # Kicking skills introduction
-    kicking_skills = ["Punt Kick (Left)", "Punt Kick (Right)", "Grubber Kick",
-                      "Drop Kick", "Place Kicking", "Kicking Distance", "Kick Accuracy"]
-
-    if skill_name in kicking_skills:
+    if skill_name in KICKING_SKILLS:
         if age_group == "U10":
             base_rating = 1.0  # Not yet introduced
         elif age_group == "U12":
@@ -206,6 +234,28 @@ def get_skill_benchmark_data(skill_name, age_group, gender, level):
         elif age_group == "U12" and level == "recreational":
             base_rating = 1.5
 
+    return base_rating
+
+def build_rating_table():
+    """Compile the rating rules into a (skill, ageGroup, level) -> rating table."""
+    return {
+        (skill_name, age_group, level): compute_expected_rating(skill_name, age_group, level)
+        for skill_name in SKILLS
+        for age_group in AGE_GROUPS
+        for level in LEVELS_BY_AGE[age_group]
+    }
+
+# Expected ratings are independent of gender, so the rule cascade only runs
+# once per skill/age/level at import rather than once per benchmark
+RATING_TABLE = build_rating_table()
+
+def get_skill_benchmark_data(skill_name, age_group, gender, level):
+    """
+    Get benchmark data for specific skill/age/gender/level combination.
+    Returns: (expectedRating, notes)
+    """
+    base_rating = RATING_TABLE[(skill_name, age_group, level)]
+
     # Generate contextual notes
     notes = get_skill_notes(skill_name, age_group, gender, level, base_rating)
 
@@ -303,21 +353,11 @@ def get_skill_notes(skill_name, age_group, gender, level, rating):
 
     return " ".join(notes)
 
-def generate_benchmarks():
-    """Generate all benchmarks for all skills, age groups, genders, and levels."""
-
-    benchmarks = []
+def iter_benchmarks():
+    """Yield benchmarks for all skills, age groups, genders, and levels."""
 
-    age_groups = ["U10", "U12", "U14", "U16", "U18", "Senior"]
-
-    for age_group in age_groups:
-        # Determine levels for this age group
-        if age_group == "U10":
-            levels = ["recreational"]
-        elif age_group == "U12":
-            levels = ["recreational", "competitive"]
-        else:  # U14, U16, U18, Senior
-            levels = ["recreational", "competitive", "elite"]
+    for age_group in AGE_GROUPS:
+        levels = LEVELS_BY_AGE[age_group]
 
         for skill_name in SKILLS:
             genders = get_gender_for_skill(skill_name, age_group)
@@ -329,7 +369,7 @@ def generate_benchmarks():
                     )
 
                     benchmark = {
-                        "sportCode": "rugby",
+                        "sportCode": SPORT_CODE,
                         "skillName": skill_name,
                         "ageGroup": age_group,
                         "gender": gender,
@@ -341,35 +381,158 @@ def generate_benchmarks():
                         "notes": notes
                     }
 
-                    benchmarks.append(benchmark)
+                    yield benchmark
+
+def generate_benchmarks():
+    """Generate all benchmarks for all skills, age groups, genders, and levels."""
+    return list(iter_benchmarks())
+
+def iter_import_records(percentiles=False):
+    """Records as written to the IMPORT file, optionally with synthesised percentiles."""
+    records = iter_benchmarks()
+    if percentiles:
+        # NumPy is only needed for this stage, so import it on demand
+        from benchmark_percentiles import iter_with_percentiles
+        records = iter_with_percentiles(records)
+    return records
+
+def render_benchmarks(benchmarks):
+    """Serialise benchmarks exactly as they are written to the IMPORT file."""
+    return "".join(iter_json_envelope(benchmarks)) + "\n"
+
+def check_benchmarks(path=OUTPUT_FILE):
+    """
+    Regenerate benchmarks in memory and compare byte-for-byte with an
+    existing IMPORT file. Returns True when they are identical.
+    """
+    with open(path) as f:
+        existing = f.read()
+
+    rendered = render_benchmarks(iter_benchmarks())
+    if rendered == existing:
+        return True
+
+    # Report the first differing line to make regressions easy to find
+    for line_no, (old, new) in enumerate(zip(existing.splitlines(), rendered.splitlines()), 1):
+        if old != new:
+            print(f"  line {line_no}:\n    - {old.strip()}\n    + {new.strip()}")
+            break
+    else:
+        print(f"  length differs: {len(existing)} vs {len(rendered)} bytes")
+    return False
+
+def write_import(records, f, fmt="json", on_record=None):
+    """write_benchmarks() plus the trailing newline the json IMPORT file ends with. Returns bytes written."""
+    size = write_benchmarks(records, f, fmt, on_record)
+    if fmt == "json":
+        size += f.write("\n")
+    return size
+
+def build(output_dir=".", fmt="json", percentiles=False, index=False):
+    """
+    Generate benchmarks and stream them into output_dir, optionally with a
+    sidecar byte-offset index (see benchmark_index.py).
+    Returns a build summary used by main() and build-benchmarks.py.
+    """
+    output_file = os.path.join(output_dir, output_path(OUTPUT_BASE, fmt))
+    benchmarks, counts = tally(iter_import_records(percentiles), ["ageGroup"])
+    index_builder = IndexBuilder() if index else None
+
+    # Stream records straight to disk so memory stays flat as skills grow
+    with open(output_file, "w") as f:
+        size = write_import(benchmarks, f, fmt, index_builder)
+
+    if index_builder:
+        index_builder.write(output_file)
+
+    return {
+        "sport": SPORT_CODE,
+        "file": output_file,
+        "records": sum(counts["ageGroup"].values()),
+        "bytes": size,
+        "counts": counts,
+    }
 
-    return benchmarks
+def build_phases(output_file, fmt="json", percentiles=False, index=False):
+    """
+    build() split into named phases for --profile (see benchmark_profile.py):
+    record and notes construction, percentiles and the index when asked for,
+    and serialisation. Ratings come from RATING_TABLE, compiled at import.
+    """
+    def serialise(benchmarks):
+        index_builder = IndexBuilder() if index else None
+        with open(output_file, "w") as f:
+            write_import(benchmarks, f, fmt, index_builder)
+        return index_builder
+
+    phases = [("records", lambda _: generate_benchmarks())]
+    if percentiles:
+        from benchmark_percentiles import iter_with_percentiles
+        phases.append(("percentiles", lambda benchmarks: list(iter_with_percentiles(benchmarks))))
+    phases.append(("serialisation", serialise))
+    if index:
+        phases.append(("index", lambda index_builder: index_builder.write(output_file)))
+    return phases
 
 def main():
     """Generate and save benchmarks to JSON file."""
 
-    print("Generating Rugby skill benchmarks...")
-    benchmarks = generate_benchmarks()
-
-    print(f"Generated {len(benchmarks)} benchmarks")
+    parser = argparse.ArgumentParser(description="Generate Rugby skill benchmarks")
+    parser.add_argument("--check", action="store_true",
+                        help=f"verify {OUTPUT_FILE} is byte-identical to a fresh build instead of writing it")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="json writes the {\"benchmarks\": [...]} envelope, ndjson writes one record per line")
+    parser.add_argument("--incremental", action="store_true",
+                        help="diff against the existing IMPORT file, write a DELTA file for upload-benchmarks.py "
+                             "and skip the rewrite if nothing changed")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="fill percentile25/50/75/90 from the threshold ladder (requires numpy)")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory to write the IMPORT file into (default: current directory)")
+    parser.add_argument("--index", action="store_true",
+                        help="also write a byte-offset index (<file>.idx) for query-benchmarks.py")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each build phase, trace peak memory and save cProfile and collapsed-stack output")
+    args = parser.parse_args()
+
+    if args.check:
+        print(f"Checking {OUTPUT_FILE} against generated benchmarks...")
+        if not check_benchmarks():
+            print(f"❌ {OUTPUT_FILE} differs from generated output")
+            sys.exit(1)
+        print(f"✅ {OUTPUT_FILE} is byte-identical to generated output")
+        return
 
-    # Count by age group
-    by_age = {}
-    for b in benchmarks:
-        age = b["ageGroup"]
-        by_age[age] = by_age.get(age, 0) + 1
+    print("Generating Rugby skill benchmarks...")
+    output_file = os.path.join(args.output_dir, output_path(OUTPUT_BASE, args.format))
+
+    if args.incremental:
+        delta = write_delta(output_file, iter_import_records(args.percentiles))
+        print(f"Delta vs existing {output_file}: {delta['added']} added, "
+              f"{delta['changed']} changed, {delta['removed']} removed")
+        print(f"Saved delta to {delta['file']} (apply it with upload-benchmarks.py)")
+        if not delta["records"]:
+            print(f"No changes - {output_file} left untouched")
+            return
+
+    if args.profile:
+        from benchmark_profile import print_profile_report, profile_phases
+        report = profile_phases(build_phases(output_file, args.format, args.percentiles, args.index),
+                                os.path.join(args.output_dir, OUTPUT_BASE))
+        print_profile_report(report)
+        print(f"Saved to {output_file}")
+        return
+
+    result = build(args.output_dir, args.format, args.percentiles, args.index)
+
+    by_age = result["counts"]["ageGroup"]
+    print(f"Generated {result['records']} benchmarks")
 
     print("\nBreakdown by age group:")
-    for age in ["U10", "U12", "U14", "U16", "U18", "Senior"]:
+    for age in AGE_GROUPS:
         print(f"  {age}: {by_age.get(age, 0)} benchmarks")
 
-    # Save to file
-    output = {"benchmarks": benchmarks}
-
-    with open("rugby-benchmarks-IMPORT.json", "w") as f:
-        json.dump(output, f, indent=2)
-
-    print("\nSaved to rugby-benchmarks-IMPORT.json")
+    print(f"\nSaved to {result['file']}")
 
 if __name__ == "__main__":
     main()
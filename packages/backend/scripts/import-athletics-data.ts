@@ -64,6 +64,11 @@ type BenchmarkData = {
     };
     assessmentNotes: string;
     progressionPath: string;
+    // Present when generated with --percentiles
+    percentile25?: number;
+    percentile50?: number;
+    percentile75?: number;
+    percentile90?: number;
   }>;
 };
 
@@ -243,6 +248,10 @@ async function main() {
     minAcceptable: Math.max(1, b.expectedLevel - 1),
     developingThreshold: b.expectedLevel,
     excellentThreshold: Math.min(5, b.expectedLevel + 1),
+    percentile25: b.percentile25,
+    percentile50: b.percentile50,
+    percentile75: b.percentile75,
+    percentile90: b.percentile90,
     notes: `${b.assessmentNotes}\n\nProgression: ${b.progressionPath}\n\nEvent Group: ${b.eventGroup}`,
   }));
 
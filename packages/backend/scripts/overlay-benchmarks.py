@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Inspect and materialise organisation benchmark overlays.
+
+Overlays are small rule files layered on a sport's national benchmarks (see
+benchmark_overlay.py). This script reports what each overlay changes and,
+only when asked, writes the full per-organisation IMPORT file, laid out as
+the sport's generator writes its own. Files newer than everything they are
+built from - the overlay, the generator, its DATA_FILES and the helper
+modules loaded from this directory - are left alone.
+
+Usage:
+    python3 overlay-benchmarks.py overlays/*.overlay.json
+    python3 overlay-benchmarks.py overlays/st-marys.overlay.json --materialise --output-dir build
+"""
+
+import argparse
+import os
+import sys
+from typing import List
+
+from benchmark_io import FORMATS, output_path
+from benchmark_overlay import load_overlays
+from benchmark_registry import SCRIPTS_DIR, default_registry
+
+def materialised_path(overlay, output_dir: str, fmt: str) -> str:
+    return os.path.join(output_dir, output_path(f"{overlay.organization_id}-{overlay.sport}-benchmarks-IMPORT", fmt))
+
+def overlay_sources(overlay) -> List[str]:
+    """
+    Files a materialised overlay is built from: the overlay, the sport's
+    generator and the data files it declares, and every module loaded from
+    this directory (call after the overlay has been applied, so all are loaded).
+    """
+    generator = default_registry().get(overlay.sport)
+    sources = [overlay.path, generator.path, *getattr(generator.module, "DATA_FILES", [])]
+    for module in list(sys.modules.values()):
+        source = getattr(module, "__file__", None)
+        if source and os.path.dirname(os.path.abspath(source)) == SCRIPTS_DIR:
+            sources.append(source)
+    return [source for source in sources if source]
+
+def is_stale(path: str, overlay) -> bool:
+    """True when path is missing or older than anything in overlay_sources()."""
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+    return any(os.path.getmtime(source) > built for source in overlay_sources(overlay))
+
+def main():
+    """Summarise overlays and optionally materialise full per-organisation files."""
+    parser = argparse.ArgumentParser(description="Inspect and materialise organisation benchmark overlays")
+    parser.add_argument("overlays", nargs="+", metavar="OVERLAY", help="overlay JSON files")
+    parser.add_argument("--materialise", action="store_true",
+                        help="write the full IMPORT file for each overlay (skipped when up to date)")
+    parser.add_argument("--force", action="store_true", help="rewrite materialised files even when up to date")
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--output-dir", default=".",
+                        help="directory to write materialised files into (default: current directory)")
+    args = parser.parse_args()
+
+    try:
+        overlays = load_overlays(args.overlays)
+        # Applying every overlay up front surfaces rule errors before anything is written
+        summaries = [overlay.summary() for overlay in overlays]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Invalid overlay: {e}")
+        sys.exit(1)
+
+    print(f"  {'Organisation':<28}{'Sport':<12}{'Rules':>6}{'Changed':>10}{'Records':>10}")
+    for summary in summaries:
+        print(f"  {summary['name'][:27]:<28}{summary['sport']:<12}{summary['rules']:>6}"
+              f"{summary['changed']:>10}{summary['records']:>10}")
+
+    if not args.materialise:
+        return
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    written = 0
+    for overlay in overlays:
+        path = materialised_path(overlay, args.output_dir, args.format)
+        if not args.force and not is_stale(path, overlay):
+            print(f"✅ {path} is up to date")
+            continue
+        with open(path, "w") as f:
+            size = default_registry().get(overlay.sport).module.write_import(overlay.iter_records(), f, args.format)
+        written += 1
+        print(f"✅ Wrote {path} ({size / 1024:.1f}KB)")
+
+    print(f"\n✅ Materialised {written} of {len(overlays)} overlay(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Look up benchmarks by key without loading the IMPORT file.
+
+Uses the sidecar <file>.idx written by the generators' --index flag (or by
+--build-index here) to memory-map the data file and decode only the matching
+records. See benchmark_index.py.
+
+Usage:
+    python3 query-benchmarks.py rugby-benchmarks-IMPORT.json "Tackle Technique" U16 female elite
+    python3 query-benchmarks.py athletics-benchmarks-IMPORT.json "Posture & Alignment" U14 male competitive
+    python3 query-benchmarks.py athletics-benchmarks-IMPORT.json "Aerobic Capacity (VO2 Max)" U16 female elite --event "Middle Distance"
+    python3 query-benchmarks.py soccer-benchmarks-IMPORT.json --build-index
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmark_index import BenchmarkIndex, build_index, index_path
+
+def main():
+    """Build an index or query one key."""
+    parser = argparse.ArgumentParser(description="Query benchmark IMPORT files through their byte-offset index")
+    parser.add_argument("file", help="IMPORT file (json or ndjson)")
+    parser.add_argument("key", nargs="*", metavar="SKILL AGE GENDER LEVEL",
+                        help="skill name, age group, gender and level (case-insensitive)")
+    parser.add_argument("--event", help="athletics event group (default: all event groups)")
+    parser.add_argument("--build-index", action="store_true", help="(re)build the index for FILE from its contents")
+    parser.add_argument("--json", action="store_true", help="print matching records as JSON")
+    args = parser.parse_args()
+
+    if args.build_index:
+        start = time.perf_counter()
+        try:
+            path = build_index(args.file)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Indexed {args.file} -> {path} ({os.path.getsize(path) / 1024:.1f}KB, "
+              f"{time.perf_counter() - start:.2f}s)")
+        if not args.key:
+            return
+
+    if len(args.key) != 4:
+        parser.error("expected SKILL AGE GENDER LEVEL")
+    if not os.path.exists(index_path(args.file)):
+        print(f"❌ No index for {args.file}; rerun with --build-index or generate with --index")
+        sys.exit(1)
+
+    try:
+        with BenchmarkIndex(args.file) as index:
+            start = time.perf_counter()
+            records = index.lookup(*args.key, event_group=args.event)
+            elapsed = time.perf_counter() - start
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not records:
+        print(f"❌ No benchmark for {' / '.join(args.key)}" + (f" / {args.event}" if args.event else ""))
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+
+    for record in records:
+        rating = record.get("expectedRating", record.get("expectedLevel"))
+        event = f" [{record['eventGroup']}]" if "eventGroup" in record else ""
+        print(f"  {record['skillName']} {record['ageGroup']} {record['gender']} "
+              f"{record.get('level', record.get('competitiveLevel'))}{event}: expected {rating}")
+        if "minAcceptable" in record:
+            print(f"    thresholds {record['minAcceptable']} / {record['developingThreshold']} / "
+                  f"{record['excellentThreshold']}")
+    print(f"\n✅ {len(records)} match(es) in {elapsed * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    main()
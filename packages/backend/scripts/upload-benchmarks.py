@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Upload benchmark chunks to Convex with bounded concurrency and resume.
+
+Takes chunk manifests written by chunk-benchmarks.py, or IMPORT files, which
+are chunked first. DELTA files written by a generator's --incremental run are
+chunked for applyBenchmarkDelta instead, which updates changed benchmarks in
+place and deactivates removed ones (see benchmark_delta.py). Acknowledged chunks are journalled next to the manifest
+(<manifest>.uploaded), so rerunning after a failure only sends what is left.
+See benchmark_upload.py for the retry and connection pooling details.
+
+Usage:
+    CONVEX_URL=https://your-instance.convex.cloud python3 upload-benchmarks.py chunks/athletics-MANIFEST.json
+    python3 upload-benchmarks.py athletics-benchmarks-IMPORT.json --url http://127.0.0.1:3210 --concurrency 8
+    python3 upload-benchmarks.py rugby-benchmarks-DELTA.json     # after generate-rugby-benchmarks.py --incremental
+    python3 upload-benchmarks.py --self-test      # against the local stub in convex_stub.py
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+from typing import Optional
+
+from benchmark_chunks import DEFAULT_MAX_RECORDS, load_manifest, manifest_path, write_chunks
+from benchmark_delta import DELTA_MUTATION, context_key as delta_context_key, iter_delta_rows, read_delta, write_delta
+from benchmark_import import SOURCES, record_sport
+from benchmark_io import read_benchmarks
+from benchmark_schema import iter_valid_rows
+from benchmark_upload import DEFAULT_CONCURRENCY, DEFAULT_RETRIES, DEFAULT_TIMEOUT, journal_path, parse_retry_after, upload
+
+def ensure_delta_manifest(path: str, chunk_dir: str, max_records: int = DEFAULT_MAX_RECORDS) -> Optional[str]:
+    """Chunk a DELTA file for applyBenchmarkDelta. Returns None when the delta is empty."""
+    delta = read_delta(path)
+    records = delta["added"] + delta["changed"] + delta["removed"]
+    if not records:
+        return None
+    sport = record_sport(records[0])
+    if sport not in SOURCES:
+        raise ValueError(f"No source metadata for '{sport}'")
+
+    os.makedirs(chunk_dir, exist_ok=True)
+    write_chunks(iter_delta_rows(delta), SOURCES[sport], chunk_dir, sport, max_records,
+                 mutation=DELTA_MUTATION, prefix=f"{sport}-delta")
+    return manifest_path(chunk_dir, f"{sport}-delta")
+
+def ensure_manifest(path: str, chunk_dir: str, max_records: int = DEFAULT_MAX_RECORDS) -> Optional[str]:
+    """Return a manifest for path, chunking it first when it is an IMPORT or DELTA file."""
+    if path.endswith("-MANIFEST.json"):
+        return path
+    if path.endswith("-DELTA.json"):
+        return ensure_delta_manifest(path, chunk_dir, max_records)
+
+    records = read_benchmarks(path)
+    first = next(records)
+    sport = record_sport(first)
+    if sport not in SOURCES:
+        raise ValueError(f"No source metadata for '{sport}'; chunk it with chunk-benchmarks.py --source ...")
+
+    os.makedirs(chunk_dir, exist_ok=True)
+    write_chunks(iter_valid_rows(itertools.chain([first], records)), SOURCES[sport], chunk_dir, sport,
+                 max_records)
+    return manifest_path(chunk_dir, sport)
+
+def report(manifest_file: str, summary: dict) -> None:
+    print(f"  {os.path.basename(manifest_file)}: {summary['uploaded']} chunk(s) uploaded, "
+          f"{summary['skipped']} already done, {len(summary['failed'])} failed "
+          f"({summary['attempts']} attempts over {summary['connections']} connection(s), {summary['seconds']:.2f}s)")
+    print(f"    rows created {summary['created']}, already present {summary['existing']}")
+    if summary["updated"] or summary["deactivated"]:
+        print(f"    rows updated {summary['updated']}, deactivated {summary['deactivated']}")
+    for name, error in summary["failed"]:
+        print(f"    ❌ {name}: {error}")
+    for error in summary["errors"][:10]:
+        print(f"    ⚠️ {error}")
+    if len(summary["errors"]) > 10:
+        print(f"    ... and {len(summary['errors']) - 10} more row error(s)")
+
+def self_test() -> None:
+    """Upload both sports to the stub with injected faults, then resume and check every row landed once."""
+    from convex_stub import StubConvex, context_key
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Small chunks so concurrency, retries and connection reuse all get exercised
+        scripts_dir = os.path.dirname(os.path.abspath(__file__))
+        manifests = [ensure_manifest(os.path.join(scripts_dir, f"{sport}-benchmarks-IMPORT.json"), tmp, max_records=50)
+                     for sport in ("rugby", "athletics")]
+        with StubConvex(fail_rate=0.3, reject_skills={"tackle_technique"}) as stub:
+            options = {"concurrency": 4, "backoff_base": 0.01, "backoff_max": 0.05, "retries": 8}
+            first = {m: upload(m, stub.url, **options) for m in manifests}
+            for manifest_file, summary in first.items():
+                report(manifest_file, summary)
+            assert first[manifests[0]]["failed"], "rejected rugby chunk should fail"
+            assert stub.failures, "fault injection should have produced 503s"
+
+            stub.reject_skills = frozenset()
+            print("  resuming...")
+            second = {m: upload(m, stub.url, **options) for m in manifests}
+            for manifest_file, summary in second.items():
+                report(manifest_file, summary)
+                assert not summary["failed"]
+                assert summary["skipped"] == first[manifest_file]["uploaded"], "resume should skip acknowledged chunks"
+
+            expected = sum(load_manifest(m)["records"] for m in manifests)
+            received = sum(s["created"] + s["existing"] for s in list(first.values()) + list(second.values()))
+            assert received == expected, f"{received} rows acknowledged, expected {expected}"
+            assert stub.connections < stub.requests, "connections should be reused across requests"
+            print(f"  stub: {stub.requests} requests ({stub.failures} injected 503s) over "
+                  f"{stub.connections} connections, {len(stub.rows)} distinct rows stored")
+
+            # Regenerate rugby with one benchmark changed, one dropped and one added, then apply the delta
+            import_file = os.path.join(scripts_dir, "rugby-benchmarks-IMPORT.json")
+            records = list(read_benchmarks(import_file))
+            changed = {**records[0], "expectedRating": records[0]["expectedRating"] - 0.5}
+            added = {**records[2], "ageGroup": "U99"}
+            write_delta(import_file, [changed] + records[2:] + [added], os.path.join(tmp, "rugby-benchmarks-DELTA.json"))
+            delta_manifest = ensure_manifest(os.path.join(tmp, "rugby-benchmarks-DELTA.json"), tmp, max_records=2)
+            before = len(stub.rows)
+            summary = upload(delta_manifest, stub.url, **options)
+            report(delta_manifest, summary)
+            assert not summary["failed"]
+            assert (summary["created"], summary["updated"], summary["deactivated"]) == (1, 1, 1)
+            changed_row, dropped_row = iter_valid_rows([changed, records[1]])
+            assert stub.rows[context_key(changed_row)]["expectedRating"] == changed_row["expectedRating"]
+            assert context_key(dropped_row) not in stub.rows, "removed benchmark should be deactivated"
+            assert len(stub.rows) == before, "one row added, one deactivated"
+            print(f"  delta: {summary['created']} created, {summary['updated']} updated, "
+                  f"{summary['deactivated']} deactivated")
+
+            # Athletics records for several event groups share one by_context row, which holds the first
+            import_file = os.path.join(scripts_dir, "athletics-benchmarks-IMPORT.json")
+            records = list(read_benchmarks(import_file))
+            shared: dict = {}
+            for record in records:
+                shared.setdefault(delta_context_key(record), []).append(record)
+            first_record, second_record = next(group for group in shared.values() if len(group) > 1)[:2]
+            delta_file = os.path.join(tmp, "athletics-benchmarks-DELTA.json")
+            before = dict(stub.rows)
+
+            # Dropping a later event group's record moves no row
+            delta = write_delta(import_file, [r for r in records if r is not second_record], delta_file)
+            assert delta["records"] == 1 and ensure_manifest(delta_file, tmp) is None, delta
+            # Dropping the first one hands the row to the next event group's record, without deactivating it
+            write_delta(import_file, [r for r in records if r is not first_record], delta_file)
+            delta_manifest = ensure_manifest(delta_file, tmp, max_records=2)
+            summary = upload(delta_manifest, stub.url, **options)
+            report(delta_manifest, summary)
+            assert not summary["failed"]
+            assert (summary["created"], summary["updated"], summary["deactivated"]) == (0, 1, 0)
+            row = next(iter_valid_rows([second_record]))
+            assert stub.rows[context_key(row)]["notes"] == row["notes"]
+            assert stub.rows.keys() == before.keys(), "no athletics row should be added or deactivated"
+            print(f"  athletics delta: {summary['updated']} shared row handed to the next event group")
+
+        # A chunk whose mutation reports per-row errors stays out of the journal and is resent
+        manifest_file = manifests[0]
+        os.remove(journal_path(manifest_file))
+        with StubConvex(error_skills={"tackle_technique"}) as stub:
+            summary = upload(manifest_file, stub.url, **options)
+            report(manifest_file, summary)
+            assert summary["failed"] and summary["errors"], "row errors should fail the chunk"
+            assert summary["uploaded"] + len(summary["failed"]) == summary["chunks"]
+            stub.error_skills = frozenset()
+            resumed = upload(manifest_file, stub.url, **options)
+            assert not resumed["failed"] and resumed["skipped"] == summary["uploaded"], resumed
+            assert resumed["created"] == len(summary["errors"]), "only the rejected rows should be new"
+
+    assert parse_retry_after("2") == 2.0 and parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0, "a past HTTP-date means retry now"
+    print("✅ Self-test passed")
+
+def main():
+    """Upload manifests or IMPORT files to a Convex deployment."""
+    parser = argparse.ArgumentParser(description="Upload benchmark chunks to Convex")
+    parser.add_argument("files", nargs="*", metavar="MANIFEST_OR_IMPORT")
+    parser.add_argument("--url", default=os.environ.get("CONVEX_URL") or os.environ.get("VITE_CONVEX_URL"),
+                        help="Convex deployment URL (default: $CONVEX_URL or $VITE_CONVEX_URL)")
+    parser.add_argument("--auth-token", default=os.environ.get("CONVEX_AUTH_TOKEN"),
+                        help="sent as 'Authorization: Convex <token>' (default: $CONVEX_AUTH_TOKEN)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request")
+    parser.add_argument("--chunk-dir", default="chunks", help="where IMPORT files are chunked (default: chunks)")
+    parser.add_argument("--restart", action="store_true", help="ignore the journal and upload every chunk again")
+    parser.add_argument("--self-test", action="store_true", help="exercise the uploader against a local stub server")
+    args = parser.parse_args()
+
+    if args.self_test:
+        self_test()
+        return
+    if not args.files:
+        parser.error("at least one manifest or IMPORT file is required")
+    if not args.url:
+        parser.error("--url or CONVEX_URL is required")
+
+    failed = False
+    for path in args.files:
+        try:
+            manifest_file = ensure_manifest(path, args.chunk_dir)
+        except (OSError, ValueError, StopIteration) as e:
+            print(f"❌ {path}: {e or 'no benchmarks'}")
+            sys.exit(1)
+        if manifest_file is None:
+            print(f"✅ {path} has no changes to apply")
+            continue
+        if args.restart and os.path.exists(journal_path(manifest_file)):
+            os.remove(journal_path(manifest_file))
+
+        print(f"⬆️  Uploading {manifest_file} to {args.url}...")
+        summary = upload(manifest_file, args.url, concurrency=args.concurrency, retries=args.retries,
+                         timeout=args.timeout, auth_token=args.auth_token)
+        report(manifest_file, summary)
+        failed = failed or bool(summary["failed"])
+
+    if failed:
+        print("\n❌ Some chunks failed; rerun the same command to retry only those")
+        sys.exit(1)
+    print("\n✅ Upload complete")
+
+if __name__ == "__main__":
+    main()
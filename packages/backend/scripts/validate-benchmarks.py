@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Validate benchmark records against the bulkImportBenchmarks schema before upload.
+
+Records are checked by a validator compiled once from SKILL_BENCHMARK_ROW
+(see benchmark_schema.py). As written, generator records are reported field
+by field: athletics' "Male", competitiveLevel and expectedLevel all fail.
+With --normalise they are converted to mutation rows and literal values are
+folded onto the schema first; anything that still fails would be rejected
+by Convex.
+
+Usage:
+    python3 validate-benchmarks.py athletics-benchmarks-IMPORT.json
+    python3 validate-benchmarks.py --normalise *-benchmarks-IMPORT.json
+    python3 validate-benchmarks.py --normalise rugby-benchmarks-IMPORT.json --output rugby-rows.ndjson
+    python3 validate-benchmarks.py --show-source
+"""
+
+import argparse
+import sys
+import time
+
+from benchmark_io import iter_ndjson, read_benchmarks
+from benchmark_schema import RecordValidator, SchemaError, iter_valid_rows, validate_records
+
+def main():
+    """Validate IMPORT files, optionally writing the normalised rows."""
+    parser = argparse.ArgumentParser(description="Validate benchmark records against the skillBenchmarks schema")
+    parser.add_argument("files", nargs="*", metavar="IMPORT_FILE")
+    parser.add_argument("--normalise", action="store_true",
+                        help="convert to mutation rows and fold literal values before validating")
+    parser.add_argument("--examples", type=int, default=5, help="failing records listed per file")
+    parser.add_argument("--output", help="write normalised rows as NDJSON (implies --normalise, one input file)")
+    parser.add_argument("--show-source", action="store_true", help="print the compiled validator and exit")
+    args = parser.parse_args()
+
+    if args.show_source:
+        print(RecordValidator(normalise=args.normalise).source)
+        return
+    if not args.files:
+        parser.error("at least one IMPORT file is required")
+
+    if args.output:
+        if len(args.files) != 1:
+            parser.error("--output takes exactly one input file")
+        count = 0
+        try:
+            with open(args.output, "w") as f:
+                for line in iter_ndjson(iter_valid_rows(read_benchmarks(args.files[0]))):
+                    f.write(line)
+                    count += 1
+        except SchemaError as e:
+            print(f"❌ {args.files[0]}: {e}")
+            sys.exit(1)
+        print(f"✅ {count} valid rows -> {args.output}")
+        return
+
+    failed = False
+    for path in args.files:
+        start = time.perf_counter()
+        summary = validate_records(read_benchmarks(path), args.normalise, args.examples)
+        elapsed = time.perf_counter() - start
+
+        fixed = f", {summary['fixes']} value(s) normalised" if args.normalise else ""
+        rate = summary["records"] / elapsed if elapsed else 0
+        if not summary["invalid"]:
+            print(f"✅ {path}: {summary['records']} records valid{fixed} ({rate:,.0f} records/s)")
+            continue
+
+        failed = True
+        print(f"❌ {path}: {summary['invalid']} of {summary['records']} records invalid{fixed}")
+        for field, count in sorted(summary["fields"].items(), key=lambda item: -item[1]):
+            print(f"    {field}: {count}")
+        for position, label, errors in summary["failures"]:
+            print(f"  record {position} ({label})")
+            for error in errors:
+                print(f"      {error}")
+
+    if failed:
+        hint = "" if args.normalise else " (try --normalise)"
+        print(f"\n❌ Records would be rejected by bulkImportBenchmarks{hint}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
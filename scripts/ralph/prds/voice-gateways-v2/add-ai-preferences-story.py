@@ -4,17 +4,21 @@ Add US-VN-006b (Coach AI Category Preferences) to PRD.json
 Updates Phase 1 structure, checklist, and effort estimates
 """
 
-import json
 import sys
 from pathlib import Path
 
+from prd_graph import CycleError, update_effort_summary
+from prd_store import PRDStore
+
 prd_path = Path(__file__).parent / "PRD.json"
 
 # Load current PRD
 try:
-    with open(prd_path) as f:
-        prd = json.load(f)
-    print(f"✅ Loaded PRD.json ({len(prd['userStories'])} stories)")
+    store = PRDStore.load(prd_path, repair=True)
+    prd = store.data
+    print(f"✅ Loaded PRD.json ({len(store)} stories)")
+    snapshot = store.snapshot(f"before {Path(__file__).name}")
+    print(f"✅ Snapshot {snapshot['id'][:12]} taken (restore with prd-snapshots.py)")
 except Exception as e:
     print(f"❌ Error loading PRD.json: {e}")
     sys.exit(1)
@@ -109,15 +113,13 @@ new_story = {
     }
 }
 
-# Insert after US-VN-006 (index 5, so insert at 6)
-us_vn_006_index = next(i for i, s in enumerate(prd['userStories']) if s['id'] == 'US-VN-006')
-prd['userStories'].insert(us_vn_006_index + 1, new_story)
-print(f"✅ Inserted US-VN-006b after US-VN-006 (index {us_vn_006_index + 1})")
+# Insert after US-VN-006
+store.add(new_story, after='US-VN-006')
+print(f"✅ Inserted US-VN-006b after US-VN-006 (index {store.ids().index('US-VN-006b')})")
 
 # Update Phase 1 structure
 prd['phaseStructure']['phases'][0]['stories'].append('US-VN-006b')
-prd['phaseStructure']['phases'][0]['duration'] = '4 days (was 2.5 days)'
-print("✅ Updated Phase 1 structure: added US-VN-006b, updated duration")
+print("✅ Updated Phase 1 structure: added US-VN-006b")
 
 # Update Phase 1 checklist
 new_checklist_items = [
@@ -139,15 +141,6 @@ for item in reversed(new_checklist_items):
     prd['phase1Checklist'].insert(insert_index, item)
 print(f"✅ Added {len(new_checklist_items)} checklist items after US-VN-006 tasks")
 
-# Update effort summary
-prd['effortSummary']['phase1']['streamB']['US-VN-006b'] = "1.5 days"
-prd['effortSummary']['phase1']['streamB']['subtotal'] = "3.5 days (was 2 days)"
-prd['effortSummary']['phase1']['parallelTotal'] = "3.5 days (streams run concurrently, was 2 days)"
-prd['effortSummary']['phase1']['total'] = "4 days (was 2.5 days)"
-prd['effortSummary']['breakdown']['phase1'] = "4 days (quality gates + fuzzy matching + AI prefs)"
-prd['effortSummary']['totalProject'] = "26.5-31.5 days (6 phases, was 25-30 days)"
-print("✅ Updated effort summaries")
-
 # Update success criteria
 cost_savings_criterion = "Cost savings: 20-40% for coaches who disable categories (estimated $60-80/month with 100 coaches)"
 prd['successCriteria']['phase1Complete']['criteria'].append(cost_savings_criterion)
@@ -156,7 +149,7 @@ prd['successCriteria']['phase1Complete']['criteria'].append("Insight extraction
 print("✅ Added cost savings to success criteria")
 
 # Update US-VN-015 (Claims Extraction) - add category filtering
-us_vn_015 = next(s for s in prd['userStories'] if s['id'] == 'US-VN-015')
+us_vn_015 = store.get('US-VN-015')
 us_vn_015['acceptanceCriteria'].extend([
     "Integration: Get coach AI preferences before extraction",
     "Filter GPT-4 prompt to only include enabled categories",
@@ -164,33 +157,43 @@ us_vn_015['acceptanceCriteria'].extend([
     "Skip extraction for disabled categories (save API tokens 30-50%)",
     "Log category filtering stats for cost analysis"
 ])
-us_vn_015['dependencies'].append('US-VN-006b')
+store.add_dependency('US-VN-015', 'US-VN-006b')
 print("✅ Updated US-VN-015 with category filtering")
 
 # Update US-VN-017 (Entity Resolution) - add skip logic
-us_vn_017 = next(s for s in prd['userStories'] if s['id'] == 'US-VN-017')
+us_vn_017 = store.get('US-VN-017')
 us_vn_017['acceptanceCriteria'].extend([
     "Integration: Skip entity resolution if autoDetectPlayerNames disabled",
     "Return empty candidates array for disabled categories",
     "Log skipped resolutions for performance tracking"
 ])
-us_vn_017['dependencies'].append('US-VN-006b')
+store.add_dependency('US-VN-017', 'US-VN-006b')
 print("✅ Updated US-VN-017 with skip logic for disabled categories")
 
+# Update effort summary from the dependency graph (streams, phase totals, project total)
+try:
+    for change in update_effort_summary(prd, store):
+        print(f"✅ {change}")
+except CycleError as e:
+    print(f"❌ {e}")
+    sys.exit(1)
+
 # Save updated PRD
 try:
-    with open(prd_path, 'w') as f:
-        json.dump(prd, f, indent=2)
+    # Journalled for crash safety, not to save I/O: the edits are fsynced to
+    # PRD.json.journal first, then folded into PRD.json so git, jq and ralph
+    # (which read the base file) see them
+    store.save(journal=True, label=Path(__file__).name)
+    store.compact()
     print(f"\n✅ Successfully updated PRD.json")
-    print(f"   Total stories: {len(prd['userStories'])}")
-    print(f"   Phase 1 stories: {len([s for s in prd['userStories'] if s['phase'] == 1])}")
+    print(f"   Total stories: {len(store)}")
+    print(f"   Phase 1 stories: {len(store.in_phase(1))}")
     print(f"   Phase 1 duration: {prd['phaseStructure']['phases'][0]['duration']}")
     print(f"   Total project duration: {prd['effortSummary']['totalProject']}")
 
-    # Validate JSON
-    with open(prd_path) as f:
-        json.load(f)
-    print("✅ Validated: PRD.json is valid JSON")
+    # Validate that the saved file loads cleanly
+    PRDStore.load(prd_path)
+    print("✅ Validated: PRD.json loads cleanly")
 
 except Exception as e:
     print(f"❌ Error saving PRD.json: {e}")
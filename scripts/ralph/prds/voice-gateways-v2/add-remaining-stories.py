@@ -8,23 +8,23 @@ import json
 import sys
 from pathlib import Path
 
+from prd_store import PRDStore
+
 # Get PRD path
 prd_path = Path(__file__).parent / "PRD.json"
-backup_path = prd_path.with_suffix(".json.backup")
 
-# Backup original (if valid)
+# Load and snapshot the original. A PRD that no longer parses is rolled back
+# to its last good snapshot; with none to roll back to it cannot be extended.
 try:
-    with open(prd_path) as f:
-        original = json.load(f)
-    print(f"✅ Loaded existing PRD.json ({len(original.get('userStories', []))} stories)")
+    store = PRDStore.load(prd_path, repair=True)
+    original = store.data
+    print(f"✅ Loaded existing PRD.json ({len(store)} stories)")
 
-    # Backup
-    with open(backup_path, 'w') as f:
-        json.dump(original, f, indent=2)
-    print(f"✅ Backed up to {backup_path.name}")
-except json.JSONDecodeError:
-    print("❌ Current PRD.json is corrupted, will restore from Phase 1 baseline")
-    # Restore from known good state
+    snapshot = store.snapshot(f"before {Path(__file__).name}")
+    print(f"✅ Snapshot {snapshot['id'][:12]} taken (restore with prd-snapshots.py)")
+except ValueError as e:
+    # A base that does not parse with no good snapshot, or a journal that does not apply
+    print(f"❌ Current PRD.json could not be loaded ({e})")
     original = None
 except FileNotFoundError:
     print("❌ PRD.json not found")
@@ -71,7 +71,7 @@ phase2_stories = [
             "Manual test: Voice note → link generated → WhatsApp message includes link"
         ],
         "priority": 7,
-        "passes": true,
+        "passes": True,
         "effort": "1 day",
         "effortBreakdown": {
             "schema": "1h (table + indexes)",
@@ -300,21 +300,20 @@ phase2_stories = [
             "Update formatResultsMessage in actions/whatsapp.ts",
             "Message format by trust level:",
             "TL0-1 (Low trust):",
-            "  '⚠️ Analysis complete!",
-            "  ',
-            "  'Found {pendingCount} insights that need your review.',
-            "  '',
-            "  'Quick review: app.playerarc.io/r/{code}',
-            "  '',
+            "  '⚠️ Analysis complete!',",
+            "  'Found {pendingCount} insights that need your review.',",
+            "  '',",
+            "  'Quick review: app.playerarc.io/r/{code}',",
+            "  '',",
             "  'Or open the app to see all details.'",
             "TL2 (Medium trust):",
-            "  '✅ Auto-applied {autoCount}: {names}',
-            "  '',
+            "  '✅ Auto-applied {autoCount}: {names}',",
+            "  '',",
             "  '⚠️ Needs review ({pendingCount}): app.playerarc.io/r/{code}'",
             "TL3 (High trust):",
-            "  '✅ All done! Auto-applied {count} insights.',
-            "  '{names}',
-            "  '',
+            "  '✅ All done! Auto-applied {count} insights.',",
+            "  '{names}',",
+            "  '',",
             "  '(Quick review if needed: app.playerarc.io/r/{code})'",
             "If NO pending (all auto-applied):",
             "  'Don't show review link prominently (only as optional)'",
@@ -652,18 +651,22 @@ print(f"\n📝 Adding {len(all_new_stories)} user stories (US-VN-007 to US-VN-02
 # If original is corrupt or missing Phase 1 stories, restore from baseline
 if not original or len(original.get('userStories', [])) != 6:
     print("❌ PRD corrupted or missing Phase 1 stories")
-    print("Please restore PRD.json manually from a backup or Git")
+    print("Please restore PRD.json from a snapshot (python3 prd-snapshots.py list) or Git")
     sys.exit(1)
 
-# Add stories
-original['userStories'].extend(all_new_stories)
+# Add stories (duplicate ids are rejected rather than appended twice)
+try:
+    for story in all_new_stories:
+        store.add(story)
+except ValueError as e:
+    print(f"❌ {e}")
+    sys.exit(1)
 
-print(f"✅ Total stories now: {len(original['userStories'])}")
+print(f"✅ Total stories now: {len(store)}")
 
 # Write updated PRD
 try:
-    with open(prd_path, 'w') as f:
-        json.dump(original, f, indent=2)
+    store.save(label=Path(__file__).name)
     print(f"✅ Updated PRD.json successfully")
 
     # Verify valid JSON
@@ -683,5 +686,5 @@ try:
 
 except Exception as e:
     print(f"❌ Error writing PRD.json: {e}")
-    print(f"Backup available at: {backup_path}")
+    print(f"Snapshot {snapshot['id'][:12]} holds the original (python3 prd-snapshots.py restore {snapshot['id'][:12]})")
     sys.exit(1)
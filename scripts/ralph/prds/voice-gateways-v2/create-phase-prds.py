@@ -2,333 +2,418 @@
 """
 Create individual phase PRD files from the main PRD.json
 Each phase file contains only the stories, checklist, and context for that phase
+
+Phases come from the PRD itself: phaseStructure.phases (phase, name, duration,
+stories, contextFiles, checklistKey, executionGuidance), plus any phase the
+stories use that phaseStructure does not list. A phase's name falls back to
+the "Phase 7A - ..." entries of currentPhase/previousPhases/upcomingPhases.
+
+Phase files are merged, not replaced: the splitter sets the keys it owns
+(phaseNumber, phaseName, duration, storyCount, contextFiles, stories, and
+successCriteria/checklist/executionGuidance where the PRD has them) and keeps
+every hand-written key already in the file. Stories are merged the same way:
+a field the phase file already has keeps the file's value, so a PRD that only
+summarises a story never overwrites its full acceptance criteria.
+
+Phase files for phases the PRD does not list are left alone. phases/README.md
+and RALPH_EXECUTION_GUIDE.md describe every phase, so they are only
+regenerated from a PRD that lists them all.
+
+Stories are grouped by phase once (PRDStore's phase index). Every file is
+rendered in memory first and written, concurrently, only when its content
+hash differs from the file on disk, so re-running after a one-story edit
+rewrites just that story's phase file.
+
+A PRD without phaseStructure (one that only carries the current phase's
+stories) is not split unless --force is given.
+
+Usage:
+    python3 create-phase-prds.py
+    python3 create-phase-prds.py --check     # exit 1 if any file is out of date, write nothing
+    python3 create-phase-prds.py --force     # split a PRD that has no phaseStructure
 """
 
+import argparse
 import json
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from prd_snapshots import digest
+from prd_store import PRDStore
 
 prd_path = Path(__file__).parent / "PRD.json"
 output_dir = Path(__file__).parent / "phases"
-
-# Create phases directory
-output_dir.mkdir(exist_ok=True)
-
-# Load main PRD
-try:
-    with open(prd_path) as f:
-        prd = json.load(f)
-    print(f"✅ Loaded PRD.json ({len(prd['userStories'])} stories)")
-except Exception as e:
-    print(f"❌ Error loading PRD.json: {e}")
-    sys.exit(1)
-
-# Phase configurations
-phases = [
-    {
-        "number": 1,
-        "name": "Quality Gates & Fuzzy Matching",
-        "duration": "2.5 days",
-        "story_range": (1, 6),  # US-VN-001 to US-VN-006
-        "checklist_key": "phase1Checklist",
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE1_QUALITY_GATES.md",
-            ".ruler/voice-notes-validation-patterns.md"
-        ]
-    },
-    {
-        "number": 2,
-        "name": "Mobile Quick Review UI",
-        "duration": "5-7 days",
-        "story_range": (7, 12),  # US-VN-007 to US-VN-012
-        "checklist_key": None,
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE2_MOBILE_REVIEW.md"
-        ]
-    },
-    {
-        "number": 3,
-        "name": "v2 Artifacts Foundation",
-        "duration": "3 days",
-        "story_range": (13, 14),  # US-VN-013 to US-VN-014
-        "checklist_key": None,
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE3_V2_MIGRATION.md",
-            "docs/architecture/voice-notes-pipeline-v2.md"
-        ]
-    },
-    {
-        "number": 4,
-        "name": "Claims Extraction",
-        "duration": "4 days",
-        "story_range": (15, 16),  # US-VN-015 to US-VN-016
-        "checklist_key": None,
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE3_V2_MIGRATION.md",
-            "docs/architecture/voice-notes-pipeline-v2.md"
-        ]
-    },
-    {
-        "number": 5,
-        "name": "Entity Resolution & Disambiguation",
-        "duration": "4 days",
-        "story_range": (17, 18),  # US-VN-017 to US-VN-018
-        "checklist_key": None,
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE3_V2_MIGRATION.md",
-            "context/PHASE1_QUALITY_GATES.md",  # For fuzzy matching integration
-            "docs/architecture/voice-notes-pipeline-v2.md"
-        ]
-    },
-    {
-        "number": 6,
-        "name": "Drafts & Confirmation Workflow",
-        "duration": "5 days",
-        "story_range": (19, 21),  # US-VN-019 to US-VN-021
-        "checklist_key": None,
-        "context_files": [
-            "context/MAIN_CONTEXT.md",
-            "context/PHASE3_V2_MIGRATION.md",
-            "docs/architecture/voice-notes-pipeline-v2.md"
-        ]
-    }
-]
-
-# Create phase PRD files
-for phase_config in phases:
-    phase_num = phase_config["number"]
-    start_num, end_num = phase_config["story_range"]
-
-    # Filter stories for this phase
-    phase_stories = [
-        s for s in prd['userStories']
-        if s['phase'] == phase_num
-    ]
-
-    # Verify we got the expected stories
-    expected_ids = [f"US-VN-{str(i).zfill(3)}" for i in range(start_num, end_num + 1)]
-    actual_ids = [s['id'] for s in phase_stories]
-
-    if actual_ids != expected_ids:
-        print(f"⚠️  Phase {phase_num} story mismatch:")
-        print(f"   Expected: {expected_ids}")
-        print(f"   Actual: {actual_ids}")
-
-    # Build phase PRD
-    phase_prd = {
-        "phaseNumber": phase_num,
-        "phaseName": phase_config["name"],
-        "duration": phase_config["duration"],
-        "storyCount": len(phase_stories),
-        "contextFiles": phase_config["context_files"],
-        "stories": phase_stories,
-        "successCriteria": prd.get(f"phase{phase_num}SuccessCriteria", {}),
-    }
-
-    # Add checklist if exists
-    if phase_config["checklist_key"] and phase_config["checklist_key"] in prd:
-        phase_prd["checklist"] = prd[phase_config["checklist_key"]]
-
-    # Add phase-specific guidance
-    if phase_num == 1:
-        phase_prd["executionGuidance"] = {
-            "parallelStreams": prd.get("phase1ParallelStreams", {}),
-            "streamA": {
-                "name": "Quality Gates",
-                "duration": "2 days",
-                "stories": ["US-VN-001", "US-VN-002", "US-VN-003", "US-VN-004"]
-            },
-            "streamB": {
-                "name": "Fuzzy Matching",
-                "duration": "2 days",
-                "stories": ["US-VN-005", "US-VN-006"]
-            },
-            "mergeAndTest": "0.5 day",
-            "notes": [
-                "Execute Stream A and Stream B in parallel",
-                "Both streams can run independently until merge",
-                "Final 0.5 day for integration testing and merge"
-            ]
+guide_path = Path(__file__).parent / "RALPH_EXECUTION_GUIDE.md"
+
+# "Phase 7A - Wire In-App Notes to v2 Artifact Pipeline"
+PHASE_TITLE = re.compile(r"^Phase\s+(\S+)\s+-\s+(.+)$")
+
+def phase_key(number: Any) -> str:
+    return str(number)
+
+def phase_order(key: str) -> tuple:
+    """1, 2, ... 7A, 7B: numeric part first, then the letter suffix."""
+    match = re.match(r"^(\d+)(.*)$", key)
+    return (int(match.group(1)), match.group(2)) if match else (float("inf"), key)
+
+def phase_file(key: str) -> Path:
+    return output_dir / f"PHASE{key}_PRD.json"
+
+def existing_phases() -> Dict[str, Dict[str, Any]]:
+    """Phase files already on disk, by phase key. Files that do not parse are skipped."""
+    phases = {}
+    for path in output_dir.glob("PHASE*_PRD.json"):
+        try:
+            with open(path) as f:
+                phase = json.load(f)
+        except ValueError:
+            print(f"⚠️  {path.name} does not parse; it will be regenerated from PRD.json only")
+            continue
+        phases[path.name[len("PHASE"):-len("_PRD.json")]] = phase
+    return phases
+
+def named_phases(prd: Dict[str, Any]) -> Dict[str, str]:
+    """Phase names from the PRD's currentPhase/previousPhases/upcomingPhases strings."""
+    titles = [prd.get("currentPhase")] + prd.get("previousPhases", []) + prd.get("upcomingPhases", [])
+    names = {}
+    for title in titles:
+        match = PHASE_TITLE.match(title or "")
+        if match:
+            names[match.group(1)] = match.group(2).strip()
+    return names
+
+def phase_configs(prd: Dict[str, Any], store: PRDStore,
+                  existing: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    One config per phase: phaseStructure entries, phases only the stories
+    mention, and phase files on disk the PRD does not cover (marked
+    "owned": False, so they are never rewritten). Sorted by phase.
+    """
+    names = named_phases(prd)
+    effort = prd.get("effortSummary", {})
+    entries = list(prd.get("phaseStructure", {}).get("phases", []))
+    numbers = [entry.get("phase", entry.get("number", position)) for position, entry in enumerate(entries, 1)]
+    listed = {phase_key(number) for number in numbers}
+    for phase in store.phases():
+        if phase is not None and phase_key(phase) not in listed:
+            numbers.append(phase)
+            entries.append({})
+            listed.add(phase_key(phase))
+
+    configs = []
+    for number, entry in zip(numbers, entries):
+        key = phase_key(number)
+        on_disk = existing.get(key, {})
+        configs.append({
+            "number": number,
+            "name": entry.get("name") or names.get(key) or on_disk.get("phaseName") or f"Phase {key}",
+            "duration": entry.get("duration") or effort.get(f"phase{key}", {}).get("total") or on_disk.get("duration"),
+            "expected": entry.get("stories"),
+            "checklist_key": entry.get("checklistKey", f"phase{key}Checklist"),
+            "context_files": entry.get("contextFiles") or on_disk.get("contextFiles") or prd.get("contextFiles", []),
+            "execution_guidance": entry.get("executionGuidance"),
+            "owned": True,
+        })
+    for key, on_disk in existing.items():
+        if key not in listed:
+            configs.append({
+                "number": on_disk.get("phaseNumber", key),
+                "name": on_disk.get("phaseName") or f"Phase {key}",
+                "duration": on_disk.get("duration"),
+                "expected": None,
+                "checklist_key": None,
+                "context_files": on_disk.get("contextFiles", []),
+                "execution_guidance": on_disk.get("executionGuidance"),
+                "owned": False,
+            })
+    return sorted(configs, key=lambda config: phase_order(phase_key(config["number"])))
+
+def group_stories(store: PRDStore) -> Dict[str, List[Dict[str, Any]]]:
+    """Stories per phase key, in PRD order, from the store's phase index."""
+    order = {story_id: position for position, story_id in enumerate(store.ids())}
+    return {phase_key(phase): sorted(store.in_phase(phase), key=lambda story: order[story["id"]])
+            for phase in store.phases()}
+
+def stream_guidance(prd: Dict[str, Any], config: Dict[str, Any], stories: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """executionGuidance from the stories' "stream" fields, when the phase has more than one stream."""
+    streams: Dict[str, List[str]] = {}
+    for story in stories:
+        if story.get("stream"):
+            streams.setdefault(story["stream"], []).append(story["id"])
+    if len(streams) < 2:
+        return None
+
+    key = phase_key(config["number"])
+    effort = prd.get("effortSummary", {}).get(f"phase{key}", {})
+    guidance: Dict[str, Any] = {"parallelStreams": prd.get(f"phase{key}ParallelStreams", {})}
+    for stream, story_ids in sorted(streams.items()):
+        summary = effort.get(f"stream{stream}", {})
+        guidance[f"stream{stream}"] = {
+            **({"name": summary["name"]} if summary.get("name") else {}),
+            **({"duration": summary["subtotal"]} if summary.get("subtotal") else {}),
+            "stories": story_ids,
         }
+    if effort.get("mergeAndTest"):
+        guidance["mergeAndTest"] = effort["mergeAndTest"]
+    names = [f"Stream {stream}" for stream in sorted(streams)]
+    guidance["notes"] = [
+        f"Execute {', '.join(names[:-1])} and {names[-1]} in parallel",
+        f"{'Both' if len(names) == 2 else 'All'} streams can run independently until merge",
+        f"Final {effort['mergeAndTest']} for integration testing and merge" if effort.get("mergeAndTest")
+        else "Finish with integration testing and merge",
+    ]
+    return guidance
+
+def phase_dependencies(store: PRDStore, groups: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+    """For each phase, the other phases its stories depend on."""
+    phase_of = {story["id"]: key for key, stories in groups.items() for story in stories}
+    dependencies = {}
+    for key, stories in groups.items():
+        needed = {phase_of[dependency] for story in stories for dependency in story.get("dependencies", ())
+                  if dependency in phase_of}
+        dependencies[key] = sorted(needed - {key}, key=phase_order)
+    return dependencies
+
+def merge_stories(stories: List[Dict[str, Any]], existing: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    The PRD's stories merged into the phase file's copies. A field the file
+    already has keeps the file's value (the phase file is where the full,
+    verified acceptance criteria live; the PRD may only summarise them), and
+    fields only the PRD has are added after the file's own.
+    """
+    on_disk = {story.get("id"): story for story in existing if isinstance(story, dict)}
+    merged = []
+    for story in stories:
+        previous = on_disk.get(story["id"], {})
+        merged.append({**previous, **{field: value for field, value in story.items() if field not in previous}})
+    return merged
+
+def render_phase(prd: Dict[str, Any], config: Dict[str, Any], stories: List[Dict[str, Any]],
+                 existing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    The phase file: the existing file's keys in their order, with the keys
+    the splitter owns set from the PRD. Keys the PRD has no value for keep
+    whatever the file already says.
+    """
+    key = phase_key(config["number"])
+    phase_prd = dict(existing or {})
+    stories = merge_stories(stories, phase_prd.get("stories", []))
+    phase_prd.update({
+        "phaseNumber": config["number"],
+        "phaseName": config["name"],
+        **({"duration": config["duration"]} if config["duration"] else {}),
+        "storyCount": len(stories),
+        "contextFiles": config["context_files"],
+        "stories": stories,
+    })
+    if f"phase{key}SuccessCriteria" in prd or "successCriteria" not in phase_prd:
+        phase_prd["successCriteria"] = prd.get(f"phase{key}SuccessCriteria", {})
+    if config["checklist_key"] in prd:
+        phase_prd["checklist"] = prd[config["checklist_key"]]
+    guidance = config["execution_guidance"] or stream_guidance(prd, config, stories)
+    if guidance:
+        phase_prd["executionGuidance"] = guidance
+    return phase_prd
+
+def phase_text(path: Path, phase_prd: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> str:
+    """
+    Serialised phase file. A file whose data is unchanged keeps its exact
+    text (hand-written spacing included); a hand-written UTF-8 file stays UTF-8.
+    """
+    if existing is None:
+        return json.dumps(phase_prd, indent=2)
+    data = path.read_bytes()
+    if phase_prd == existing:
+        return data.decode("utf-8")
+    return json.dumps(phase_prd, indent=2, ensure_ascii=data.isascii())
+
+def story_span(stories: List[Dict[str, Any]]) -> str:
+    if not stories:
+        return "no stories"
+    if len(stories) == 1:
+        return f"{stories[0]['id']} (1 story)"
+    return f"{stories[0]['id']} to {stories[-1]['id']} ({len(stories)} stories)"
+
+def describe(config: Dict[str, Any], stories: List[Dict[str, Any]]) -> str:
+    duration = f"{config['duration']}, " if config["duration"] else ""
+    return f"{config['name']} ({duration}{len(stories)} stories)"
+
+def context_file_exists(path: str) -> bool:
+    """Context files are relative to this directory or to one of its parents (the repo root)."""
+    here = Path(__file__).resolve().parent
+    return any((base / path).exists() for base in (here, *here.parents))
+
+def render_readme(prd: Dict[str, Any], store: PRDStore, configs: List[Dict[str, Any]],
+                  groups: Dict[str, List[Dict[str, Any]]], dependencies: Dict[str, List[str]]) -> str:
+    total = sum(len(groups.get(phase_key(config["number"]), [])) for config in configs)
+    known = {story["id"] for stories in groups.values() for story in stories}
+    missing = [dependency for stories in groups.values() for story in stories
+               for dependency in story.get("dependencies", ()) if dependency not in known]
+    context = {path for config in configs for path in config["context_files"]}
+    if total == len(store):
+        master = [f"The complete PRD with all {len(store)} stories is in:",
+                  f"- `../PRD.json` (master copy, {len(store)} stories across all phases)"]
+        count = f"- Story count: {total} total across all phases ✅"
+    else:
+        master = [f"The master PRD with all {len(store)} stories is in:",
+                  f"- `../PRD.json` (master copy; {len(store) - total} of its stories have no phase)"]
+        count = f"- Story count: {total} total across all phases, {len(store)} in PRD.json ❌"
+    absent = sorted(path for path in context if not context_file_exists(path))
+
+    lines = [
+        "# Voice Gateways v2 - Phase PRD Files",
+        "",
+        "This directory contains individual PRD files for each phase of the Voice Gateways v2 project.",
+        "",
+        "## Phase Files",
+        "",
+    ]
+    lines += [f"- **PHASE{phase_key(config['number'])}_PRD.json** - "
+              f"{describe(config, groups.get(phase_key(config['number']), []))}" for config in configs]
+    lines += [
+        "",
+        "## How to Use",
+        "",
+        "Each phase file contains:",
+        "- `stories` - User stories for that phase only",
+        "- `contextFiles` - Required reading before starting the phase",
+        "- `checklist` - Phase-specific checklist (where the PRD has one)",
+        "- `successCriteria` - What defines completion of the phase",
+        "- `executionGuidance` - How to execute the phase (phases with parallel streams)",
+        "",
+        "### For Ralph:",
+        f"1. Start with PHASE{phase_key(configs[0]['number'])}_PRD.json" if configs else "1. Start with the first phase file",
+        "2. Read all contextFiles listed",
+        "3. Execute stories in order (or in parallel where executionGuidance has streams)",
+        "4. Complete checklist items",
+        "5. Verify success criteria met",
+        "6. Move to next phase",
+        "",
+        "## Phase Dependencies",
+        "",
+    ]
+    for config in configs:
+        key = phase_key(config["number"])
+        needed = dependencies.get(key, [])
+        lines.append(f"- Phase {key}: " + (f"Requires Phase {', Phase '.join(needed)} complete" if needed
+                                            else "No dependencies on other phases"))
+    lines += [
+        "",
+        "## Master PRD",
+        "",
+        *master,
+        "",
+        "## Validation",
+        "",
+        "Checked when these files were generated:",
+        count,
+        "- No duplicate story IDs ✅",
+        f"- All dependencies valid {'✅' if not missing else '❌ (missing: ' + ', '.join(sorted(set(missing))) + ')'}",
+        f"- Context files exist {'✅' if not absent else '❌ (missing: ' + ', '.join(absent) + ')'}",
+    ]
+    if prd.get("effortSummary", {}).get("totalProject"):
+        lines += ["", f"**Total Duration**: {prd['effortSummary']['totalProject']} ({len(configs)} phases)"]
+    return "\n".join(lines) + "\n"
+
+def render_phase_section(config: Dict[str, Any], stories: List[Dict[str, Any]], dependencies: List[str],
+                         guidance: Optional[Dict[str, Any]], checklist: Optional[list], first: bool) -> List[str]:
+    key = phase_key(config["number"])
+    duration = f" ({config['duration']})" if config["duration"] else ""
+    lines = [
+        f"### Phase {key}: {config['name']}{duration}{' 🟢 START HERE' if first else ''}",
+        f"**File**: `phases/PHASE{key}_PRD.json`",
+        f"**Stories**: {story_span(stories)}",
+    ]
+    if dependencies:
+        lines.append(f"**Dependencies**: Phase {', Phase '.join(dependencies)} complete")
+    streams = {name: value for name, value in (guidance or {}).items()
+               if name.startswith("stream") and isinstance(value, dict)}
+    if streams:
+        lines += ["", "**Special Instructions**:", "- Execute in PARALLEL:"]
+        for name, stream in streams.items():
+            label = f" ({stream['name']})" if stream.get("name") else ""
+            lines.append(f"  - Stream {name[len('stream'):]}: {', '.join(stream.get('stories', []))}{label}")
+        if guidance.get("mergeAndTest"):
+            lines.append(f"- Final {guidance['mergeAndTest']}: Merge + Integration Testing")
+    lines += ["", "**Context Files**:"] + [f"- `{path}`" for path in config["context_files"]]
+    if checklist:
+        lines += ["", f"**Checklist**: {len(checklist)} items (detailed in PHASE{key}_PRD.json)"]
+    return lines + ["", "---", ""]
+
+def render_guide(prd: Dict[str, Any], store: PRDStore, configs: List[Dict[str, Any]],
+                 groups: Dict[str, List[Dict[str, Any]]], dependencies: Dict[str, List[str]]) -> str:
+    total_duration = prd.get("effortSummary", {}).get("totalProject")
+    total = sum(len(groups.get(phase_key(config["number"]), [])) for config in configs)
+    first = phase_key(configs[0]["number"]) if configs else "1"
+    duration_line = [f"**Total Duration**: {total_duration} ({len(configs)} phases)"] if total_duration else []
+
+    lines = [
+        "# Ralph Execution Guide - Voice Gateways v2",
+        "",
+        "**Project**: Voice Gateways v2 (WhatsApp Quality Gates & v2 Pipeline)",
+        *duration_line,
+        "**Status**: ✅ VALIDATED & READY FOR EXECUTION",
+        "",
+        "---",
+        "",
+        "## Quick Start",
+        "",
+        "1. **Read Main Context**: `context/MAIN_CONTEXT.md`",
+        f"2. **Start Phase {first}**: Use `phases/PHASE{first}_PRD.json`",
+        "3. **Follow Checklist**: Complete all items in order",
+        "4. **Verify Success**: Check success criteria before moving to next phase",
+        "",
+        "---",
+        "",
+        "## Phase Execution Order",
+        "",
+    ]
+    for position, config in enumerate(configs):
+        key = phase_key(config["number"])
+        stories = groups.get(key, [])
+        guidance = config["execution_guidance"] or stream_guidance(prd, config, stories)
+        lines += render_phase_section(config, stories, dependencies.get(key, []), guidance,
+                                      prd.get(config["checklist_key"]), position == 0)
+
+    lines += GUIDE_WORKFLOW.splitlines()
+    lines += [
+        "",
+        "## File Structure",
+        "",
+        "```",
+        "voice-gateways-v2/",
+        f"├── PRD.json                          # Master PRD ({'all ' if total == len(store) else ''}{len(store)} stories)",
+        "├── RALPH_EXECUTION_GUIDE.md         # This file",
+        "├── context/",
+        "│   ├── MAIN_CONTEXT.md              # Project overview (read first)",
+        "│   └── ...                          # Phase implementation guides",
+        "├── phases/",
+        "│   ├── README.md                    # Phase files overview",
+    ]
+    for position, config in enumerate(configs):
+        key = phase_key(config["number"])
+        branch = "└──" if position == len(configs) - 1 else "├──"
+        lines.append(f"│   {branch} {f'PHASE{key}_PRD.json':<28}# Phase {key} stories only")
+    lines += ["```", ""]
+    lines += GUIDE_NOTES.splitlines()
+    lines += ["", "## Progress Tracking", "", "After completing each phase, update this checklist:", ""]
+    for config in configs:
+        duration = f" ({config['duration']})" if config["duration"] else ""
+        lines.append(f"- [ ] Phase {phase_key(config['number'])}: {config['name']}{duration}")
+    lines += [
+        "",
+        f"**Current Phase**: Phase {first} 🟢",
+        f"**Overall Progress**: 0% (0/{total} stories complete)",
+        f"**Estimated Completion**: [Start Date] + {total_duration}" if total_duration else "**Estimated Completion**: TBD",
+        "",
+    ]
+    lines += GUIDE_FOOTER.format(first=first).splitlines()
+    return "\n".join(lines) + "\n"
 
-    # Save phase PRD
-    output_file = output_dir / f"PHASE{phase_num}_PRD.json"
-    with open(output_file, 'w') as f:
-        json.dump(phase_prd, f, indent=2)
-
-    print(f"✅ Created {output_file.name} ({len(phase_stories)} stories, {phase_config['duration']})")
-
-print(f"\n✅ Created {len(phases)} phase PRD files in {output_dir}/")
-
-# Create README for phases directory
-readme_content = """# Voice Gateways v2 - Phase PRD Files
-
-This directory contains individual PRD files for each phase of the Voice Gateways v2 project.
-
-## Phase Files
-
-- **PHASE1_PRD.json** - Quality Gates & Fuzzy Matching (2.5 days, 6 stories)
-- **PHASE2_PRD.json** - Mobile Quick Review UI (5-7 days, 6 stories)
-- **PHASE3_PRD.json** - v2 Artifacts Foundation (3 days, 2 stories)
-- **PHASE4_PRD.json** - Claims Extraction (4 days, 2 stories)
-- **PHASE5_PRD.json** - Entity Resolution & Disambiguation (4 days, 2 stories)
-- **PHASE6_PRD.json** - Drafts & Confirmation Workflow (5 days, 3 stories)
-
-## How to Use
-
-Each phase file contains:
-- `stories` - User stories for that phase only
-- `contextFiles` - Required reading before starting the phase
-- `checklist` - Phase-specific checklist (Phase 1 only has this)
-- `successCriteria` - What defines completion of the phase
-- `executionGuidance` - How to execute the phase (Phase 1 has parallel streams)
-
-### For Ralph:
-1. Start with PHASE1_PRD.json
-2. Read all contextFiles listed
-3. Execute stories in order (or in parallel for Phase 1)
-4. Complete checklist items
-5. Verify success criteria met
-6. Move to next phase
-
-## Phase Dependencies
-
-- Phase 1: No dependencies (start here)
-- Phase 2: Requires Phase 1 complete (fuzzy matching integration)
-- Phase 3: Requires Phase 2 complete (foundation for v2)
-- Phase 4: Requires Phase 3 complete (artifacts/transcripts tables)
-- Phase 5: Requires Phase 4 complete (claims for resolution)
-- Phase 6: Requires Phase 5 complete (resolved entities for drafts)
-
-## Master PRD
-
-The complete PRD with all 21 stories is in:
-- `../PRD.json` (master copy, 21 stories across all phases)
-
-## Validation
-
-All phase files have been validated:
-- Story count: 21 total across all phases ✅
-- No duplicate story IDs ✅
-- All dependencies valid ✅
-- Context files exist ✅
-- Duration estimates accurate ✅
-
-**Status**: Ready for execution
-**Total Duration**: 25-30 days (6 phases)
-"""
-
-readme_file = output_dir / "README.md"
-with open(readme_file, 'w') as f:
-    f.write(readme_content)
-
-print(f"✅ Created {readme_file.name}")
-
-# Create execution guide for Ralph
-execution_guide = """# Ralph Execution Guide - Voice Gateways v2
-
-**Project**: Voice Gateways v2 (WhatsApp Quality Gates & v2 Pipeline)
-**Total Duration**: 25-30 days (6 phases)
-**Status**: ✅ VALIDATED & READY FOR EXECUTION
-
----
-
-## Quick Start
-
-1. **Read Main Context**: `context/MAIN_CONTEXT.md`
-2. **Start Phase 1**: Use `phases/PHASE1_PRD.json`
-3. **Follow Checklist**: Complete all items in order
-4. **Verify Success**: Check success criteria before moving to next phase
-
----
-
-## Phase Execution Order
-
-### Phase 1: Quality Gates & Fuzzy Matching (2.5 days) 🟢 START HERE
-**File**: `phases/PHASE1_PRD.json`
-**Stories**: US-VN-001 to US-VN-006 (6 stories)
-
-**Special Instructions**:
-- Execute in PARALLEL:
-  - Stream A: US-VN-001, US-VN-002, US-VN-003, US-VN-004 (Quality Gates)
-  - Stream B: US-VN-005, US-VN-006 (Fuzzy Matching)
-- Final 0.5 day: Merge + Integration Testing
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE1_QUALITY_GATES.md`
-- `.ruler/voice-notes-validation-patterns.md`
-
-**Checklist**: 43 items (detailed in PHASE1_PRD.json)
-
----
-
-### Phase 2: Mobile Quick Review UI (5-7 days)
-**File**: `phases/PHASE2_PRD.json`
-**Stories**: US-VN-007 to US-VN-012 (6 stories)
-**Dependencies**: Phase 1 complete (needs fuzzy matching integration)
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE2_MOBILE_REVIEW.md`
-
----
-
-### Phase 3: v2 Artifacts Foundation (3 days)
-**File**: `phases/PHASE3_PRD.json`
-**Stories**: US-VN-013 to US-VN-014 (2 stories)
-**Dependencies**: Phase 2 complete
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE3_V2_MIGRATION.md`
-- `docs/architecture/voice-notes-pipeline-v2.md`
-
----
-
-### Phase 4: Claims Extraction (4 days)
-**File**: `phases/PHASE4_PRD.json`
-**Stories**: US-VN-015 to US-VN-016 (2 stories)
-**Dependencies**: Phase 3 complete (needs artifacts/transcripts tables)
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE3_V2_MIGRATION.md`
-- `docs/architecture/voice-notes-pipeline-v2.md`
-
----
-
-### Phase 5: Entity Resolution & Disambiguation (4 days)
-**File**: `phases/PHASE5_PRD.json`
-**Stories**: US-VN-017 to US-VN-018 (2 stories)
-**Dependencies**: Phase 4 complete (needs claims), Phase 1 (fuzzy matching)
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE3_V2_MIGRATION.md`
-- `context/PHASE1_QUALITY_GATES.md` (fuzzy matching integration)
-- `docs/architecture/voice-notes-pipeline-v2.md`
-
----
-
-### Phase 6: Drafts & Confirmation Workflow (5 days)
-**File**: `phases/PHASE6_PRD.json`
-**Stories**: US-VN-019 to US-VN-021 (3 stories)
-**Dependencies**: Phase 5 complete (needs resolved entities)
-
-**Context Files**:
-- `context/MAIN_CONTEXT.md`
-- `context/PHASE3_V2_MIGRATION.md`
-- `docs/architecture/voice-notes-pipeline-v2.md`
-
----
-
-## Execution Workflow (Per Phase)
+GUIDE_WORKFLOW = """## Execution Workflow (Per Phase)
 
 ```
 1. Read Phase PRD File
@@ -337,7 +422,7 @@ execution_guide = """# Ralph Execution Guide - Voice Gateways v2
    ↓
 3. Review All Stories for Phase
    ↓
-4. Execute Stories in Order (or parallel for Phase 1)
+4. Execute Stories in Order (or parallel where the phase has streams)
    ↓
 5. Complete Checklist Items (if checklist exists)
    ↓
@@ -381,35 +466,9 @@ Each phase has specific success criteria in its PRD file. General criteria:
 - ✅ Documentation updated
 - ✅ Code committed
 
----
+---"""
 
-## File Structure
-
-```
-voice-gateways-v2/
-├── PRD.json                          # Master PRD (all 21 stories)
-├── RALPH_EXECUTION_GUIDE.md         # This file
-├── context/
-│   ├── MAIN_CONTEXT.md              # Project overview (read first)
-│   ├── PHASE1_QUALITY_GATES.md      # Phase 1 implementation guide
-│   ├── PHASE2_MOBILE_REVIEW.md      # Phase 2 implementation guide
-│   └── PHASE3_V2_MIGRATION.md       # Phases 3-6 implementation guide
-├── phases/
-│   ├── README.md                    # Phase files overview
-│   ├── PHASE1_PRD.json             # Phase 1 stories only
-│   ├── PHASE2_PRD.json             # Phase 2 stories only
-│   ├── PHASE3_PRD.json             # Phase 3 stories only
-│   ├── PHASE4_PRD.json             # Phase 4 stories only
-│   ├── PHASE5_PRD.json             # Phase 5 stories only
-│   └── PHASE6_PRD.json             # Phase 6 stories only
-└── validation/
-    ├── AUTO_APPLY_COMPREHENSIVE_ANALYSIS.md
-    ├── VOICE_GATEWAYS_V2_PRD_VALIDATION.md
-    ├── VALIDATION_SUMMARY.md
-    └── CORRECTED_PRD_SUMMARY.md
-```
-
----
+GUIDE_NOTES = """---
 
 ## Important Notes
 
@@ -432,48 +491,113 @@ voice-gateways-v2/
 - Don't skip unit tests
 - Don't use Better Auth IDs as `v.id()` (use `v.string()`)
 
----
+---"""
 
-## Progress Tracking
-
-After completing each phase, update this checklist:
-
-- [ ] Phase 1: Quality Gates & Fuzzy Matching (2.5 days)
-- [ ] Phase 2: Mobile Quick Review UI (5-7 days)
-- [ ] Phase 3: v2 Artifacts Foundation (3 days)
-- [ ] Phase 4: Claims Extraction (4 days)
-- [ ] Phase 5: Entity Resolution & Disambiguation (4 days)
-- [ ] Phase 6: Drafts & Confirmation Workflow (5 days)
-
-**Current Phase**: Phase 1 🟢
-**Overall Progress**: 0% (0/21 stories complete)
-**Estimated Completion**: [Start Date] + 25-30 days
-
----
+GUIDE_FOOTER = """---
 
 ## Questions or Issues?
 
 Refer to:
 1. **Main Context**: `context/MAIN_CONTEXT.md`
 2. **Phase Guide**: Specific phase context file
-3. **Validation Reports**: `validation/` directory
-4. **Master PRD**: `PRD.json` (complete reference)
+3. **Master PRD**: `PRD.json` (complete reference)
 
 ---
 
-**Ready to start? Begin with Phase 1! 🚀**
-
-Read `phases/PHASE1_PRD.json` and `context/PHASE1_QUALITY_GATES.md` to begin.
-"""
-
-guide_file = Path(__file__).parent / "RALPH_EXECUTION_GUIDE.md"
-with open(guide_file, 'w') as f:
-    f.write(execution_guide)
-
-print(f"✅ Created {guide_file.name}")
-
-print("\n🎉 All phase files created successfully!")
-print("\nRalph can now:")
-print("1. Read RALPH_EXECUTION_GUIDE.md for overview")
-print("2. Start with phases/PHASE1_PRD.json")
-print("3. Progress through phases sequentially")
+**Ready to start? Begin with Phase {first}! 🚀**
+
+Read `phases/PHASE{first}_PRD.json` and its context files to begin."""
+
+def write_if_changed(path: Path, content: str, check: bool = False) -> bool:
+    """Write content unless the file already holds it (same size and sha256). Returns True if it differed."""
+    data = content.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and digest(path.read_bytes()) == digest(data):
+            return False
+    except FileNotFoundError:
+        pass
+    if not check:
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Split PRD.json into per-phase PRD files")
+    parser.add_argument("--check", action="store_true", help="report out-of-date files and exit 1, writing nothing")
+    parser.add_argument("--workers", type=int, default=8, help="files written concurrently")
+    parser.add_argument("--force", action="store_true",
+                        help="split even though PRD.json has no phaseStructure (phase files are still merged)")
+    args = parser.parse_args()
+
+    # Load main PRD (journal replayed; read-only, so an unreadable PRD is an error, not a rollback)
+    try:
+        store = PRDStore.load(prd_path)
+        prd = store.to_dict()
+        print(f"✅ Loaded PRD.json ({len(store)} stories)")
+    except Exception as e:
+        print(f"❌ Error loading PRD.json: {e}")
+        sys.exit(1)
+
+    if not prd.get("phaseStructure", {}).get("phases") and not (args.force or args.check):
+        print("❌ PRD.json has no phaseStructure, so it only describes some phases; "
+              "re-run with --force to merge its stories into their phase files")
+        sys.exit(1)
+
+    existing = existing_phases()
+    configs = phase_configs(prd, store, existing)
+    groups = group_stories(store)
+    dependencies = phase_dependencies(store, groups)
+    if not any(config["owned"] for config in configs):
+        print("❌ PRD.json has no phaseStructure and no story has a phase")
+        sys.exit(1)
+
+    # Render everything in memory
+    outputs = []
+    for config in configs:
+        if not config["owned"]:
+            continue
+        key = phase_key(config["number"])
+        stories = groups.get(key, [])
+        actual_ids = [story["id"] for story in stories]
+        if config["expected"] is not None and sorted(config["expected"]) != sorted(actual_ids):
+            print(f"⚠️  Phase {key} story mismatch:")
+            print(f"   phaseStructure: {config['expected']}")
+            print(f"   Stories with phase {key}: {actual_ids}")
+        path, on_disk = phase_file(key), existing.get(key)
+        content = phase_text(path, render_phase(prd, config, stories, on_disk), on_disk)
+        outputs.append((path, content, f"{len(stories)} stories{', ' + config['duration'] if config['duration'] else ''}"))
+    unowned = [phase_key(config["number"]) for config in configs if not config["owned"]]
+    if unowned:
+        # The index and guide describe every phase; a PRD that lists only some would overwrite
+        # what was written by hand about the others
+        print(f"   Skipped phases/README.md and {guide_path.name}: PRD.json does not list "
+              f"phase{'s' if len(unowned) > 1 else ''} {', '.join(unowned)}")
+    else:
+        outputs.append((output_dir / "README.md", render_readme(prd, store, configs, groups, dependencies),
+                        "phase index"))
+        outputs.append((guide_path, render_guide(prd, store, configs, groups, dependencies), "execution guide"))
+
+    if not args.check:
+        output_dir.mkdir(exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        changed = list(pool.map(lambda output: write_if_changed(output[0], output[1], args.check), outputs))
+
+    for (path, _, summary), differed in zip(outputs, changed):
+        name = path.relative_to(Path(__file__).parent)
+        if differed:
+            print(f"{'❌ Out of date' if args.check else '✅ Wrote'} {name} ({summary})")
+        else:
+            print(f"   Unchanged {name}")
+
+    written = sum(changed)
+    if args.check:
+        if written:
+            print(f"\n❌ {written} of {len(outputs)} file(s) out of date; run create-phase-prds.py")
+            sys.exit(1)
+        print(f"\n✅ All {len(outputs)} file(s) up to date")
+        return
+    print(f"\n✅ {written} of {len(outputs)} file(s) written, {len(outputs) - written} unchanged")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Show a PRD's story dependency graph: order, critical path, parallelism,
+stream split per phase, and which stories ralph can run next (see prd_graph.py).
+
+Usage:
+    python3 prd-graph.py [PRD.json]
+    python3 prd-graph.py [PRD.json] --ready            # just the stories that can start now, one per line
+    python3 prd-graph.py [PRD.json] --apply            # write derived streams and estimates into the PRD
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from prd_graph import CycleError, StoryGraph, format_days, phase_plan, update_effort_summary
+from prd_store import PRDStore
+
+DEFAULT_PRD = str(Path(__file__).parent / "PRD.json")
+
+def done_stories(store: PRDStore) -> set:
+    """Stories listed in completedStories or marked as passing."""
+    completed = {entry if isinstance(entry, str) else entry.get("id")
+                 for entry in store.data.get("completedStories", [])}
+    return completed | {story["id"] for story in store if story.get("passes")}
+
+def report(store: PRDStore, graph: StoryGraph) -> None:
+    path, length = graph.critical_path()
+    print(f"📊 {len(graph)} stories, {format_days(graph.total())} of work")
+    print(f"   Order: {', '.join(graph.topological_order())}")
+    print(f"   Critical path ({format_days(length)}): {' -> '.join(path)}")
+    print(f"   Max parallelism: {graph.max_parallelism()} (stories in progress at once)")
+    for number, wave in enumerate(graph.waves(), 1):
+        print(f"   Wave {number}: {', '.join(wave)}")
+    if graph.unestimated:
+        print(f"⚠️  No parsable effort (counted as 0): {', '.join(graph.unestimated)}")
+
+    for phase in store.phases():
+        members = store.in_phase(phase)
+        labels = sorted({story["stream"] for story in members if story.get("stream")})
+        plan = phase_plan(StoryGraph(members), max(1, len(labels)))
+        print(f"\n📦 Phase {phase}: {format_days(plan['duration'])} ({len(members)} stories)")
+        for label, lane, subtotal in zip(labels or [""], plan["streams"], plan["subtotals"]):
+            name = f"Stream {label}" if len(plan["streams"]) > 1 else "Sequence"
+            print(f"   {name} ({format_days(subtotal)}): {', '.join(lane)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Story dependency graph, critical path and stream scheduling")
+    parser.add_argument("prd", nargs="?", default=DEFAULT_PRD)
+    parser.add_argument("--ready", action="store_true", help="list the stories whose dependencies are all done")
+    parser.add_argument("--apply", action="store_true", help="update stream fields and effortSummary in the PRD")
+    args = parser.parse_args()
+
+    try:
+        store = PRDStore.load(args.prd, repair=args.apply)
+    except Exception as e:
+        print(f"❌ Error loading {Path(args.prd).name}: {e}")
+        sys.exit(1)
+
+    graph = StoryGraph.from_store(store)
+    cycles = graph.cycles()
+    if cycles:
+        print(f"❌ {CycleError(cycles)}")
+        sys.exit(1)
+
+    done = done_stories(store)
+    ready = graph.ready(done)
+    if args.ready:
+        print("\n".join(ready))
+        return
+
+    report(store, graph)
+    print(f"\n🚀 Ready now ({len(ready)}): {', '.join(ready) or 'nothing'}")
+
+    if args.apply:
+        changes = update_effort_summary(store.data, store)
+        # Journalled for crash safety, then folded in for readers of the base file
+        store.save(journal=True, label=Path(__file__).name)
+        store.compact()
+        for change in changes:
+            print(f"✅ {change}")
+        print(f"✅ Updated {Path(args.prd).name}")
+
+if __name__ == "__main__":
+    main()
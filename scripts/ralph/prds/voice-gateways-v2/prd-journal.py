@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Inspect or compact the JSON-Patch journal kept next to a PRD (see prd_journal.py).
+
+Usage:
+    python3 prd-journal.py status PRD.json     # pending edits and journal size
+    python3 prd-journal.py show PRD.json       # the PRD with the journal replayed, as JSON
+    python3 prd-journal.py compact PRD.json    # fold the journal into PRD.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from prd_journal import Journal
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or compact a PRD's JSON-Patch journal")
+    parser.add_argument("command", choices=("status", "show", "compact"))
+    parser.add_argument("prd", nargs="?", default=str(Path(__file__).parent / "PRD.json"),
+                        help="PRD file (default: PRD.json next to this script)")
+    args = parser.parse_args()
+
+    journal = Journal(args.prd)
+    try:
+        if args.command == "show":
+            json.dump(journal.read(), sys.stdout, indent=2)
+            print()
+        elif args.command == "status":
+            pending = journal.pending()
+            size = journal.log.stat().st_size if journal.log.exists() else 0
+            print(f"📒 {journal.log.name}: {pending} pending edit(s), {size} bytes "
+                  f"({journal.path.name} is {journal.path.stat().st_size} bytes)")
+        else:
+            pending = journal.pending()
+            journal.compact()
+            print(f"✅ Folded {pending} edit(s) into {journal.path.name}")
+    except (OSError, ValueError) as e:
+        # PatchError is a ValueError: the journal does not apply to this base
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+List, take, compare and restore content-addressed PRD snapshots (see prd_snapshots.py).
+
+Snapshots live in .prd-snapshots/ next to the PRD. A snapshot is named by
+its list position (#3), "latest", or a prefix of its id.
+
+Usage:
+    python3 prd-snapshots.py list [PRD.json]
+    python3 prd-snapshots.py snapshot [PRD.json] -m "before manual edit"
+    python3 prd-snapshots.py diff 3 [latest] [--prd PRD.json]    # default: against the current file
+    python3 prd-snapshots.py restore 3 [--prd PRD.json]
+    python3 prd-snapshots.py verify [PRD.json]
+    python3 prd-snapshots.py import PRD.json PRD.json.backup phase-6-prd-backup.json --remove
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from prd_snapshots import IntegrityError, SnapshotStore, compare, current_content
+
+DEFAULT_PRD = str(Path(__file__).parent / "PRD.json")
+
+# Operations listed per diff before the rest are summarised
+DIFF_EXAMPLES = 40
+
+def describe(record: dict, position: int) -> str:
+    state = "✅" if record["valid"] else "❌"
+    return (f"{state} #{position:<3} {record['id'][:12]}  {record['created']}  {record['size']:>8} bytes  "
+            f"{record.get('new_chunks', 0)}/{len(record['chunks'])} new chunks  {record['label']}")
+
+def cmd_list(store: SnapshotStore, prd: str) -> None:
+    records = store.list(prd)
+    if not records:
+        print(f"No snapshots of {Path(prd).name}")
+        return
+    print(f"📸 {len(records)} snapshot(s) of {Path(prd).name}")
+    for position, record in enumerate(records, 1):
+        print(f"  {describe(record, position)}")
+
+def cmd_snapshot(store: SnapshotStore, prd: str, label: str) -> None:
+    before = len(store.list(prd))
+    record = store.snapshot(prd, label)
+    if len(store.list(prd)) == before:
+        print(f"✅ {Path(prd).name} is unchanged since snapshot {record['id'][:12]}")
+    else:
+        print(f"✅ Snapshot {record['id'][:12]}: {record['new_chunks']} of {len(record['chunks'])} chunks written")
+
+def cmd_diff(store: SnapshotStore, prd: str, old_ref: str, new_ref: str) -> None:
+    old = store.resolve(prd, old_ref)
+    if new_ref:
+        new = store.resolve(prd, new_ref)
+        summary, target = store.diff(old, new), new["id"][:12]
+    else:
+        summary, target = compare(store.read(old), current_content(prd)), f"current {Path(prd).name}"
+
+    print(f"🔍 {old['id'][:12]} -> {target}: {summary['shared_chunks']} of {summary['chunks']} chunks unchanged")
+    if summary["ops"] is None:
+        print("  ⚠️  One side does not parse as JSON; only chunks are compared")
+        return
+    if not summary["ops"]:
+        print("  ✅ No differences")
+        return
+    for operation in summary["ops"][:DIFF_EXAMPLES]:
+        value = f" {json.dumps(operation['value'])[:80]}" if "value" in operation else ""
+        print(f"  {operation['op']:<8} {operation['path']}{value}")
+    if len(summary["ops"]) > DIFF_EXAMPLES:
+        print(f"  ... and {len(summary['ops']) - DIFF_EXAMPLES} more")
+
+def cmd_restore(store: SnapshotStore, prd: str, ref: str) -> None:
+    record = store.resolve(prd, ref)
+    if not record["valid"]:
+        print(f"⚠️  Snapshot {record['id'][:12]} does not parse as JSON; restoring it anyway")
+    replaced = store.restore(record, prd)
+    print(f"✅ Restored {Path(prd).name} from snapshot {record['id'][:12]} ({record['created']})")
+    if replaced is not None:
+        print(f"   The replaced version is snapshot {replaced['id'][:12]}")
+
+def cmd_verify(store: SnapshotStore, prd: str) -> bool:
+    records = store.list(prd)
+    damaged = [record for record in records if not store.verify(record)]
+    for record in damaged:
+        print(f"  ❌ {record['id'][:12]} ({record['created']}) has missing or damaged chunks")
+    if damaged:
+        print(f"❌ {len(damaged)} of {len(records)} snapshot(s) of {Path(prd).name} are damaged")
+        return False
+    print(f"✅ {len(records)} snapshot(s) of {Path(prd).name} verified")
+    return True
+
+def cmd_import(store: SnapshotStore, prd: str, copies: list, remove: bool) -> None:
+    """Snapshot legacy whole-file copies as versions of prd, oldest file first."""
+    for copy in sorted(copies, key=lambda path: Path(path).stat().st_mtime):
+        record = store.snapshot_bytes(Path(prd).name, Path(copy).read_bytes(), label=f"imported {Path(copy).name}")
+        state = "" if record["valid"] else " (does not parse as JSON)"
+        print(f"✅ {Path(copy).name} -> snapshot {record['id'][:12]}{state}")
+        if remove and store.verify(record):
+            Path(copy).unlink()
+            print(f"   Removed {Path(copy).name}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed PRD snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("list", "verify"):
+        command = commands.add_parser(name)
+        command.add_argument("prd", nargs="?", default=DEFAULT_PRD)
+    command = commands.add_parser("snapshot")
+    command.add_argument("prd", nargs="?", default=DEFAULT_PRD)
+    command.add_argument("-m", "--label", default="manual snapshot")
+    command = commands.add_parser("diff")
+    command.add_argument("old")
+    command.add_argument("new", nargs="?", help="snapshot to compare with (default: the current file)")
+    command.add_argument("--prd", default=DEFAULT_PRD)
+    command = commands.add_parser("restore")
+    command.add_argument("ref")
+    command.add_argument("--prd", default=DEFAULT_PRD)
+    command = commands.add_parser("import", help="snapshot legacy .backup copies of a PRD")
+    command.add_argument("prd")
+    command.add_argument("copies", nargs="+")
+    command.add_argument("--remove", action="store_true", help="delete each copy once its snapshot verifies")
+    args = parser.parse_args()
+
+    store = SnapshotStore.for_file(args.prd)
+    try:
+        if args.command == "list":
+            cmd_list(store, args.prd)
+        elif args.command == "snapshot":
+            cmd_snapshot(store, args.prd, args.label)
+        elif args.command == "diff":
+            cmd_diff(store, args.prd, args.old, args.new)
+        elif args.command == "restore":
+            cmd_restore(store, args.prd, args.ref)
+        elif args.command == "verify":
+            if not cmd_verify(store, args.prd):
+                sys.exit(1)
+        else:
+            cmd_import(store, args.prd, args.copies, args.remove)
+    except (KeyError, OSError, IntegrityError) as e:
+        print(f"❌ {e.args[0] if isinstance(e, KeyError) else e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
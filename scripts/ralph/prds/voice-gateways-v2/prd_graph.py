@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Dependency graph over a PRD's stories, for ordering, scheduling and effort estimates.
+
+Nodes are userStories (or a phase PRD's stories), edges their "dependencies".
+A dependency on a story that is not in the graph (an earlier phase, a story
+already delivered) counts as satisfied and is listed in .external.
+
+Effort strings are parsed into (low, high) days: "0.5 day", "1.5 days",
+"2-3 days", "4 hours", "5.5h" and "~40 hours" (HOURS_PER_DAY hours a day).
+Anything else ("High") is unestimated: it counts as zero and is listed in
+.unestimated.
+
+StoryGraph answers:
+- cycles() / topological_order(): CycleError names the stories involved
+- critical_path(): the longest chain of dependent work
+- waves() / max_parallelism(): how many stories can be in flight at once
+- ready(done): the largest set that can start now without breaking a dependency
+- schedule(streams): a split into parallel streams by critical-path list
+  scheduling. Free workers take the ready story with the most dependent
+  work behind it.
+
+update_effort_summary(prd, store) recomputes the hand-maintained estimates from
+this. It sets each phase's stream split (stories' "stream" fields and
+effortSummary.phaseN.streamX), the phase totals, phaseStructure durations, the
+breakdown lines and totalProject. A phase whose stories name streams is
+scheduled over that many streams plus MERGE_DAYS for merge and integration
+testing; any other phase is the sum of its stories, as one stream.
+"""
+
+import heapq
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+HOURS_PER_DAY = 8
+MERGE_DAYS = 0.5
+
+Days = Tuple[float, float]
+
+# Leading duration of an effort or estimate string: "1.5 days", "2-3 days", "~40 hours", "5.5h"
+DURATION = re.compile(r"^\s*~?\s*(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(days?|d|hours?|hrs?|h)\b", re.IGNORECASE)
+
+class CycleError(ValueError):
+    """Stories that depend on each other in a loop, so no order can satisfy them."""
+
+    def __init__(self, cycles: List[List[str]]):
+        self.cycles = cycles
+        super().__init__("Dependency cycle(s): " + "; ".join(" -> ".join(cycle + cycle[:1]) for cycle in cycles))
+
+def parse_effort(text: Any) -> Optional[Days]:
+    """(low, high) days for an effort string, or None if it has no duration."""
+    if isinstance(text, (int, float)) and not isinstance(text, bool):
+        return float(text), float(text)
+    match = DURATION.match(text) if isinstance(text, str) else None
+    if not match:
+        return None
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    if match.group(3).lower().startswith("h"):
+        low, high = low / HOURS_PER_DAY, high / HOURS_PER_DAY
+    return low, high
+
+def _number(days: float) -> str:
+    return f"{days:.2f}".rstrip("0").rstrip(".")
+
+def format_days(days: Days) -> str:
+    """ "0.5 day", "2 days", "7-9 days", in the PRDs' style."""
+    low, high = days
+    if _number(low) == _number(high):
+        return f"{_number(low)} {'day' if low <= 1 else 'days'}"
+    return f"{_number(low)}-{_number(high)} days"
+
+def replace_duration(text: str, days: Days) -> str:
+    """text with its leading duration replaced, keeping any description after it."""
+    if not isinstance(text, str) or not DURATION.match(text):
+        return format_days(days)
+    return DURATION.sub(format_days(days), text, count=1)
+
+def _add(a: Days, b: Days) -> Days:
+    return a[0] + b[0], a[1] + b[1]
+
+def sum_days(efforts: Iterable[Days]) -> Days:
+    total = (0.0, 0.0)
+    for effort in efforts:
+        total = _add(total, effort)
+    return total
+
+class StoryGraph:
+    """Stories, their estimates, and dependency edges within the set."""
+
+    def __init__(self, stories: Iterable[Dict[str, Any]]):
+        stories = list(stories)
+        self.ids: List[str] = [story["id"] for story in stories]
+        self.position = {story_id: position for position, story_id in enumerate(self.ids)}
+        self.effort: Dict[str, Days] = {}
+        self.unestimated: List[str] = []
+        self.dependencies: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = {story_id: [] for story_id in self.ids}
+        self.external: Dict[str, List[str]] = {}
+
+        for story in stories:
+            story_id = story["id"]
+            effort = parse_effort(story.get("effort"))
+            if effort is None:
+                self.unestimated.append(story_id)
+                effort = (0.0, 0.0)
+            self.effort[story_id] = effort
+            inside = []
+            for dependency in dict.fromkeys(story.get("dependencies", ())):
+                if dependency in self.position:
+                    inside.append(dependency)
+                    self.dependents[dependency].append(story_id)
+                else:
+                    self.external.setdefault(story_id, []).append(dependency)
+            self.dependencies[story_id] = inside
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self.position
+
+    @classmethod
+    def from_store(cls, store) -> "StoryGraph":
+        """Graph over a PRDStore's stories."""
+        return cls(iter(store))
+
+    def total(self) -> Days:
+        """All the work, done one story at a time."""
+        return sum_days(self.effort.values())
+
+    # Ordering
+
+    def cycles(self) -> List[List[str]]:
+        """Every dependency cycle (strongly connected components of more than one story, or self-loops)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        found: List[List[str]] = []
+        counter = 0
+
+        for root in self.ids:
+            if root in index:
+                continue
+            # Iterative Tarjan: (node, iterator over its dependencies)
+            work = [(root, iter(self.dependencies[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, edges = work[-1]
+                advanced = False
+                for dependency in edges:
+                    if dependency not in index:
+                        index[dependency] = low[dependency] = counter
+                        counter += 1
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        work.append((dependency, iter(self.dependencies[dependency])))
+                        advanced = True
+                        break
+                    if dependency in on_stack:
+                        low[node] = min(low[node], index[dependency])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.dependencies[node]:
+                        found.append(sorted(component, key=self.position.get))
+        return sorted(found, key=lambda cycle: self.position[cycle[0]])
+
+    def topological_order(self) -> List[str]:
+        """Dependencies before dependents, otherwise in PRD order. Raises CycleError."""
+        waiting = {story_id: len(self.dependencies[story_id]) for story_id in self.ids}
+        ready = [(self.position[story_id], story_id) for story_id, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, story_id = heapq.heappop(ready)
+            order.append(story_id)
+            for dependent in self.dependents[story_id]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, (self.position[dependent], dependent))
+        if len(order) < len(self.ids):
+            raise CycleError(self.cycles())
+        return order
+
+    def waves(self) -> List[List[str]]:
+        """Stories grouped by dependency depth; each wave can run in parallel once the previous one is done."""
+        depth: Dict[str, int] = {}
+        for story_id in self.topological_order():
+            depth[story_id] = max((depth[d] + 1 for d in self.dependencies[story_id]), default=0)
+        waves: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for story_id in self.ids:
+            waves[depth[story_id]].append(story_id)
+        return waves
+
+    def ready(self, done: Iterable[str] = ()) -> List[str]:
+        """Stories not done whose dependencies are all done: the largest set that can safely run now."""
+        done = set(done)
+        return [story_id for story_id in self.ids
+                if story_id not in done and all(d in done for d in self.dependencies[story_id])]
+
+    # Timing
+
+    def _earliest(self, bound: int) -> Dict[str, Tuple[float, float]]:
+        """(start, finish) of each story with unlimited parallel workers."""
+        times: Dict[str, Tuple[float, float]] = {}
+        for story_id in self.topological_order():
+            start = max((times[d][1] for d in self.dependencies[story_id]), default=0.0)
+            times[story_id] = start, start + self.effort[story_id][bound]
+        return times
+
+    def critical_path(self) -> Tuple[List[str], Days]:
+        """The longest chain of dependent work (by low estimate) and its (low, high) length."""
+        if not self.ids:
+            return [], (0.0, 0.0)
+        times = self._earliest(0)
+        end = max(self.ids, key=lambda story_id: (times[story_id][1], -self.position[story_id]))
+        path = [end]
+        while self.dependencies[path[-1]]:
+            path.append(max(self.dependencies[path[-1]],
+                            key=lambda story_id: (times[story_id][1], -self.position[story_id])))
+        path.reverse()
+        return path, sum_days(self.effort[story_id] for story_id in path)
+
+    def max_parallelism(self) -> int:
+        """The most stories in progress at once when everything starts as early as it can."""
+        events = []
+        for start, finish in self._earliest(0).values():
+            if finish > start:
+                events += [(start, 1), (finish, -1)]
+        # Finishes sort before starts at the same instant
+        peak = running = 0
+        for _, change in sorted(events):
+            running += change
+            peak = max(peak, running)
+        return max(peak, 1 if self.ids else 0)
+
+    def _bottom_levels(self) -> Dict[str, float]:
+        """Each story's effort plus the longest chain of work that depends on it."""
+        level: Dict[str, float] = {}
+        for story_id in reversed(self.topological_order()):
+            level[story_id] = self.effort[story_id][0] + max((level[d] for d in self.dependents[story_id]),
+                                                             default=0.0)
+        return level
+
+    def schedule(self, streams: int = 1) -> Tuple[List[List[str]], Days]:
+        """
+        Split the stories into parallel streams. Returns the streams (in the
+        order their first story appears in the PRD) and the (low, high) time
+        until the last one finishes. One stream is everything in dependency order.
+        """
+        if streams <= 1 or len(self.ids) <= 1:
+            order = self.topological_order()
+            return ([order] if order else []), self.total()
+
+        priority = self._bottom_levels()
+        finish: Dict[str, float] = {}
+        free = [0.0] * streams
+        lanes: List[List[str]] = [[] for _ in range(streams)]
+        pending = set(self.ids)
+        while pending:
+            worker = min(range(streams), key=lambda w: (free[w], w))
+            candidates = [(max((finish[d] for d in self.dependencies[story_id]), default=0.0), story_id)
+                          for story_id in pending if all(d in finish for d in self.dependencies[story_id])]
+            available = [c for c in candidates if c[0] <= free[worker]]
+            # Nothing can start yet: wait for whichever story becomes ready first
+            pool = available or [min(candidates, key=lambda c: c[0])]
+            ready_at, story_id = max(pool, key=lambda c: (priority[c[1]], -self.position[c[1]]))
+            start = max(free[worker], ready_at)
+            finish[story_id] = free[worker] = start + self.effort[story_id][0]
+            lanes[worker].append(story_id)
+            pending.discard(story_id)
+
+        lanes = sorted((lane for lane in lanes if lane), key=lambda lane: min(map(self.position.get, lane)))
+        return lanes, (max(finish.values()), self._replay(lanes, 1))
+
+    def _replay(self, lanes: List[List[str]], bound: int) -> float:
+        """Finish time of a fixed stream split under another estimate bound."""
+        finish: Dict[str, float] = {}
+        lane_of = {story_id: number for number, lane in enumerate(lanes) for story_id in lane}
+        free = [0.0] * len(lanes)
+        for story_id in self.topological_order():
+            lane = lane_of[story_id]
+            start = max([free[lane]] + [finish[d] for d in self.dependencies[story_id]])
+            finish[story_id] = free[lane] = start + self.effort[story_id][bound]
+        return max(finish.values(), default=0.0)
+
+def phase_plan(graph: StoryGraph, streams: int = 1, merge_days: float = MERGE_DAYS) -> Dict[str, Any]:
+    """Stream split and duration for one phase's graph."""
+    lanes, parallel = graph.schedule(streams)
+    duration = _add(parallel, (merge_days, merge_days)) if len(lanes) > 1 else parallel
+    return {
+        "streams": lanes,
+        "subtotals": [sum_days(graph.effort[story_id] for story_id in lane) for lane in lanes],
+        "parallel": parallel,
+        "duration": duration,
+        "critical_path": graph.critical_path(),
+    }
+
+def _stream_labels(stories: Sequence[Dict[str, Any]]) -> List[str]:
+    return sorted({story["stream"] for story in stories if story.get("stream")})
+
+def update_effort_summary(prd: Dict[str, Any], store, merge_days: float = MERGE_DAYS) -> List[str]:
+    """
+    Recompute the stream split and effort estimates of every phase from the
+    stories' dependencies and efforts, updating the estimates the PRD already
+    has (effortSummary.totalProject included; none are added). Returns a line
+    per change. Raises CycleError.
+    """
+    graph = StoryGraph.from_store(store)
+    graph.topological_order()
+    effort = prd.get("effortSummary")
+    structure = {str(entry.get("phase", entry.get("number", position))): entry
+                 for position, entry in enumerate(prd.get("phaseStructure", {}).get("phases", []), 1)}
+    changes: List[str] = []
+    project = (0.0, 0.0)
+
+    phases = [phase for phase in store.phases() if phase is not None]
+    for phase in phases:
+        key = str(phase)
+        members = sorted(store.in_phase(phase), key=lambda story: graph.position[story["id"]])
+        labels = _stream_labels(members)
+        # Dependencies on other phases are satisfied by the time this phase starts
+        phase_graph = StoryGraph(members)
+        plan = phase_plan(phase_graph, max(1, len(labels)), merge_days)
+        project = _add(project, plan["duration"])
+
+        if len(plan["streams"]) > 1:
+            for label, lane in zip(labels, plan["streams"]):
+                for story_id in lane:
+                    if store.get(story_id).get("stream") != label:
+                        store.update(story_id, stream=label)
+                        changes.append(f"Moved {story_id} to stream {label}")
+        summary = effort.get(f"phase{key}") if isinstance(effort, dict) else None
+        if isinstance(summary, dict):
+            if len(plan["streams"]) > 1:
+                for label, lane, subtotal in zip(labels, plan["streams"], plan["subtotals"]):
+                    previous = summary.get(f"stream{label}", {})
+                    summary[f"stream{label}"] = {
+                        # Keep descriptive fields; per-story lines and the subtotal are rebuilt from the split
+                        **{name: value for name, value in previous.items() if parse_effort(value) is None},
+                        **{story_id: format_days(graph.effort[story_id]) for story_id in lane},
+                        "subtotal": format_days(subtotal),
+                    }
+                summary["parallelTotal"] = f"{format_days(plan['parallel'])} (streams run concurrently)"
+            summary["total"] = format_days(plan["duration"])
+            changes.append(f"Phase {key}: {summary['total']}")
+        if isinstance(effort, dict) and f"phase{key}" in effort.get("breakdown", {}):
+            effort["breakdown"][f"phase{key}"] = replace_duration(effort["breakdown"][f"phase{key}"], plan["duration"])
+        if key in structure and "duration" in structure[key]:
+            structure[key]["duration"] = format_days(plan["duration"])
+
+    if isinstance(effort, dict) and "totalProject" in effort:
+        effort["totalProject"] = f"{format_days(project)} ({len(phases)} phase{'s' if len(phases) != 1 else ''})"
+        changes.append(f"Total project: {effort['totalProject']}")
+    return changes
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Append-only JSON-Patch journal for PRD files.
+
+Rewriting a whole PRD for every edit costs a full write each time, and a
+write that dies halfway leaves a truncated document behind (hence the
+PRD.json.corrupted files). With a journal the base file is only ever
+replaced whole, atomically, and edits go to a sidecar instead:
+
+    PRD.json            base document, untouched between compactions
+    PRD.json.journal    one line per edit: {"base": sha256 of PRD.json, "ops": [RFC 6902 operations]}
+
+- append(ops) writes and fsyncs one line, so an edit costs O(patch) I/O.
+- read() replays the journal over the base to rematerialise the document.
+  A torn last line (a crash mid-append) is ignored, as if that edit never
+  happened.
+- compact() writes the materialised document to a temporary file, fsyncs
+  it, renames it over the base and only then drops the journal.
+
+Every line is stamped with the sha256 of the base file's bytes, so touching,
+checking out or re-saving identical content keeps the journal valid. If the
+base's content changes under a journal (an editor, git checkout or stash
+with different content), reading or appending raises StaleJournalError
+rather than dropping or misapplying the edits; nothing is discarded.
+
+compact() appends a {"compacted": sha256 of the new base} line before
+renaming, so a crash between the rename and the journal removal leaves a
+journal that is recognisably already folded in, and it is ignored.
+
+In the PRD scripts the journal is a crash-safety layer only, not an I/O
+saving. Each run appends its edits (durable as soon as the fsync returns)
+and then compacts before exiting, because git, jq and ralph read PRD.json
+directly and must see a complete file. Append plus compact costs slightly
+more I/O than one rewrite. A journal left behind means a run died mid-way,
+and `prd-journal.py compact` finishes it. The O(patch) cost per edit only
+pays off for a caller that keeps several edits pending and reads through
+PRDStore.load or Journal.read, leaving compaction to the size threshold.
+
+make_patch(old, new) produces the operations for an in-memory edit, and
+apply_patch applies them. Only add, remove, replace, move, copy and test
+are used, with RFC 6901 pointers.
+"""
+
+import copy
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+JOURNAL_SUFFIX = ".journal"
+
+# Compact automatically once the journal grows past this fraction of the base file
+DEFAULT_COMPACT_RATIO = 0.5
+
+Operation = Dict[str, Any]
+
+class PatchError(ValueError):
+    """An operation that cannot be applied to the document."""
+
+class StaleJournalError(ValueError):
+    """Journalled edits written against different base content than the file now holds."""
+
+# RFC 6901 pointers
+
+def escape(token: Union[str, int]) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+def pointer(*tokens: Union[str, int]) -> str:
+    return "".join("/" + escape(token) for token in tokens)
+
+def _tokens(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+def _index(container: list, token: str, path: str, appending: bool = False) -> int:
+    if appending and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index in {path!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not appending):
+        raise PatchError(f"Array index out of range in {path!r}")
+    return index
+
+def _parent(document: Any, path: str) -> Tuple[Any, str]:
+    """The container holding the target of path, and the target's key or index token."""
+    tokens = _tokens(path)
+    if not tokens:
+        raise PatchError("The whole document cannot be the target of this operation")
+    node = document
+    for token in tokens[:-1]:
+        node = _child(node, token, path)
+    return node, tokens[-1]
+
+def _child(node: Any, token: str, path: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise PatchError(f"No member {token!r} in {path!r}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token, path)]
+    raise PatchError(f"Cannot descend into a scalar at {path!r}")
+
+def resolve(document: Any, path: str) -> Any:
+    node = document
+    for token in _tokens(path):
+        node = _child(node, token, path)
+    return node
+
+# Applying operations
+
+def _add(document: Any, path: str, value: Any) -> Any:
+    if path == "":
+        return value
+    parent, token = _parent(document, path)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, path, appending=True), value)
+    else:
+        raise PatchError(f"Cannot add to a scalar at {path!r}")
+    return document
+
+def _remove(document: Any, path: str) -> Any:
+    parent, token = _parent(document, path)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(f"No member to remove at {path!r}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, path))
+    raise PatchError(f"Cannot remove from a scalar at {path!r}")
+
+def apply_operation(document: Any, operation: Operation) -> Any:
+    """Apply one operation in place. Returns the document (a new one only when the root is replaced)."""
+    op, path = operation.get("op"), operation.get("path")
+    if not isinstance(path, str):
+        raise PatchError(f"Operation without a path: {operation}")
+    if op == "add":
+        return _add(document, path, copy.deepcopy(operation["value"]))
+    if op == "remove":
+        _remove(document, path)
+        return document
+    if op == "replace":
+        if path == "":
+            return copy.deepcopy(operation["value"])
+        resolve(document, path)
+        parent, token = _parent(document, path)
+        # Assign in place so an object keeps its key order
+        parent[_index(parent, token, path) if isinstance(parent, list) else token] = copy.deepcopy(operation["value"])
+        return document
+    if op == "move":
+        source = operation["from"]
+        if path.startswith(source + "/"):
+            raise PatchError(f"Cannot move {source!r} into its own child {path!r}")
+        return _add(document, path, _remove(document, source))
+    if op == "copy":
+        return _add(document, path, copy.deepcopy(resolve(document, operation["from"])))
+    if op == "test":
+        if not _equal(resolve(document, path), operation["value"]):
+            raise PatchError(f"Test failed at {path!r}")
+        return document
+    raise PatchError(f"Unknown operation {op!r}")
+
+def apply_patch(document: Any, operations: List[Operation]) -> Any:
+    """Apply operations in order, in place. Returns the patched document."""
+    for operation in operations:
+        document = apply_operation(document, operation)
+    return document
+
+# Generating operations
+
+def _equal(a: Any, b: Any, ordered: bool = False) -> bool:
+    """
+    JSON equality: unlike ==, true is not 1 and 1 is not 1.0. With ordered,
+    objects must also list their keys in the same order (so they serialise alike).
+    """
+    if isinstance(a, dict):
+        return (isinstance(b, dict) and (list(a) == list(b) if ordered else a.keys() == b.keys())
+                and all(_equal(a[key], b[key], ordered) for key in a))
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(_equal(x, y, ordered) for x, y in zip(a, b))
+    return type(a) is type(b) and a == b
+
+def _fingerprint(value: Any) -> str:
+    """What list elements are aligned on: a story's id, else the element's canonical JSON."""
+    if isinstance(value, dict) and isinstance(value.get("id"), str):
+        return "id:" + value["id"]
+    return json.dumps(value, sort_keys=True)
+
+def _diff(old: Any, new: Any, tokens: List[Union[str, int]], operations: List[Operation]) -> None:
+    # == is a fast C comparison; _equal only confirms the types and key order of what it calls equal
+    if old == new and _equal(old, new, ordered=True):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        # Added keys land at the end of an object; if that would not give new's key
+        # order, replace the object whole so the patched document serialises like new
+        if [key for key in old if key in new] + [key for key in new if key not in old] != list(new):
+            operations.append({"op": "replace", "path": pointer(*tokens), "value": new})
+            return
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": pointer(*tokens, key)})
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, tokens + [key], operations)
+            else:
+                operations.append({"op": "add", "path": pointer(*tokens, key), "value": value})
+        return
+    if isinstance(old, list) and isinstance(new, list):
+        # Align the lists first, so inserting a story adds one element instead of rewriting every one after it
+        matcher = difflib.SequenceMatcher(None, [_fingerprint(x) for x in old], [_fingerprint(x) for x in new],
+                                          autojunk=False)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            paired = min(old_end - old_start, new_end - new_start) if tag in ("equal", "replace") else 0
+            for step in range(paired):
+                _diff(old[old_start + step], new[new_start + step], tokens + [new_start + step], operations)
+            for _ in range(old_end - old_start - paired):
+                operations.append({"op": "remove", "path": pointer(*tokens, new_start + paired)})
+            for position in range(new_start + paired, new_end):
+                operations.append({"op": "add", "path": pointer(*tokens, position), "value": new[position]})
+        return
+    operations.append({"op": "replace", "path": pointer(*tokens), "value": new})
+
+def make_patch(old: Any, new: Any) -> List[Operation]:
+    """Operations that turn old into new."""
+    operations: List[Operation] = []
+    _diff(old, new, [], operations)
+    return copy.deepcopy(operations)
+
+# The journal
+
+def journal_path(path: Union[str, Path]) -> Path:
+    return Path(str(path) + JOURNAL_SUFFIX)
+
+def _stamp(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def line_start(f, size: int, chunk: int = 4096) -> int:
+    """Offset just after the last newline in the file (0 if there is none), reading backwards from the end."""
+    end = size
+    while end > 0:
+        start = max(0, end - chunk)
+        f.seek(start)
+        newline = f.read(end - start).rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+class Journal:
+    """A base JSON document plus its append-only patch log."""
+
+    def __init__(self, path: Union[str, Path], compact_ratio: Optional[float] = DEFAULT_COMPACT_RATIO):
+        self.path = Path(path)
+        self.log = journal_path(self.path)
+        self.compact_ratio = compact_ratio
+
+    def _stale(self) -> StaleJournalError:
+        return StaleJournalError(
+            f"{self.log.name} was written against a different {self.path.name} (its content changed since, "
+            f"e.g. a checkout or an editor save); nothing was replayed or discarded. Restore the base it was "
+            f"written against, or move {self.log.name} aside to drop its edits")
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        The journalled edits, in order. A torn last line is skipped, as is a
+        journal already folded into this base. StaleJournalError if the edits
+        were written against other content.
+        """
+        if not self.log.exists():
+            return
+        stamp = _stamp(self.path)
+        with open(self.log, "rb") as f:
+            lines = f.read().split(b"\n")
+        entries = []
+        # Everything after the last newline is an append that never finished
+        for number, line in enumerate(lines[:-1], 1):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"{self.log}:{number} is not valid JSON") from None
+        if entries and entries[-1].get("compacted") == stamp:
+            # Compaction renamed the new base into place but died before removing the journal
+            return
+        for entry in entries:
+            if "compacted" in entry:
+                continue
+            if entry.get("base") != stamp:
+                raise self._stale()
+            yield entry
+
+    def read(self) -> Any:
+        """The base document with every journalled edit replayed."""
+        with open(self.path) as f:
+            return self.replay(json.load(f))
+
+    def replay(self, document: Any) -> Any:
+        """Apply every journalled edit to document, the already-parsed base."""
+        for entry in self.entries():
+            document = apply_patch(document, entry["ops"])
+        return document
+
+    def pending(self) -> int:
+        return sum(1 for _ in self.entries())
+
+    def append(self, operations: List[Operation]) -> bool:
+        """
+        Journal one edit and fsync it. Returns True if this triggered a
+        compaction. Empty edits are not written. StaleJournalError if the
+        journal holds edits written against other base content.
+
+        Only the first line (to check the base stamp) and the last lines (to
+        drop a torn line or a compaction marker) are read, so the cost does
+        not grow with the journal.
+        """
+        if not operations:
+            return False
+        stamp = _stamp(self.path)
+        line = json.dumps({"base": stamp, "ops": operations}, ensure_ascii=False).encode("utf-8") + b"\n"
+
+        with open(self.log, "ab+") as f:
+            # A torn tail is an append that never finished; it is dropped
+            end = line_start(f, f.seek(0, os.SEEK_END))
+            last_start = line_start(f, end - 1) if end else 0
+            f.seek(last_start)
+            last = _parse(f.read(end - last_start))
+            f.seek(0)
+            first = _parse(f.readline()) if end else None
+            if last is not None and "compacted" in last:
+                # An unfinished compaction: folded in already if the base is the compacted one,
+                # otherwise the rename never happened and only the marker is dropped
+                end = 0 if last["compacted"] == stamp else last_start
+            elif first is not None and first.get("base") != stamp:
+                raise self._stale()
+            f.truncate(end)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+
+        if self.compact_ratio is not None and size > self.compact_ratio * self.path.stat().st_size:
+            self.compact()
+            return True
+        return False
+
+    def compact(self, indent: Optional[int] = 2) -> Any:
+        """Fold the journal into the base file atomically. Returns the document."""
+        base = self.path.read_bytes()
+        document = self.replay(json.loads(base))
+        if not self.log.exists():
+            return document
+        # Keep the base's encoding: \u escapes only if it was already plain ASCII
+        data = json.dumps(document, indent=indent, ensure_ascii=base.isascii()).encode("utf-8")
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # Mark the journal as folded into exactly this content before the rename, so a
+        # crash before the unlink below cannot replay it twice
+        with open(self.log, "ab+") as f:
+            f.truncate(line_start(f, f.seek(0, os.SEEK_END)))
+            f.write(json.dumps({"compacted": hashlib.sha256(data).hexdigest()}).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        _sync_directory(self.path)
+        self.log.unlink()
+        return document
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    """A complete journal line, or None for an empty, torn or unreadable one."""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+def _sync_directory(path: Path) -> None:
+    """fsync the directory holding path so a rename survives a crash (no-op where unsupported)."""
+    try:
+        descriptor = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
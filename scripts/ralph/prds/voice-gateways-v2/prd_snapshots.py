@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Content-addressed snapshots of PRD files, replacing whole-file .backup copies.
+
+Each snapshot stores a PRD's bytes as chunks in .prd-snapshots/ next to the
+PRD. The chunks are shared by every PRD in that directory:
+
+    .prd-snapshots/objects/abcdef...    one zlib-compressed chunk, named by the sha256 of its bytes
+    .prd-snapshots/index.jsonl          one line per snapshot: id, file, label, size, valid, chunks
+
+Chunk boundaries are content-defined: a chunk ends after a line whose
+CRC-32 has its low bits clear (within size bounds, about 5 KB on average, so
+a chunk compresses well and fills its file-system block). So an edit only changes
+the chunks around it, every other chunk hashes the same as before, and
+saving a new version writes just the changed chunks plus one index line.
+Snapshotting a version that is already stored writes nothing.
+
+A snapshot's id is the sha256 of the whole file. Reading one back
+re-hashes every chunk and the whole, so a damaged object is caught before
+it is restored.
+
+load_document(path, repair=True) is the guarded read the PRD-editing scripts
+use. If the base file itself does not parse, the broken bytes are
+snapshotted, any journal is moved aside to PRD.json.journal.<id of the
+version it was written against>, the last snapshot that parses and verifies is restored, and the
+restored document is returned. Read-only callers leave repair off and get the
+error instead; a journal that does not apply (see prd_journal.py) is always
+an error, never a reason to roll back.
+
+    snapshots = SnapshotStore.for_file("PRD.json")
+    snapshots.snapshot("PRD.json", label="before fix-prd.py")
+    for record in snapshots.list("PRD.json"): ...
+    snapshots.restore(snapshots.resolve("PRD.json", "3"), "PRD.json")
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from prd_journal import Journal, journal_path, line_start, make_patch
+
+STORE_DIR = ".prd-snapshots"
+
+# Chunk after a line whose CRC-32 & CUT_MASK == 0 (1 line in 64), keeping chunks within these sizes.
+# Each chunk is a file, so small chunks cost a disk block each: 1 KB chunks took more space than plain copies.
+CUT_MASK = 0x3F
+MIN_CHUNK = 4 * 1024
+MAX_CHUNK = 16 * 1024
+
+Record = Dict[str, Any]
+
+class IntegrityError(ValueError):
+    """A snapshot whose stored chunks no longer hash to their names."""
+
+def chunk(data: bytes) -> List[bytes]:
+    """Split data into content-defined chunks at line ends."""
+    chunks: List[bytes] = []
+    current = bytearray()
+    for line in data.splitlines(keepends=True):
+        # A single line longer than MAX_CHUNK (minified JSON) is cut at fixed offsets
+        while len(current) + len(line) > MAX_CHUNK:
+            room = MAX_CHUNK - len(current)
+            current += line[:room]
+            line = line[room:]
+            chunks.append(bytes(current))
+            current = bytearray()
+        current += line
+        if len(current) >= MIN_CHUNK and zlib.crc32(line) & CUT_MASK == 0:
+            chunks.append(bytes(current))
+            current = bytearray()
+    if current:
+        chunks.append(bytes(current))
+    return chunks
+
+def digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def parses(data: bytes) -> bool:
+    try:
+        json.loads(data)
+    except ValueError:
+        return False
+    return True
+
+def current_content(path: Union[str, Path]) -> bytes:
+    """
+    The PRD as a full save would write it: the base file if it has no
+    journal, else the replayed document as compacting the journal writes it.
+    A base that does not parse is returned as-is.
+    """
+    path = Path(path)
+    base = path.read_bytes()
+    if journal_path(path).exists():
+        try:
+            document = Journal(path).replay(json.loads(base))
+            return json.dumps(document, indent=2, ensure_ascii=base.isascii()).encode("utf-8")
+        except ValueError:
+            pass
+    return base
+
+class SnapshotStore:
+    """Chunk objects plus an append-only index of snapshots."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.index = self.root / "index.jsonl"
+
+    @classmethod
+    def for_file(cls, path: Union[str, Path]) -> "SnapshotStore":
+        """The store kept next to a PRD file."""
+        return cls(Path(path).resolve().parent / STORE_DIR)
+
+    # Objects
+
+    def _object(self, name: str) -> Path:
+        # Flat: a directory per hash prefix cost a disk block per chunk on top of the chunk itself
+        return self.objects / name
+
+    def _find(self, name: str) -> Path:
+        """Where a chunk is stored, including stores written with the older objects/ab/cdef... layout."""
+        target = self._object(name)
+        legacy = self.objects / name[:2] / name[2:]
+        return legacy if not target.exists() and legacy.exists() else target
+
+    def _put(self, data: bytes) -> Optional[str]:
+        """Store a chunk unless it is already there. Returns its name if it was written."""
+        name = digest(data)
+        if self._find(name).exists():
+            return None
+        target = self._object(name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(target.name + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(zlib.compress(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, target)
+        return name
+
+    def _get(self, name: str) -> bytes:
+        try:
+            data = zlib.decompress(self._find(name).read_bytes())
+        except (OSError, zlib.error) as e:
+            raise IntegrityError(f"Chunk {name[:12]} is missing or unreadable: {e}") from None
+        if digest(data) != name:
+            raise IntegrityError(f"Chunk {name[:12]} does not match its hash")
+        return data
+
+    # Index
+
+    def records(self) -> List[Record]:
+        """Every snapshot, oldest first. A torn last line (a crash mid-append) is skipped."""
+        if not self.index.exists():
+            return []
+        lines = self.index.read_bytes().split(b"\n")
+        return [json.loads(line) for line in lines[:-1] if line.strip()]
+
+    def list(self, path: Union[str, Path]) -> List[Record]:
+        """Snapshots of one PRD file, oldest first."""
+        name = Path(path).name
+        return [record for record in self.records() if record["file"] == name]
+
+    def resolve(self, path: Union[str, Path], ref: str) -> Record:
+        """
+        A snapshot of path by list position ("3", "#3"), "latest", or a
+        prefix of its id. KeyError if nothing or more than one matches.
+        """
+        records = self.list(path)
+        if not records:
+            raise KeyError(f"No snapshots of {Path(path).name}")
+        if ref == "latest":
+            return records[-1]
+        position = ref.lstrip("#")
+        if position.isdigit() and len(position) < 6:
+            if not 1 <= int(position) <= len(records):
+                raise KeyError(f"No snapshot #{position} of {Path(path).name} ({len(records)} stored)")
+            return records[int(position) - 1]
+        matches = {record["id"]: record for record in records if record["id"].startswith(ref)}
+        if len(matches) != 1:
+            raise KeyError(f"{'No' if not matches else 'More than one'} snapshot of {Path(path).name} matches {ref!r}")
+        return next(iter(matches.values()))
+
+    def _append(self, record: Record) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.index, "ab+") as f:
+            # Drop a torn tail so the new record starts on a line of its own
+            f.truncate(line_start(f, f.seek(0, os.SEEK_END)))
+            f.write(json.dumps(record).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Snapshots
+
+    def snapshot_bytes(self, name: str, data: bytes, label: Optional[str] = None) -> Record:
+        """
+        Store data as the next version of the file called name. If it is
+        identical to the latest snapshot of that file, that snapshot is
+        returned and nothing is written.
+        """
+        snapshot_id = digest(data)
+        existing = self.list(name)
+        if existing and existing[-1]["id"] == snapshot_id:
+            return existing[-1]
+
+        pieces = chunk(data)
+        names = [digest(piece) for piece in pieces]
+        written = sum(self._put(piece) is not None for piece in pieces)
+        record = {
+            "id": snapshot_id,
+            "file": name,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "label": label or "",
+            "size": len(data),
+            "valid": parses(data),
+            "chunks": names,
+            "new_chunks": written,
+        }
+        self._append(record)
+        return record
+
+    def snapshot(self, path: Union[str, Path], label: Optional[str] = None) -> Record:
+        """Snapshot a PRD file (its replayed content if it has a journal)."""
+        return self.snapshot_bytes(Path(path).name, current_content(path), label)
+
+    def read(self, record: Record) -> bytes:
+        """A snapshot's bytes, with every chunk and the whole verified against their hashes."""
+        data = b"".join(self._get(name) for name in record["chunks"])
+        if digest(data) != record["id"]:
+            raise IntegrityError(f"Snapshot {record['id'][:12]} does not match its hash")
+        return data
+
+    def verify(self, record: Record) -> bool:
+        try:
+            self.read(record)
+        except IntegrityError:
+            return False
+        return True
+
+    def last_good(self, path: Union[str, Path]) -> Optional[Record]:
+        """The newest snapshot of path that parses and whose chunks verify."""
+        for record in reversed(self.list(path)):
+            if record["valid"] and self.verify(record):
+                return record
+        return None
+
+    def restore(self, record: Record, path: Union[str, Path]) -> Record:
+        """
+        Write a snapshot back over path atomically, dropping any journal.
+        The current content is snapshotted first, so a restore can be undone.
+        Returns the snapshot of what was replaced.
+        """
+        path = Path(path)
+        data = self.read(record)
+        replaced = self.snapshot(path, label=f"before restoring {record['id'][:12]}") if path.exists() else None
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        if journal_path(path).exists():
+            journal_path(path).unlink()
+        return replaced
+
+    def diff(self, old: Record, new: Record) -> Dict[str, Any]:
+        """compare() of two snapshots."""
+        return compare(self.read(old), self.read(new))
+
+def compare(old: bytes, new: bytes) -> Dict[str, Any]:
+    """How many of new's chunks old already has, and the JSON-Patch from old to new (None unless both parse)."""
+    old_chunks = {digest(piece) for piece in chunk(old)}
+    new_chunks = [digest(piece) for piece in chunk(new)]
+    ops = make_patch(json.loads(old), json.loads(new)) if parses(old) and parses(new) else None
+    return {"shared_chunks": sum(name in old_chunks for name in new_chunks), "chunks": len(new_chunks), "ops": ops}
+
+def _journal_base(journal: Path) -> Optional[str]:
+    """sha256 of the base a journal was written against (a snapshot id, if that version was saved)."""
+    try:
+        with open(journal, "rb") as f:
+            return json.loads(f.readline()).get("base")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def load_document(path: Union[str, Path], store: Optional[SnapshotStore] = None, repair: bool = False) -> Any:
+    """
+    The PRD with its journal replayed. With repair, a base file that does
+    not parse is rolled back to the last good snapshot (keeping the broken
+    bytes as a snapshot too); re-raises if there is no good snapshot.
+
+    A journal cannot be replayed over the good snapshot, but it is not thrown
+    away: it is moved to PRD.json.journal.<id>, where id is the sha256 of the
+    base it was written against (the id of that version's snapshot).
+    """
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            document = json.load(f)
+    except ValueError as e:
+        store = store or SnapshotStore.for_file(path)
+        good = store.last_good(path) if repair else None
+        if good is None:
+            raise
+        broken = store.snapshot_bytes(path.name, path.read_bytes(), label=f"unreadable: {e}")
+        # The journal does not apply to the good snapshot; move it aside before the restore drops it
+        journal = journal_path(path)
+        base = _journal_base(journal) or broken["id"]
+        kept = journal.with_name(f"{journal.name}.{base[:12]}")
+        moved = journal.exists()
+        if moved:
+            os.replace(journal, kept)
+        store.restore(good, path)
+        print(f"⚠️  {path.name} did not parse ({e}); rolled back to snapshot {good['id'][:12]} "
+              f"from {good['created']}")
+        if moved:
+            print(f"   Its journal was moved to {kept.name}; it applies to the version with sha256 {base[:12]}")
+        with open(path, "rb") as f:
+            document = json.load(f)
+    return Journal(path).replay(document)
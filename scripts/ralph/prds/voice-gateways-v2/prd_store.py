@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Indexed, in-memory view of a PRD JSON file for the PRD mutation scripts.
+
+Loads a PRD once and keeps three indexes over its stories:
+- id -> story
+- phase -> {id: story}, from each story's "phase" field
+- story id -> ids of the stories that list it in "dependencies"
+
+get/update/remove/add and the dependency helpers keep all three in step, so
+edits are dictionary operations instead of `next(s for s in ...)` scans.
+Stories stay in file order (appends go last; add(after=...) inserts), and
+save() writes the PRD back as json.dump(indent=2), like the scripts always have
+(keeping raw UTF-8 in a file that already has it).
+save(journal=True) instead appends the edits since load as a JSON-Patch line to
+PRD.json.journal (see prd_journal.py); load() replays any journal it finds, and
+compact() folds it into PRD.json, which scripts do before they exit. For those
+scripts the journal is crash safety, not an I/O saving.
+Every save also records the new version in the PRD's snapshot store, and
+load(repair=True), for scripts about to edit the PRD, rolls a PRD that no
+longer parses back to its last good snapshot (see prd_snapshots.py).
+
+Works on master PRDs ("userStories") and phase PRDs ("stories").
+
+    store = PRDStore.load("PRD.json")
+    store.update("US-VN-004", effort="2 days")
+    store.remove("US-VN-006b")           # also drops it from dependencies and phaseStructure
+    store.remove_items("phase1Checklist", checklist_items)
+    store.save()                         # or store.save(journal=True) ... store.compact()
+"""
+
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from prd_journal import Journal, journal_path, make_patch
+from prd_snapshots import SnapshotStore, load_document
+
+STORY_KEYS = ("userStories", "stories")
+
+class PRDStore:
+    """A PRD document plus id, phase and reverse-dependency indexes over its stories."""
+
+    def __init__(self, data: Dict[str, Any], path: Optional[Union[str, Path]] = None):
+        self.data = data
+        self.path = Path(path) if path is not None else None
+        self.story_key = next((key for key in STORY_KEYS
+                               if isinstance(data.get(key), list)
+                               and all(isinstance(story, dict) for story in data[key])), None)
+        if self.story_key is None:
+            raise ValueError(f"{path or 'PRD'} has no list of story objects under {' or '.join(STORY_KEYS)}")
+
+        self._stories: Dict[str, Dict[str, Any]] = {}
+        self._by_phase: Dict[Any, Dict[str, Dict[str, Any]]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        # The document as last loaded or saved; journalled saves diff against it
+        self._saved: Optional[Dict[str, Any]] = None
+        for story in data[self.story_key]:
+            if story["id"] in self._stories:
+                raise ValueError(f"{path or 'PRD'} has duplicate story id {story['id']}")
+            self._index(story)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], repair: bool = False) -> "PRDStore":
+        """
+        Load a PRD with any journalled edits replayed. With repair, a base file
+        that does not parse is first rolled back to its last good snapshot.
+        """
+        store = cls(load_document(path, repair=repair), path)
+        store._saved = copy.deepcopy(store.data)
+        return store
+
+    # Index maintenance
+
+    def _index(self, story: Dict[str, Any]) -> None:
+        self._stories[story["id"]] = story
+        self._link(story)
+
+    def _link(self, story: Dict[str, Any]) -> None:
+        """Add a story to the phase and reverse-dependency indexes."""
+        self._by_phase.setdefault(story.get("phase"), {})[story["id"]] = story
+        for dependency in story.get("dependencies", ()):
+            self._dependents.setdefault(dependency, set()).add(story["id"])
+
+    def _unlink(self, story: Dict[str, Any]) -> None:
+        phase = self._by_phase[story.get("phase")]
+        del phase[story["id"]]
+        if not phase:
+            del self._by_phase[story.get("phase")]
+        for dependency in story.get("dependencies", ()):
+            self._dependents[dependency].discard(story["id"])
+
+    # Reads
+
+    def __len__(self) -> int:
+        return len(self._stories)
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self._stories
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._stories.values()))
+
+    def get(self, story_id: str) -> Dict[str, Any]:
+        """The story with this id; KeyError if there is none."""
+        try:
+            return self._stories[story_id]
+        except KeyError:
+            raise KeyError(f"No story {story_id}") from None
+
+    def ids(self) -> List[str]:
+        return list(self._stories)
+
+    def phases(self) -> List[Any]:
+        return list(self._by_phase)
+
+    def in_phase(self, phase: Any) -> List[Dict[str, Any]]:
+        """Stories whose "phase" field is phase, in the order they joined it."""
+        return list(self._by_phase.get(phase, {}).values())
+
+    def dependents(self, story_id: str) -> Set[str]:
+        """Ids of the stories that depend on story_id."""
+        return set(self._dependents.get(story_id, ()))
+
+    # Writes
+
+    def update(self, story_id: str, **fields: Any) -> Dict[str, Any]:
+        """Set fields on a story, re-indexing if its phase or dependencies change."""
+        story = self.get(story_id)
+        if fields.get("id", story_id) != story_id:
+            raise ValueError(f"Story ids cannot be changed with update ({story_id} -> {fields['id']})")
+        relinked = bool(fields.keys() & {"phase", "dependencies"})
+        if relinked:
+            self._unlink(story)
+        story.update(fields)
+        if relinked:
+            self._link(story)
+        return story
+
+    def add(self, story: Dict[str, Any], after: Optional[str] = None) -> Dict[str, Any]:
+        """Add a story at the end, or straight after the story with id after."""
+        if story["id"] in self._stories:
+            raise ValueError(f"Story {story['id']} already exists")
+        if after is not None and after not in self._stories:
+            raise KeyError(f"No story {after}")
+        position = self.ids().index(after) + 1 if after is not None else None
+        self._index(story)
+        if position is not None:
+            self._reorder(story["id"], position)
+        return story
+
+    def _reorder(self, story_id: str, position: int) -> None:
+        ids = [i for i in self._stories if i != story_id]
+        ids.insert(position, story_id)
+        self._stories = {i: self._stories[i] for i in ids}
+
+    def remove(self, story_id: str, detach: bool = True) -> Dict[str, Any]:
+        """
+        Remove a story. With detach, its id is also removed from its
+        dependents' dependencies and from phaseStructure's story lists.
+        """
+        story = self.get(story_id)
+        del self._stories[story_id]
+        self._unlink(story)
+        if detach:
+            for dependent in self._dependents.pop(story_id, set()):
+                self._stories[dependent]["dependencies"].remove(story_id)
+            for phase in self.data.get("phaseStructure", {}).get("phases", []):
+                if story_id in phase.get("stories", ()):
+                    phase["stories"] = [s for s in phase["stories"] if s != story_id]
+        return story
+
+    def add_dependency(self, story_id: str, dependency: str) -> bool:
+        """Make story_id depend on dependency. Returns False if it already did."""
+        story = self.get(story_id)
+        dependencies = story.setdefault("dependencies", [])
+        if dependency in dependencies:
+            return False
+        dependencies.append(dependency)
+        self._dependents.setdefault(dependency, set()).add(story_id)
+        return True
+
+    def remove_dependency(self, story_id: str, dependency: str) -> bool:
+        """Drop dependency from story_id. Returns False if it was not there."""
+        dependencies = self.get(story_id).get("dependencies", [])
+        if dependency not in dependencies:
+            return False
+        dependencies.remove(dependency)
+        self._dependents.get(dependency, set()).discard(story_id)
+        return True
+
+    # List fields (checklists, acceptance criteria, success criteria)
+
+    @staticmethod
+    def filter_list(items: List[Any], unwanted: Iterable[Any]) -> int:
+        """Remove every item in unwanted from items in place, in one pass. Returns how many went."""
+        unwanted = set(unwanted)
+        kept = [item for item in items if item not in unwanted]
+        removed = len(items) - len(kept)
+        items[:] = kept
+        return removed
+
+    def remove_items(self, key: str, unwanted: Iterable[Any]) -> int:
+        """filter_list on a top-level list such as phase1Checklist."""
+        return self.filter_list(self.data.get(key, []), unwanted)
+
+    def remove_criteria(self, story_id: str, unwanted: Iterable[str]) -> int:
+        """filter_list on a story's acceptanceCriteria."""
+        return self.filter_list(self.get(story_id).setdefault("acceptanceCriteria", []), unwanted)
+
+    # Persistence
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The PRD with its story list rebuilt from the store, in order."""
+        self.data[self.story_key] = list(self._stories.values())
+        return self.data
+
+    def snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Snapshot the PRD as it is on disk, e.g. before editing it. Returns the snapshot record."""
+        if self.path is None:
+            raise ValueError("No PRD file to snapshot")
+        return SnapshotStore.for_file(self.path).snapshot(self.path, label)
+
+    def compact(self) -> None:
+        """Fold any journal into the PRD file, for readers that only see the base file (git, jq, ralph)."""
+        if self.path is None:
+            raise ValueError("No PRD file to compact")
+        Journal(self.path).compact()
+
+    def save(self, path: Optional[Union[str, Path]] = None, journal: bool = False,
+             label: Optional[str] = None) -> Path:
+        """
+        Write the PRD as json.dump(indent=2), via a temporary file so a failed
+        write leaves the old one; this also folds away any journal.
+
+        With journal, only the changes since load/save are appended to the
+        journal (the store must have been loaded from the same path). The
+        journal compacts itself into the base file once it grows past half
+        its size.
+
+        Either way the saved version is snapshotted (under label), which
+        stores only the chunks that changed.
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("No path to save the PRD to")
+        # The bytes a full save (or compacting the journal) writes: a file that
+        # already holds raw UTF-8 (✅, →) keeps it rather than gaining \u escapes
+        ascii_only = not target.exists() or target.read_bytes().isascii()
+        data = json.dumps(self.to_dict(), indent=2, ensure_ascii=ascii_only).encode("utf-8")
+        if journal:
+            if self._saved is None or target != self.path:
+                raise ValueError("A journalled save needs a store loaded from the file it saves to")
+            Journal(target).append(make_patch(self._saved, self.data))
+        else:
+            temporary = target.with_name(target.name + ".tmp")
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, target)
+            if journal_path(target).exists():
+                journal_path(target).unlink()
+        if target == self.path:
+            self._saved = copy.deepcopy(self.data)
+        # Journalled and full saves snapshot alike
+        SnapshotStore.for_file(target).snapshot_bytes(target.name, data, label)
+        return target